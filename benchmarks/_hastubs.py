@@ -0,0 +1,353 @@
+"""Minimal Home Assistant stand-ins, enough to import the integration's platforms and run its coordinators.
+
+Only installed when Home Assistant is not importable. The integration package is
+imported without running its __init__.py, and its 'garo' subpackage is the one
+_support already imported, so the models built by the benchmarks are the ones the
+platforms see.
+
+The coordinator refreshes and notifies its listeners, entities report their state
+and availability, and the store keeps its data in memory, like Home Assistant does
+for the parts the load test and the replay use. Nothing is written to a state machine.
+"""
+import asyncio
+import datetime
+import importlib
+import os
+import sys
+import types
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from _support import INTEGRATION
+
+PACKAGE = 'garo_wallbox'
+
+_T = TypeVar('_T')
+
+
+class _Names(type):
+    """Constant classes (units, device classes) whose members are their lowercased names."""
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return name.lower()
+
+
+def _constants(name: str) -> type:
+    return _Names(name, (), {})
+
+
+@dataclass(frozen=True, kw_only=True)
+class EntityDescription:
+    key: str
+    translation_key: str | None = None
+    name: str | None = None
+    icon: str | None = None
+    device_class: str | None = None
+    entity_category: str | None = None
+    entity_registry_enabled_default: bool = True
+    unit_of_measurement: str | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class SensorEntityDescription(EntityDescription):
+    state_class: str | None = None
+    native_unit_of_measurement: str | None = None
+    options: list[str] | None = None
+    suggested_display_precision: int | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class NumberEntityDescription(EntityDescription):
+    native_min_value: float | None = None
+    native_max_value: float | None = None
+    native_step: float | None = None
+    native_unit_of_measurement: str | None = None
+    mode: str | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class SelectEntityDescription(EntityDescription):
+    options: list[str] | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class SwitchEntityDescription(EntityDescription):
+    pass
+
+
+class _Attr:
+    """Property reading '_attr_<name>', assigning to it on an instance replaces it like on Home Assistant's entities."""
+
+    def __set_name__(self, owner, name):
+        self._attr = f'_attr_{name}'
+
+    def __get__(self, instance, owner=None):
+        return self if instance is None else getattr(instance, self._attr)
+
+
+class Entity:
+    entity_description: EntityDescription
+    hass = None
+    entity_id = None
+    _attr_available = True
+    _attr_extra_state_attributes = None
+    available = _Attr()
+    extra_state_attributes = _Attr()
+
+    @property
+    def state(self):
+        return None
+
+    @property
+    def state_attributes(self):
+        return None
+
+    async def async_added_to_hass(self):
+        pass
+
+    async def async_will_remove_from_hass(self):
+        pass
+
+    def async_write_ha_state(self):
+        pass
+
+
+class SensorEntity(Entity):
+    _attr_native_value = None
+    native_value = _Attr()
+
+    @property
+    def state(self):
+        return self.native_value
+
+
+class NumberEntity(Entity):
+    _attr_native_value = None
+    native_value = _Attr()
+
+    @property
+    def state(self):
+        return self.native_value
+
+
+class SelectEntity(Entity):
+    _attr_current_option = None
+    current_option = _Attr()
+
+    @property
+    def state(self):
+        return self.current_option
+
+
+class SwitchEntity(Entity):
+    _attr_is_on = None
+    is_on = _Attr()
+
+    @property
+    def state(self):
+        return None if self.is_on is None else ('on' if self.is_on else 'off')
+
+
+class CoordinatorEntity(Entity, Generic[_T]):
+    def __init__(self, coordinator, context=None):
+        self.coordinator = coordinator
+        self.coordinator_context = context
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success
+
+
+class DataUpdateCoordinator(Generic[_T]):
+    def __init__(self, hass, logger, *, name, update_interval=None, update_method=None, **kwargs):
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.update_method = update_method
+        self.data = None
+        self.last_update_success = True
+        self._listeners = {}
+
+    def async_add_listener(self, update_callback, context=None):
+        def remove_listener():
+            self._listeners.pop(remove_listener, None)
+        self._listeners[remove_listener] = (update_callback, context)
+        return remove_listener
+
+    def async_update_listeners(self):
+        for update_callback, _ in list(self._listeners.values()):
+            update_callback()
+
+    async def async_refresh(self):
+        # Listeners are not notified again while the coordinator keeps failing
+        previous_success = self.last_update_success
+        try:
+            self.data = await self.update_method()
+            self.last_update_success = True
+        except Exception as e:  # pylint: disable=broad-except
+            if previous_success:
+                self.logger.error("Error fetching %s data: %s", self.name, e)
+            self.last_update_success = False
+        if self.last_update_success or previous_success:
+            self.async_update_listeners()
+
+
+class UpdateFailed(Exception):
+    pass
+
+
+class HomeAssistant:
+    def __init__(self, config_dir: str):
+        self.config = types.SimpleNamespace(config_dir=config_dir, path=lambda *parts: os.path.join(config_dir, *parts))
+        self.bus = types.SimpleNamespace(async_fire=lambda event_type, event_data=None: None)
+        self._tasks: set[asyncio.Task] = set()
+
+    def async_create_background_task(self, target, name, eager_start=True):
+        task = asyncio.ensure_future(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def async_stop(self, exit_code: int = 0, *, force: bool = False):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class Store(Generic[_T]):
+    """Keeps the data in memory."""
+
+    def __init__(self, hass, version, key, **kwargs):
+        self.key = key
+        self._data = None
+
+    async def async_load(self):
+        return self._data
+
+    async def async_save(self, data):
+        self._data = data
+
+    def async_delay_save(self, data_func, delay: float = 0):
+        self._data = data_func()
+
+
+def async_call_later(hass, delay, action):
+    handle = asyncio.get_running_loop().call_later(
+        delay, lambda: action(datetime.datetime.now(datetime.timezone.utc)))
+    return handle.cancel
+
+
+@dataclass
+class GaroRuntimeData:
+    coordinator: Any
+    meter_coordinator: Any
+
+
+class _UnitConverter:
+    """Scales between the units of one device class, by the factors of the stand-in unit names."""
+    FACTORS = {
+        'ampere': 1, 'milliampere': 1000,
+        'watt': 1, 'kilo_watt': 0.001,
+        'watt_hour': 1, 'kilo_watt_hour': 0.001,
+        'seconds': 1, 'milliseconds': 1000, 'minutes': 1 / 60,
+    }
+
+    @classmethod
+    def convert(cls, value, from_unit, to_unit):
+        return value / cls.FACTORS[from_unit] * cls.FACTORS[to_unit]
+
+
+class _Anything(types.ModuleType):
+    """Module whose missing attributes are no-op callables, for validators only used at run time."""
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = sys.modules.get(name) or types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def _install_homeassistant():
+    _module('homeassistant')
+    _module('homeassistant.core', HomeAssistant=HomeAssistant, CALLBACK_TYPE=Any, callback=lambda func: func)
+    _module('homeassistant.config_entries', ConfigEntry=Generic)
+    _module(
+        'homeassistant.const',
+        CONF_HOST='host',
+        CONF_NAME='name',
+        EntityCategory=_constants('EntityCategory'),
+        UnitOfTemperature=_constants('UnitOfTemperature'),
+        UnitOfElectricCurrent=_constants('UnitOfElectricCurrent'),
+        UnitOfEnergy=_constants('UnitOfEnergy'),
+        UnitOfPower=_constants('UnitOfPower'),
+        UnitOfTime=_constants('UnitOfTime'))
+    _module('homeassistant.components')
+    _module(
+        'homeassistant.components.sensor',
+        SensorEntity=SensorEntity,
+        SensorEntityDescription=SensorEntityDescription,
+        SensorDeviceClass=_constants('SensorDeviceClass'),
+        SensorStateClass=_constants('SensorStateClass'))
+    _module(
+        'homeassistant.components.number',
+        NumberEntity=NumberEntity,
+        NumberEntityDescription=NumberEntityDescription,
+        NumberDeviceClass=_constants('NumberDeviceClass'),
+        NumberMode=_constants('NumberMode'))
+    _module('homeassistant.components.select', SelectEntity=SelectEntity, SelectEntityDescription=SelectEntityDescription)
+    _module('homeassistant.components.switch', SwitchEntity=SwitchEntity, SwitchEntityDescription=SwitchEntityDescription)
+    _module(
+        'homeassistant.components.sensor.const',
+        UNIT_CONVERTERS={device_class: _UnitConverter for device_class in ('current', 'power', 'energy', 'duration')})
+    _module('homeassistant.helpers')
+    sys.modules['homeassistant.helpers.config_validation'] = _Anything('homeassistant.helpers.config_validation')
+    sys.modules['homeassistant.helpers'].config_validation = sys.modules['homeassistant.helpers.config_validation']
+    _module('homeassistant.helpers.entity', Entity=Entity, DeviceInfo=dict)
+    _module('homeassistant.helpers.entity_platform', current_platform=types.SimpleNamespace(get=lambda: None))
+    _module('homeassistant.helpers.event', async_call_later=async_call_later)
+    _module(
+        'homeassistant.helpers.update_coordinator',
+        CoordinatorEntity=CoordinatorEntity,
+        DataUpdateCoordinator=DataUpdateCoordinator,
+        UpdateFailed=UpdateFailed)
+    _module('homeassistant.helpers.storage', Store=Store)
+
+
+def install():
+    """Install the stand-ins unless Home Assistant (and voluptuous) are available."""
+    try:
+        import homeassistant.helpers.update_coordinator  # noqa: F401
+    except ImportError:
+        _install_homeassistant()
+    try:
+        import voluptuous  # noqa: F401
+    except ImportError:
+        sys.modules['voluptuous'] = _Anything('voluptuous')
+
+    if PACKAGE in sys.modules:
+        return
+    # The package __init__ sets up the config entry machinery, the platforms only need its type alias
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [INTEGRATION]
+    package.GaroConfigEntry = Any
+    package.GaroRuntimeData = GaroRuntimeData
+    sys.modules[PACKAGE] = package
+    for name, module in list(sys.modules.items()):
+        if name == 'garo' or name.startswith('garo.'):
+            sys.modules[f'{PACKAGE}.{name}'] = module
+    package.garo = sys.modules['garo']
+
+
+def import_platform(name: str) -> types.ModuleType:
+    install()
+    return importlib.import_module(f'{PACKAGE}.{name}')
@@ -0,0 +1,49 @@
+"""Shared helpers for the benchmarks.
+
+The benchmarks import the 'garo' package straight from the integration folder,
+so they run without Home Assistant. aiohttp is stubbed when it is not installed.
+"""
+import importlib.util
+import json
+import os
+import sys
+import timeit
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTEGRATION = os.path.join(ROOT, 'custom_components', 'garo_wallbox')
+PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'payloads')
+
+try:
+    import aiohttp  # noqa: F401
+except ImportError:
+    aiohttp = types.ModuleType('aiohttp')
+    aiohttp.ClientError = type('ClientError', (Exception,), {})
+    aiohttp.ClientConnectionError = type('ClientConnectionError', (aiohttp.ClientError,), {})
+    aiohttp.ClientSession = object
+    aiohttp.ClientTimeout = object
+    aiohttp.TCPConnector = object
+    sys.modules['aiohttp'] = aiohttp
+
+
+def _import_garo():
+    # The integration folder can not go on sys.path, its select.py shadows the stdlib module
+    if 'garo' in sys.modules:
+        return
+    path = os.path.join(INTEGRATION, 'garo')
+    spec = importlib.util.spec_from_file_location('garo', os.path.join(path, '__init__.py'), submodule_search_locations=[path])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['garo'] = module
+    spec.loader.exec_module(module)
+
+_import_garo()
+
+
+def load_payload(name: str):
+    with open(os.path.join(PAYLOADS, f'{name}.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def measure(func, number: int = 2000, repeat: int = 5) -> float:
+    """Best time of one call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
@@ -0,0 +1,55 @@
+"""Compare the JSON decoders on recorded payloads.
+
+'text' is what aiohttp's response.json() did: decode the body to str, then parse it
+with the stdlib. 'json' and 'orjson' parse the raw bytes, as the api client does now.
+The last column decodes and loads the payload into its model.
+
+    python benchmarks/bench_json.py
+"""
+import json
+import os
+
+from _support import PAYLOADS, measure
+
+from garo import GaroCharger, GaroMeter, GaroStatus
+from garo.jsoncodec import DECODERS
+
+
+def read_body(name):
+    with open(os.path.join(PAYLOADS, f'{name}.json'), 'rb') as f:
+        # Compact, like the charger sends it
+        return json.dumps(json.loads(f.read()), separators=(',', ':')).encode()
+
+
+def load_status(data):
+    GaroStatus(data)
+
+def load_slaves(data):
+    for d in data:
+        GaroCharger(d)
+
+def load_meter(data):
+    GaroMeter(data, 10, 1)
+
+
+def bench(name, body, load):
+    text = measure(lambda: json.loads(body.decode('utf-8')))
+    results = {decoder: measure(lambda: loads(body)) for decoder, loads in DECODERS.items()}
+    fastest = min(results, key=results.get)
+    loads = DECODERS[fastest]
+    with_model = measure(lambda: load(loads(body)), number=500)
+    columns = '   '.join(f'{decoder} {time:7.2f} us' for decoder, time in results.items())
+    print(f'{name:<10} {len(body):6} B   text {text:7.2f} us   {columns}   {fastest} + model {with_model:7.2f} us')
+
+
+def main():
+    if 'orjson' not in DECODERS:
+        print('orjson is not installed, only the stdlib decoder is measured')
+    bench('status', read_body('status'), load_status)
+    bench('slaves', read_body('slaves'), load_slaves)
+    bench('meterinfo', read_body('meterinfo'), load_meter)
+    bench('config', read_body('config'), lambda data: None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Memory per model object, slotted models against the same models with a per-instance __dict__.
+
+    python benchmarks/bench_memory.py [number of chargers]
+"""
+import gc
+import sys
+import tracemalloc
+
+from _support import load_payload
+
+from garo import GaroCharger, GaroStatus
+from garo import garocharger, garostatus
+from garo.decoder import model
+
+
+@model(garocharger.FIELDS)
+class DictCharger:
+    """GaroCharger as it was before __slots__: every field lives in the instance __dict__."""
+
+    def __init__(self, json = None):
+        self._is_valid = False
+        self._init_fields()
+        self._changed_fields = set()
+        self.load(json)
+
+    def load(self, json):
+        if json is not None:
+            self._is_valid = True
+            self._changed_fields = set(self._decode(json))
+
+
+@model(garostatus.FIELDS)
+class DictStatus:
+    """GaroStatus as it was before: __dict__ storage and an eagerly created twin charger."""
+
+    def __init__(self, json = None):
+        self._init_fields()
+        self._main_charger = DictCharger()
+        self._twin_charger = DictCharger()
+        self._changed_fields = set()
+        self.load(json)
+
+    def load(self, json):
+        if json:
+            self._changed_fields = set(self._decode(json))
+            self._main_charger.load(json['mainCharger'])
+            self._changed_fields.update(f'main_charger.{field}' for field in self._main_charger._changed_fields)
+
+
+def polled(factory, json):
+    """An object after a second, unchanged poll, which is the steady state of an idle charger."""
+    def create():
+        model = factory(json)
+        model.load(json)
+        return model
+    return create
+
+
+def bytes_per_object(factory, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    charger = load_payload('slaves')[0]
+    status = load_payload('status')
+    status.pop('twinCharger')
+    for name, before, after in (
+            ('charger', polled(DictCharger, charger), polled(GaroCharger, charger)),
+            ('status (single outlet)', polled(DictStatus, status), polled(GaroStatus, status))):
+        old = bytes_per_object(before, count)
+        new = bytes_per_object(after, count)
+        print(f'{name:<24} __dict__ {old:7.0f} B   __slots__ {new:7.0f} B   saved {1 - new / old:4.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare the generated model decoders with the hand-written loaders they replaced.
+
+The loaders are the ones of the first release, kept in legacy_models. Every load
+alternates between two payloads that differ in one field, as a poll of a charging
+charger does. The old GaroMeter divided its readings on every access instead of
+once per load, so the meter is also measured with the eight reads its sensors make.
+
+    python benchmarks/bench_models.py
+"""
+import copy
+
+from _support import load_payload, measure
+
+import legacy_models
+from garo import GaroCharger, GaroMeter, GaroStatus
+
+
+def alternating(payload, key, values):
+    """Two payloads that differ in one field, so every load sees a change."""
+    payloads = []
+    for value in values:
+        p = copy.deepcopy(payload)
+        p[key] = value
+        payloads.append(p)
+    return payloads
+
+
+def alternate(load, payloads, read=None):
+    i = 0
+    def run():
+        nonlocal i
+        i ^= 1
+        load(payloads[i])
+        if read is not None:
+            read()
+    return run
+
+
+def read_meter(meter):
+    def read():
+        meter.l1_current, meter.l2_current, meter.l3_current
+        meter.l1_power, meter.l2_power, meter.l3_power
+        meter.apparent_power, meter.accumulated_energy
+    return read
+
+
+def bench(name, model, legacy, payloads, read=None):
+    new = measure(alternate(model.load, payloads, read and read(model)))
+    old = measure(alternate(legacy.load, payloads, read and read(legacy)))
+    print(f'{name:<20} generated {new:7.2f} us   hand-written {old:7.2f} us   speedup {old / new:4.1f}x')
+
+
+def main():
+    status = load_payload('status')
+    charger = load_payload('slaves')[0]
+    meter = load_payload('meterinfo')
+    bench('GaroStatus', GaroStatus(status), legacy_models.GaroStatus(status), alternating(status, 'currentTemperature', [23, 24]))
+    bench('GaroCharger', GaroCharger(charger), legacy_models.GaroCharger(charger), alternating(charger, 'accSessionMillis', [1000, 2000]))
+    meters = alternating(meter, 'phase1Current', [142, 143])
+    bench('GaroMeter', GaroMeter(meter, 10, 1), legacy_models.GaroMeter(meter, 10, 1), meters)
+    bench('GaroMeter + reads', GaroMeter(meter, 10, 1), legacy_models.GaroMeter(meter, 10, 1), meters, read_meter)
+
+
+if __name__ == '__main__':
+    main()
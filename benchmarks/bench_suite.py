@@ -0,0 +1,348 @@
+"""Micro-benchmarks of the hot paths, checked against a stored baseline.
+
+Covers the model loaders, utils.read_enum, schema time parsing, GaroConfig with large
+slave lists, tracing spans and every get_state of the sensor platform. Home Assistant is stubbed
+when it is not installed.
+
+    python benchmarks/bench_suite.py                    # compare with baseline.json
+    python benchmarks/bench_suite.py --filter sensor    # only the matching benchmarks
+    python benchmarks/bench_suite.py --update-baseline  # record new baselines
+
+Every run first times a calibration loop of plain Python work. Baselines are stored
+as multiples of that time, so they carry over to faster or slower machines. A
+benchmark regresses when it is more than --threshold (a fraction) slower than its
+baseline and at least NOISE_FLOOR microseconds slower on this machine, the exit
+status is then 1. How fast the hot paths are relative to each other changes between
+Python versions, a baseline recorded on another version is not compared (exit status
+2) until it is recorded again with --update-baseline.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import platform
+import sys
+import timeit
+import types
+from typing import Callable
+
+from _support import load_payload
+
+import _hastubs
+from garo import ApiMetrics, GaroCharger, GaroConfig, GaroMeter, GaroMeterSnapshot, GaroSchema, GaroStatus, Tracer, const, utils
+from garo.garoschema import _parse_time
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+NOISE_FLOOR = 0.05
+MIN_RUN_TIME = 0.05
+REPEAT = 5
+
+Benchmark = tuple[str, Callable[[], object]]
+
+
+def measure(func) -> float:
+    """Best time of one call in microseconds, enough calls per run to take MIN_RUN_TIME."""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < MIN_RUN_TIME:
+        number *= 4
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number * 1e6
+
+
+def _calibration_work() -> int:
+    # Dict and attribute lookups, calls and small allocations, like the hot paths
+    total = 0
+    values: dict[int, str] = {}
+    for i in range(200):
+        values[i & 15] = str(i)
+        total += len(values[i & 15])
+    return total
+
+
+def calibrate() -> float:
+    """Time of the calibration loop in microseconds, the unit the baselines are stored in."""
+    return measure(_calibration_work)
+
+
+def python_version() -> str:
+    return '.'.join(platform.python_version_tuple()[:2])
+
+
+def alternate(model, payloads):
+    """Load two payloads in turn, so every load sees changed fields."""
+    i = 0
+    def load():
+        nonlocal i
+        i ^= 1
+        return model.load(payloads[i])
+    return load
+
+
+def changed(payload, key, values):
+    payloads = []
+    for value in values:
+        p = copy.deepcopy(payload)
+        p[key] = value
+        payloads.append(p)
+    return payloads
+
+
+def model_benchmarks() -> list[Benchmark]:
+    status = load_payload('status')
+    charger = load_payload('slaves')[0]
+    meter = load_payload('meterinfo')
+    return [
+        ('status.load.changed', alternate(GaroStatus(status), changed(status, 'currentTemperature', [23, 24]))),
+        ('status.load.unchanged', lambda model=GaroStatus(status): model.load(status)),
+        ('charger.load.changed', alternate(GaroCharger(charger), changed(charger, 'accSessionMillis', [1000, 2000]))),
+        ('charger.load.unchanged', lambda model=GaroCharger(charger): model.load(charger)),
+        ('meter.load.changed', alternate(GaroMeter(meter, 10, 1), changed(meter, 'phase1Current', [142, 143]))),
+        ('meter.load.unchanged', lambda model=GaroMeter(meter, 10, 1): model.load(meter)),
+        ('meter.snapshot', lambda model=GaroMeter(meter, 10, 1): GaroMeterSnapshot.of(model, False, 230)),
+        ('meter.snapshot.calculated', lambda model=GaroMeter(meter, 10, 1): GaroMeterSnapshot.of(model, True, 230)),
+    ]
+
+
+def read_enum_benchmarks() -> list[Benchmark]:
+    valid = {'connector': 'CHARGING'}
+    invalid = {'connector': 'NOT_A_STATE'}
+    missing = {}
+    default = const.Connector.NOT_CONNECTED
+    def read_invalid():
+        # Invalid values are logged, keep the log handlers out of the measurement
+        disabled = utils._LOGGER.disabled
+        utils._LOGGER.disabled = True
+        try:
+            return utils.read_enum(invalid, 'connector', const.Connector, default)
+        finally:
+            utils._LOGGER.disabled = disabled
+    return [
+        ('read_enum.valid', lambda: utils.read_enum(valid, 'connector', const.Connector, default)),
+        ('read_enum.invalid', read_invalid),
+        ('read_enum.missing', lambda: utils.read_enum(missing, 'connector', const.Connector, default)),
+    ]
+
+
+def schema_benchmarks() -> list[Benchmark]:
+    schema = load_payload('schema')
+    return [
+        ('schema.parse_time', lambda: _parse_time('22:30:00')),
+        ('schema.new', lambda: GaroSchema(schema[0])),
+        ('schema.new.all', lambda: [GaroSchema(entry) for entry in schema]),
+    ]
+
+
+def config_with_slaves(count: int) -> dict:
+    config = load_payload('config')
+    template = config['slaveList'][-1]
+    slaves = config['slaveList'][:1]
+    for i in range(count):
+        slave = copy.deepcopy(template)
+        slave['serialNumber'] = 90_000_000 + i
+        slave['reference'] = f'Slave {i}'
+        slaves.append(slave)
+    config['slaveList'] = slaves
+    return config
+
+
+def config_benchmarks() -> list[Benchmark]:
+    benchmarks = []
+    for count in (25, 100, 250):
+        config = config_with_slaves(count)
+        registry = GaroConfig(config).registry
+        benchmarks.append((f'config.new.{count}', lambda config=config: GaroConfig(config)))
+        benchmarks.append((f'config.reload.{count}', lambda config=config, registry=registry: GaroConfig(config, registry)))
+    return benchmarks
+
+
+def tracing_benchmarks() -> list[Benchmark]:
+    disabled = Tracer()
+    # Kept from growing, so the run measures the span and not the ring buffer
+    enabled = Tracer(True, capacity=1)
+
+    def span(tracer):
+        with tracer.span('load', 'status'):
+            pass
+
+    return [
+        ('tracing.span.disabled', lambda: span(disabled)),
+        ('tracing.span.enabled', lambda: span(enabled)),
+    ]
+
+
+def request_metrics() -> ApiMetrics:
+    metrics = ApiMetrics()
+    for endpoint in ('status', 'slaves/false', 'meterinfo/EXTERNAL', 'schema', 'config'):
+        for i in range(20):
+            metrics.record(endpoint, 0.04 + i * 0.01, 200, 800)
+    metrics.record('status', 10.0, error='timeout')
+    return metrics
+
+
+class _Coordinator:
+    """What the sensor entities read from the device coordinator."""
+    device_id = 'garo'
+    device_info = {}
+    main_charger_name = 'Garo'
+    schema = []
+
+    def __init__(self, status: GaroStatus, slaves: list[GaroCharger]):
+        self.status = status
+        self.slaves = slaves
+        self.config = types.SimpleNamespace(has_twin=True, has_slaves=True)
+        self.api_client = types.SimpleNamespace(metrics=request_metrics())
+
+    def get_charger_device_info(self, charger):
+        return {}
+
+
+class _MeterCoordinator:
+    """What the sensor entities read from the meter coordinator."""
+    voltage = 230
+    has_external_meter = True
+    has_central100_meter = False
+    has_central101_meter = False
+
+    def __init__(self, meter: GaroMeter, calculate_power: bool):
+        self.external_meter = meter
+        self.calculate_power = calculate_power
+        self._snapshot = GaroMeterSnapshot.of(meter, calculate_power, self.voltage)
+
+    def snapshot(self, meter):
+        return self._snapshot
+
+    def get_device_info(self, meter):
+        return {}
+
+
+def sensor_entities(calculate_power: bool):
+    sensor = _hastubs.import_platform('sensor')
+    status = GaroStatus(load_payload('status'))
+    slaves = [GaroCharger(load_payload('slaves')[-1])]
+    meter = GaroMeter(load_payload('meterinfo'), 10, 1)
+    entry = types.SimpleNamespace(
+        runtime_data=types.SimpleNamespace(
+            coordinator=_Coordinator(status, slaves),
+            meter_coordinator=_MeterCoordinator(meter, calculate_power)))
+    entities = []
+    asyncio.run(sensor.async_setup_entry(None, entry, entities.extend))
+    return sensor, entities
+
+
+def sensor_benchmarks() -> list[Benchmark]:
+    benchmarks = []
+    for calculate_power in (False, True):
+        sensor, entities = sensor_entities(calculate_power)
+        for entity in entities:
+            description = entity.entity_description
+            if isinstance(entity, sensor.GaroMeterSensorEntity):
+                group, source = 'meter_calculated' if calculate_power else 'meter', entity.coordinator.snapshot(entity._meter)
+            elif calculate_power:
+                continue
+            elif isinstance(entity, sensor.GaroDiagnosticSensorEntity):
+                group, source = 'diagnostic', entity.coordinator.api_client.metrics
+            elif isinstance(entity, sensor.GaroChargerSensorEntity):
+                group, source = 'charger', entity._charger
+            elif isinstance(entity, sensor.GaroSensorEntity):
+                group, source = 'status', entity.coordinator.status
+            else:
+                # The schedule sensor has no get_state
+                continue
+            benchmarks.append((
+                f'sensor.{group}.{description.key}',
+                lambda get_state=description.get_state, source=source: get_state(source)))
+    return benchmarks
+
+
+def all_benchmarks() -> list[Benchmark]:
+    return [
+        *model_benchmarks(),
+        *read_enum_benchmarks(),
+        *schema_benchmarks(),
+        *config_benchmarks(),
+        *tracing_benchmarks(),
+        *sensor_benchmarks(),
+    ]
+
+
+def read_baseline() -> dict:
+    if not os.path.exists(BASELINE):
+        return {'results': {}}
+    with open(BASELINE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def baseline_mismatch(baseline: dict) -> str | None:
+    """Why the baseline can not be compared with this run, None when it can."""
+    if not baseline['results']:
+        return None
+    if 'calibration_us' not in baseline:
+        return 'it holds absolute timings'
+    if baseline.get('python') != python_version():
+        return f"it was recorded with Python {baseline.get('python')}, this is {python_version()}"
+    return None
+
+
+def write_baseline(baseline: dict, results: dict[str, float], calibration: float):
+    # Ratios recorded with another Python or calibration loop are not kept next to the new ones
+    kept = baseline.get('results', {}) if baseline_mismatch(baseline) is None else {}
+    recorded = {**kept, **{name: round(us / calibration, 6) for name, us in results.items()}}
+    baseline = {
+        'python': python_version(),
+        'machine': f'{platform.system()} {platform.machine()}',
+        'calibration_us': round(calibration, 4),
+        'threshold': baseline.get('threshold', DEFAULT_THRESHOLD),
+        'results': dict(sorted(recorded.items())),
+    }
+    with open(BASELINE, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--threshold', type=float, help=f'allowed slowdown, defaults to the baseline\'s or {DEFAULT_THRESHOLD}')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    baseline = read_baseline()
+    mismatch = baseline_mismatch(baseline)
+    if mismatch is not None and not args.update_baseline:
+        print(f'{os.path.basename(BASELINE)} can not be compared with this run, {mismatch}. '
+              f'Record it again with --update-baseline.')
+        sys.exit(2)
+    threshold = args.threshold if args.threshold is not None else baseline.get('threshold', DEFAULT_THRESHOLD)
+    calibration = calibrate()
+    print(f'{"calibration":<48} {calibration:9.3f} us')
+    results = {}
+    regressions = []
+    for name, func in all_benchmarks():
+        if args.filter not in name:
+            continue
+        us = results[name] = measure(func)
+        ratio = baseline['results'].get(name) if mismatch is None else None
+        if ratio is None:
+            print(f'{name:<48} {us:9.3f} us   (no baseline)')
+            continue
+        # The baseline as it would run on this machine
+        base = ratio * calibration
+        change = us / base - 1
+        regressed = change > threshold and us - base > NOISE_FLOOR
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<48} {us:9.3f} us   baseline {base:9.3f} us   {change:+7.1%}{"   REGRESSION" if regressed else ""}')
+
+    if args.update_baseline:
+        write_baseline(baseline, results, calibration)
+        print(f'Recorded {len(results)} baselines in {os.path.basename(BASELINE)}')
+        return
+    if regressions:
+        print(f'{len(regressions)} regressions over {threshold:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
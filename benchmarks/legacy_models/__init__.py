@@ -0,0 +1,8 @@
+"""The hand-written model loaders the generated decoders replaced, as of the first release.
+
+Kept verbatim, apart from importing the enums from the current package, so
+bench_models.py can measure the decoders against them.
+"""
+from .garostatus import GaroStatus
+from .garocharger import GaroCharger
+from .garometer import GaroMeter
@@ -0,0 +1,361 @@
+"""Fleet load test: N simulated chargers with M slaves each, polled by the real coordinators.
+
+Every step runs the simulators in one process and the coordinators in another, so the
+numbers measured for the integration do not include the simulated chargers. Per step
+the report holds the poll latency of the device and meter coordinators, the event loop
+lag, the state writes per second, and the memory and CPU used per charger.
+
+Needs aiohttp installed. Without Home Assistant the coordinators run on the stand-ins
+of _hastubs, the report then holds null as its version. The chargers bind 127.0.x.y
+addresses, which works out of the box on Linux.
+
+    python benchmarks/loadtest.py --chargers 1,10,50 --slaves 4 --duration 60 --output report.json
+
+Entities are created by the real platforms and subscribed to their coordinator like
+CoordinatorEntity does. Their state writes are counted instead of going to a state machine.
+"""
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = os.path.join(ROOT, 'custom_components', 'garo_wallbox', 'manifest.json')
+
+LOOP_PROBE_INTERVAL = 0.05
+PLATFORMS = ('sensor', 'number', 'select', 'switch')
+
+
+def charger_host(index: int) -> str:
+    return f'127.0.{1 + index // 250}.{1 + index % 250}'
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {'count': 0}
+    samples = sorted(samples)
+    def at(p):
+        return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+        'p50_ms': at(0.50),
+        'p95_ms': at(0.95),
+        'p99_ms': at(0.99),
+        'max_ms': round(samples[-1] * 1000, 3),
+    }
+
+
+def rss_bytes() -> int:
+    """Current resident set size, the peak where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+# Simulator process
+
+def run_simulators(args, chargers: int, ready, stop):
+    sys.path.insert(0, BENCHMARKS)
+    from simulator import ChargerSimulator, Faults
+
+    async def run():
+        rng = random.Random(args.seed)
+        simulators = [
+            ChargerSimulator(
+                charger_host(i),
+                serial_number=10_000_000 + i * 1000,
+                firmware=tuple(int(part) for part in args.firmware.split('.')),
+                twin=args.twin,
+                slaves=args.slaves,
+                meters=tuple(meter for meter in args.meters.split(',') if meter),
+                faults=Faults(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate),
+                time_scale=args.time_scale,
+                seed=args.seed + i)
+            for i in range(chargers)]
+        for simulator in simulators:
+            await simulator.async_start()
+            for outlet in simulator.outlets:
+                if rng.random() < args.charging:
+                    outlet.plug_in(rng.uniform(5_000, 40_000))
+        ready.set()
+        # Cars come and go, so the coordinators see state changes throughout the run
+        while not stop.is_set():
+            await asyncio.sleep(1)
+            for simulator in simulators:
+                for outlet in simulator.outlets:
+                    if rng.random() < args.activity / 60:
+                        if outlet.connector == 'NOT_CONNECTED':
+                            outlet.plug_in(rng.uniform(5_000, 40_000))
+                        else:
+                            outlet.unplug()
+        for simulator in simulators:
+            await simulator.async_stop()
+
+    asyncio.run(run())
+
+
+# Home Assistant process
+
+@functools.cache
+def import_integration():
+    """The integration package with its platforms, on the stand-ins when Home Assistant is not installed."""
+    try:
+        import homeassistant.helpers.update_coordinator  # noqa: F401
+    except ImportError:
+        sys.path.insert(0, BENCHMARKS)
+        import _hastubs
+        for name in ('const', *PLATFORMS):
+            _hastubs.import_platform(name)
+        return sys.modules[_hastubs.PACKAGE]
+    sys.path.insert(0, ROOT)
+    package = importlib.import_module('custom_components.garo_wallbox')
+    for name in ('const', *PLATFORMS):
+        importlib.import_module(f'{package.__name__}.{name}')
+    return package
+
+
+class LoadTestEntry:
+    """Just enough of a ConfigEntry for the coordinators and the platforms."""
+
+    def __init__(self, entry_id: str, host: str, options: dict):
+        from homeassistant.const import CONF_HOST, CONF_NAME
+        self.entry_id = entry_id
+        self.title = entry_id
+        self.data = {CONF_HOST: host, CONF_NAME: entry_id}
+        self.options = options
+        self.runtime_data = None
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        return hass.async_create_background_task(target, name)
+
+    async def async_unload(self):
+        for func in reversed(self._on_unload):
+            result = func()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+class Metrics:
+    def __init__(self):
+        self.poll_latency: dict[str, list[float]] = {'device': [], 'meter': []}
+        self.poll_errors = 0
+        self.state_writes = 0
+        self.loop_lag: list[float] = []
+        self.recording = False
+
+    def timed(self, kind: str, update_method):
+        async def wrapper():
+            start = time.perf_counter()
+            try:
+                return await update_method()
+            except Exception:
+                self.poll_errors += self.recording
+                raise
+            finally:
+                if self.recording:
+                    self.poll_latency[kind].append(time.perf_counter() - start)
+        return wrapper
+
+    def count_write(self):
+        self.state_writes += self.recording
+
+    async def async_probe_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LOOP_PROBE_INTERVAL)
+            if self.recording:
+                self.loop_lag.append(max(0.0, loop.time() - start - LOOP_PROBE_INTERVAL))
+
+
+async def async_setup_charger(
+        hass,
+        index: int,
+        options: dict,
+        metrics: Metrics,
+        api_client=None,
+        start_scheduler: bool = True) -> tuple[LoadTestEntry, int]:
+    """Set up one charger the way async_setup_entry does, returns the entry and its entity count."""
+    integration = import_integration()
+    GaroDeviceCoordinator = integration.coordinator.GaroDeviceCoordinator
+    GaroMeterCoordinator = integration.coordinator.GaroMeterCoordinator
+
+    host = charger_host(index)
+    entry = LoadTestEntry(f'garo_{index}', host, options)
+    if api_client is None:
+        api_client = integration.garo.ApiClient(None, host)
+    entry.async_on_unload(api_client.async_close)
+    configuration = await api_client.async_get_configuration()
+    coordinator = GaroDeviceCoordinator(hass, entry, api_client, configuration)
+    coordinator.update_method = metrics.timed('device', coordinator.update_method)
+    refreshes = [coordinator.async_refresh(), coordinator.async_fetch_schema()]
+    meter_coordinator = None
+    if configuration.has_load_balancer:
+        meter_coordinator = GaroMeterCoordinator(hass, entry, api_client, configuration)
+        meter_coordinator.update_method = metrics.timed('meter', meter_coordinator.update_method)
+        refreshes.append(meter_coordinator.async_refresh())
+    await asyncio.gather(*refreshes)
+    entry.runtime_data = integration.GaroRuntimeData(coordinator=coordinator, meter_coordinator=meter_coordinator)
+
+    entities = []
+    for name in PLATFORMS:
+        await getattr(integration, name).async_setup_entry(hass, entry, entities.extend)
+    for i, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f'{entity.__module__.rsplit(".", 1)[-1]}.garo_{index}_{i}'
+        entity.async_write_ha_state = metrics.count_write
+        entry.async_on_unload(entity.coordinator.async_add_listener(
+            entity._handle_coordinator_update, entity.coordinator_context))
+        # Home Assistant adds the entity and writes its first state, which is not counted
+        await entity.async_added_to_hass()
+        entry.async_on_unload(entity.async_will_remove_from_hass)
+    if start_scheduler:
+        api_client.scheduler.start()
+    return entry, len(entities)
+
+
+def run_coordinators(args, chargers: int, results):
+
+    async def run():
+        const = import_integration().const
+        import homeassistant.const
+        from homeassistant.core import HomeAssistant
+
+        options = {
+            const.CONF_DEVICE_FETCH_INTERVAL: args.interval,
+            const.CONF_METER_FETCH_INTERVAL: args.meter_interval,
+        }
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            metrics = Metrics()
+            probe = asyncio.ensure_future(metrics.async_probe_loop())
+            rss_before = rss_bytes()
+            setup_start = time.perf_counter()
+            setups = await asyncio.gather(*(
+                async_setup_charger(hass, i, options, metrics) for i in range(chargers)))
+            setup_time = time.perf_counter() - setup_start
+            rss_setup = rss_bytes()
+
+            metrics.recording = True
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            await asyncio.sleep(args.duration)
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            metrics.recording = False
+            rss_end = rss_bytes()
+
+            probe.cancel()
+            for entry, _ in setups:
+                await entry.async_unload()
+            await hass.async_stop(force=True)
+
+        results.put({
+            'chargers': chargers,
+            'entities': sum(count for _, count in setups),
+            'setup_seconds': round(setup_time, 3),
+            'poll_latency': {kind: percentiles(samples) for kind, samples in metrics.poll_latency.items()},
+            'poll_errors': metrics.poll_errors,
+            'loop_lag': percentiles(metrics.loop_lag),
+            'state_writes': metrics.state_writes,
+            'state_writes_per_second': round(metrics.state_writes / wall, 3),
+            'memory': {
+                'rss_before_bytes': rss_before,
+                'rss_after_setup_bytes': rss_setup,
+                'rss_after_run_bytes': rss_end,
+                'per_charger_bytes': (rss_end - rss_before) // chargers,
+            },
+            'cpu': {
+                'seconds': round(cpu, 3),
+                'percent': round(cpu / wall * 100, 2),
+                'per_charger_percent': round(cpu / wall * 100 / chargers, 4),
+            },
+            'homeassistant': getattr(homeassistant.const, '__version__', None),
+        })
+
+    asyncio.run(run())
+
+
+def run_step(args, chargers: int) -> dict:
+    context = multiprocessing.get_context('spawn')
+    ready, stop = context.Event(), context.Event()
+    results = context.Queue()
+    simulators = context.Process(target=run_simulators, args=(args, chargers, ready, stop))
+    simulators.start()
+    try:
+        if not ready.wait(60):
+            raise RuntimeError('The simulators did not start')
+        coordinators = context.Process(target=run_coordinators, args=(args, chargers, results))
+        coordinators.start()
+        result = results.get(timeout=args.duration + 300)
+        coordinators.join()
+        return result
+    finally:
+        stop.set()
+        simulators.join(30)
+        if simulators.is_alive():
+            simulators.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--chargers', default='1,5,10', help='comma separated fleet sizes, one step each')
+    parser.add_argument('--slaves', type=int, default=2)
+    parser.add_argument('--twin', action='store_true')
+    parser.add_argument('--meters', default='EXTERNAL')
+    parser.add_argument('--firmware', default='7.9')
+    parser.add_argument('--duration', type=float, default=60, help='seconds measured per step')
+    parser.add_argument('--interval', type=int, default=15, help='device fetch interval')
+    parser.add_argument('--meter-interval', type=int, default=10)
+    parser.add_argument('--charging', type=float, default=0.5, help='share of outlets charging at the start')
+    parser.add_argument('--activity', type=float, default=0.5, help='plug-ins and unplugs per outlet per minute')
+    parser.add_argument('--time-scale', type=float, default=60)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.03)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the report to this file instead of stdout')
+    args = parser.parse_args()
+
+    with open(MANIFEST, encoding='utf-8') as f:
+        version = json.load(f)['version']
+    steps = []
+    for chargers in (int(n) for n in args.chargers.split(',')):
+        print(f'Running {chargers} chargers for {args.duration} s', file=sys.stderr)
+        steps.append(run_step(args, chargers))
+    report = {
+        'integration_version': version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {key: value for key, value in vars(args).items() if key != 'output'},
+        'steps': steps,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
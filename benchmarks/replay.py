@@ -0,0 +1,106 @@
+"""Replay a traffic capture through the coordinators and entities.
+
+Captures are recorded by enabling 'Record traffic' in the integration options, which
+appends to <config>/garo_wallbox_<entry id>_traffic.jsonl. The replay answers every
+request from the capture in recorded order, so the models see the same payloads as
+the charger sent. By default polls run back to back until the capture is used up,
+--pacing waits out the recorded gaps and request durations (divided by --speed).
+
+    python benchmarks/replay.py capture.jsonl --output replay.json
+
+Reports the CPU time, the polls, their latency and the entity state writes. Runs on
+the stand-ins of _hastubs without Home Assistant, like loadtest.py.
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+from loadtest import Metrics, async_setup_charger, import_integration, percentiles
+
+
+async def async_replay(args) -> dict:
+    garo = import_integration().garo
+    ApiClient, TrafficReplay, ReplayExhausted = garo.ApiClient, garo.TrafficReplay, garo.traffic.ReplayExhausted
+    from homeassistant.core import HomeAssistant
+
+    replay = TrafficReplay.load(args.capture, pacing=args.pacing, speed=args.speed)
+    # Every read must reach the capture, nothing is served from the client's short lived cache
+    api_client = ApiClient(None, replay.host or 'replay', coalesce_window=0, config_batch_window=0, transport=replay)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        metrics = Metrics()
+        entry, entities = await async_setup_charger(hass, 0, {}, metrics, api_client, start_scheduler=False)
+        coordinator = entry.runtime_data.coordinator
+        meter_coordinator = entry.runtime_data.meter_coordinator
+        polls = {
+            'status': coordinator.async_refresh,
+            'slaves': coordinator.async_refresh,
+            'config': coordinator.async_fetch_config,
+            'schema': coordinator.async_fetch_schema,
+        }
+        if meter_coordinator is not None:
+            polls['meterinfo'] = meter_coordinator.async_refresh
+
+        metrics.recording = True
+        skipped = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        while not replay.exhausted:
+            if args.pacing:
+                await replay.async_wait_for_next()
+            exchange = replay.next_exchange
+            served = replay.served
+            poll = polls.get(exchange['action'].split('/', 1)[0]) if exchange['method'] == 'GET' else None
+            if poll is not None:
+                try:
+                    await poll()
+                except ReplayExhausted:
+                    pass
+                except Exception:
+                    # Failures the charger had are replayed as well
+                    metrics.poll_errors += 1
+            # Writes, and reads no poll makes, are not replayed
+            if replay.served == served:
+                replay.skip()
+                skipped += 1
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        metrics.recording = False
+
+        await entry.async_unload()
+        await hass.async_stop(force=True)
+
+    return {
+        'capture': args.capture,
+        'pacing': args.pacing,
+        'exchanges': replay.served,
+        'skipped': skipped,
+        'entities': entities,
+        'poll_latency': {kind: percentiles(samples) for kind, samples in metrics.poll_latency.items()},
+        'poll_errors': metrics.poll_errors,
+        'state_writes': metrics.state_writes,
+        'cpu_seconds': round(cpu, 3),
+        'wall_seconds': round(wall, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('capture')
+    parser.add_argument('--pacing', action='store_true', help='replay at the recorded pacing instead of full speed')
+    parser.add_argument('--speed', type=float, default=1.0, help='speed up the recorded pacing')
+    parser.add_argument('--output', help='write the report to this file instead of stdout')
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(async_replay(args)), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+"""In-process simulator of a Garo charger's REST API, for development and load tests.
+
+Serves the status, config, slaves/false, meterinfo/*, schema, mode, currentlimit and
+cablelock endpoints on the modern layout (port 8080, /servlet/rest/chargebox/...),
+the legacy layout (port 2222, /rest/chargebox/...) or both. Each simulator binds
+its own host address, so a fleet can run side by side on 127.0.0.1, 127.0.0.2 and so on.
+
+Cars plugged into the outlets follow a charging curve: full current up to 80% of the
+energy they want, then tapering off until the session finishes. Latency, HTTP errors
+and hanging requests can be injected through Faults.
+
+    python benchmarks/simulator.py --host 127.0.0.1 --slaves 4 --twin --plug-in
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+
+from aiohttp import web
+
+PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'payloads')
+
+MODERN_PORT = 8080
+LEGACY_PORT = 2222
+MODERN_PREFIX = '/servlet/rest/chargebox'
+LEGACY_PREFIX = '/rest/chargebox'
+
+VOLTAGE = 230
+# Share of the wanted energy charged at full current, the rest tapers off
+TAPER_START = 0.8
+MIN_TAPER_CURRENT = 1.0
+
+CHARGE_STATUS = {
+    'NOT_CONNECTED': 16,
+    'CONNECTED': 32,
+    'CHARGING_PAUSED': 48,
+    'CHARGING': 64,
+    'CHARGING_FINISHED': 80,
+}
+
+
+def _load_template(name):
+    with open(os.path.join(PAYLOADS, f'{name}.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def meter_dividers(firmware: tuple[int, int]) -> tuple[int, int]:
+    """The current and power dividers the api client applies for a firmware, see ApiClient._async_load_meter_info."""
+    version, revision = firmware
+    if version == 2 and revision <= 12:
+        return 1000, 1000
+    if (version == 2 and revision >= 13) or version > 7 or (version == 7 and revision >= 7):
+        return 10, 1
+    return 1, 1
+
+
+@dataclass(kw_only=True)
+class Faults:
+    """Trouble injected into every request."""
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_time: float = 30.0
+
+
+class SimulatedOutlet:
+    """One outlet (the master, its twin or a slave) and the car plugged into it."""
+
+    def __init__(
+            self,
+            serial_number: int,
+            reference: str,
+            clock,
+            twin_serial: int = 0,
+            firmware: tuple[int, int] = (7, 9),
+            phases: int = 3,
+            car_current: float = 16.0):
+        self.serial_number = serial_number
+        self.reference = reference
+        self.twin_serial = twin_serial
+        self.firmware = firmware
+        self.phases = phases
+        self.car_current = car_current
+        self.cable_lock_mode = 0
+        self.connector = 'NOT_CONNECTED'
+        self.acc_energy = 4_000_000.0
+        self.session_energy = 0.0
+        self.session_target = 0.0
+        self.session_seconds = 0.0
+        self.last_message = int(time.time() * 1000)
+        self._clock = clock
+        self._updated = clock()
+        self._limit = 16.0
+        self._paused = False
+
+    def plug_in(self, energy: float = 20_000):
+        """Connect a car that wants 'energy' Wh."""
+        self.update()
+        self.connector = 'CHARGING_PAUSED' if self._paused else 'CHARGING'
+        self.session_energy = 0.0
+        self.session_target = energy
+        self.session_seconds = 0.0
+
+    def unplug(self):
+        self.update()
+        self.connector = 'NOT_CONNECTED'
+
+    def set_limit(self, limit: float, paused: bool):
+        self.update()
+        self._limit = limit
+        self._paused = paused
+        if self.connector in ('CHARGING', 'CHARGING_PAUSED'):
+            self.connector = 'CHARGING_PAUSED' if paused else 'CHARGING'
+
+    @property
+    def current(self) -> float:
+        """Charging current in A."""
+        if self.connector != 'CHARGING':
+            return 0.0
+        current = min(self._limit, self.car_current)
+        fraction = self.session_energy / self.session_target if self.session_target else 1.0
+        if fraction < TAPER_START:
+            return current
+        return max(current * (1 - fraction) / (1 - TAPER_START), MIN_TAPER_CURRENT)
+
+    @property
+    def power(self) -> float:
+        """Charging power in W."""
+        return self.current * VOLTAGE * self.phases
+
+    def update(self):
+        """Integrate the energy charged since the last update."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.connector != 'CHARGING' or elapsed <= 0:
+            return
+        self.session_seconds += elapsed
+        self.last_message = int(time.time() * 1000)
+        energy = self.power * elapsed / 3600
+        if self.session_energy + energy >= self.session_target:
+            energy = self.session_target - self.session_energy
+            self.connector = 'CHARGING_FINISHED'
+        self.session_energy += energy
+        self.acc_energy += energy
+
+    def as_json(self) -> dict:
+        self.update()
+        return {
+            'reference': self.reference,
+            'serialNumber': self.serial_number,
+            'online': True,
+            'loadBalanced': True,
+            'phase': 0,
+            'productId': 30,
+            'chargeStatus': CHARGE_STATUS.get(self.connector, 0),
+            'pilotLevel': int(min(self._limit, self.car_current)),
+            'accEnergy': int(self.acc_energy),
+            'firmwareVersion': self.firmware[0],
+            'firmwareRevision': self.firmware[1],
+            'connector': self.connector,
+            'accSessionEnergy': int(self.session_energy),
+            'accSessionMillis': int(self.session_seconds * 1000),
+            'currentChargingCurrent': int(self.current * 1000),
+            'currentChargingPower': int(self.power),
+            'nrOfPhases': self.phases,
+            'twinSerial': self.twin_serial,
+            'cableLockMode': self.cable_lock_mode,
+            'minCurrentLimit': 6,
+            'meterSerial': '',
+            'meterType': 0,
+            'cpState': 2,
+            'dipSwitchSettings': 4,
+            'slaveControlSw': 0,
+            'hasMeter': True,
+            'powerMode': 'ON',
+            # Only moves while charging, so an idle outlet answers with identical bytes
+            'lastReceivedMessage': self.last_message,
+        }
+
+
+class ChargerSimulator:
+    """A Garo master charger with an optional twin, slaves and energy meters."""
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            serial_number: int = 12345678,
+            firmware: tuple[int, int] = (7, 9),
+            layout: str = 'modern',
+            twin: bool = False,
+            slaves: int = 0,
+            meters: tuple[str, ...] = ('EXTERNAL',),
+            faults: Faults | None = None,
+            time_scale: float = 1.0,
+            house_current: float = 3.0,
+            modern_port: int = MODERN_PORT,
+            legacy_port: int = LEGACY_PORT,
+            seed: int | None = None):
+        if layout not in ('modern', 'legacy', 'both'):
+            raise ValueError(f"Unknown layout '{layout}'")
+        self.host = host
+        self.layout = layout
+        self.firmware = firmware
+        self.meters = meters
+        self.faults = faults or Faults()
+        self.house_current = house_current
+        self.modern_port = modern_port
+        self.legacy_port = legacy_port
+        self.mode = 'ALWAYS_ON'
+        self.requests: dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+        self._time_scale = time_scale
+        self._runner: web.AppRunner | None = None
+
+        twin_serial = serial_number + 1 if twin else 0
+        self.master = SimulatedOutlet(serial_number, 'Left' if twin else 'Garo', self.clock, twin_serial, firmware)
+        self.twin = SimulatedOutlet(twin_serial, 'Right', self.clock, serial_number, firmware) if twin else None
+        self.slaves = [
+            SimulatedOutlet(serial_number + 100 + i, f'Slave {i + 1}', self.clock, 0, firmware)
+            for i in range(slaves)]
+
+        self.config = _load_template('config')
+        self.config.update({
+            'serialNumber': serial_number,
+            'firmwareVersion': firmware[0],
+            'firmwareRevision': firmware[1],
+            'twinSerial': twin_serial,
+            'localLoadBalanced': 'EXTERNAL' in meters,
+            'groupLoadBalanced': 'CENTRAL100' in meters,
+            'groupLoadBalanced101': 'CENTRAL101' in meters,
+        })
+        self.schema: list[dict] = _load_template('schema')
+        self._status_template = _load_template('status')
+        self._apply_limits()
+
+    def clock(self) -> float:
+        """Simulated seconds since start, running time_scale times faster than real time."""
+        return (time.monotonic() - self._started) * self._time_scale
+
+    @property
+    def outlets(self) -> list[SimulatedOutlet]:
+        return [self.master] + ([self.twin] if self.twin else []) + self.slaves
+
+    def get_outlet(self, serial_number: int) -> SimulatedOutlet | None:
+        return next((outlet for outlet in self.outlets if outlet.serial_number == serial_number), None)
+
+    @property
+    def current_limit(self) -> int:
+        if self.config.get('reducedIntervalsEnabled') and self.config.get('reducedCurrentIntervals'):
+            return int(self.config['reducedCurrentIntervals'][0]['chargeLimit'])
+        return self.config['maxChargeCurrent']
+
+    async def async_start(self):
+        app = web.Application(middlewares=[self._faults_middleware])
+        if self.layout in ('modern', 'both'):
+            app.router.add_route('*', MODERN_PREFIX + '/{action:.+}', self._handle)
+        if self.layout in ('legacy', 'both'):
+            app.router.add_route('*', LEGACY_PREFIX + '/{action:.+}', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        # Only the ports of the served layouts are bound, so clients have to probe like on a real box
+        if self.layout in ('modern', 'both'):
+            await web.TCPSite(self._runner, self.host, self.modern_port).start()
+        if self.layout in ('legacy', 'both'):
+            await web.TCPSite(self._runner, self.host, self.legacy_port).start()
+
+    async def async_stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.async_stop()
+
+    @web.middleware
+    async def _faults_middleware(self, request: web.Request, handler):
+        faults = self.faults
+        delay = faults.latency + (self._random.uniform(0, faults.jitter) if faults.jitter else 0)
+        if faults.timeout_rate and self._random.random() < faults.timeout_rate:
+            delay = faults.hang_time
+        if delay:
+            await asyncio.sleep(delay)
+        if faults.error_rate and self._random.random() < faults.error_rate:
+            return web.Response(status=500, text='Simulated error')
+        return await handler(request)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        action = request.match_info['action']
+        self.requests[action] = self.requests.get(action, 0) + 1
+        legacy = request.path.startswith(LEGACY_PREFIX)
+        body = await request.read()
+        data = json.loads(body) if body else None
+        method = request.method
+        try:
+            if method == 'GET':
+                return web.json_response(self._get(action))
+            if method == 'POST':
+                self._post(action, data, legacy)
+                return web.Response(status=200)
+            if method == 'DELETE' and action.startswith('schema/'):
+                schema_id = int(action.split('/', 1)[1])
+                self.schema = [s for s in self.schema if s['schemaId'] != schema_id]
+                return web.Response(status=200)
+        except KeyError:
+            raise web.HTTPNotFound()
+        raise web.HTTPMethodNotAllowed(method, ['GET', 'POST', 'DELETE'])
+
+    def _get(self, action: str):
+        if action == 'status':
+            return self.status_json()
+        if action == 'config':
+            config = copy.deepcopy(self.config)
+            config['slaveList'] = [outlet.as_json() for outlet in self.outlets]
+            return config
+        if action == 'slaves/false':
+            return [outlet.as_json() for outlet in self.outlets]
+        if action.startswith('meterinfo/'):
+            meter = action.split('/', 1)[1]
+            if meter not in self.meters:
+                raise KeyError(action)
+            return self.meter_json(meter)
+        if action == 'schema':
+            return self.schema
+        raise KeyError(action)
+
+    def _post(self, action: str, data, legacy: bool):
+        if action.startswith('mode'):
+            self.mode = data if legacy else action.split('/', 1)[1]
+            self._apply_limits()
+        elif action == 'config':
+            self.config['reducedCurrentIntervals'] = data.get('reducedCurrentIntervals', [])
+            self._apply_limits()
+        elif action == 'currentlimit':
+            self.config['reducedIntervalsEnabled'] = bool(data.get('reducedIntervalsEnabled'))
+            self._apply_limits()
+        elif action == 'cablelock':
+            outlet = self.get_outlet(data['serialNumber'])
+            if outlet is None:
+                raise KeyError(action)
+            outlet.cable_lock_mode = data['cableLockMode']
+        elif action == 'schema':
+            self.schema = [s for s in self.schema if s['schemaId'] != data['schemaId']] + [data]
+        else:
+            raise KeyError(action)
+
+    def _apply_limits(self):
+        for outlet in self.outlets:
+            outlet.set_limit(self.current_limit, self.mode == 'ALWAYS_OFF')
+
+    def status_json(self) -> dict:
+        main = self.master.as_json()
+        result = dict(self._status_template)
+        result.update({
+            'serialNumber': self.master.serial_number,
+            'connector': main['connector'],
+            'mode': self.mode,
+            'currentLimit': self.current_limit,
+            'factoryCurrentLimit': self.config['factoryChargeLimit'],
+            'switchCurrentLimit': self.config['switchChargeLimit'],
+            'currentChargingCurrent': main['currentChargingCurrent'],
+            'currentChargingPower': main['currentChargingPower'],
+            'accSessionEnergy': main['accSessionEnergy'],
+            'accSessionMillis': main['accSessionMillis'],
+            'latestReading': main['accEnergy'],
+            'chargeStatus': main['chargeStatus'],
+            'nrOfPhases': main['nrOfPhases'],
+            'pilotLevel': main['pilotLevel'],
+            'mainCharger': main,
+            'twinCharger': self.twin.as_json() if self.twin else None,
+        })
+        return result
+
+    def meter_json(self, meter: str) -> dict:
+        current_divider, power_divider = meter_dividers(self.firmware)
+        charging = sum(outlet.current for outlet in self.outlets)
+        result = {'meterSerial': f'{meter}-{self.master.serial_number}', 'type': 105}
+        total = 0.0
+        for phase in (1, 2, 3):
+            current = self.house_current * (1 + 0.1 * phase) + charging
+            power = current * VOLTAGE
+            total += power
+            result[f'phase{phase}Current'] = int(current * current_divider)
+            result[f'phase{phase}InstPower'] = int(power * power_divider)
+        result.update({
+            'apparentPower': int(total * power_divider),
+            'accEnergy': int(sum(outlet.acc_energy for outlet in self.outlets)),
+            'readTime': int(time.time() * 1000),
+            'meterState': 0,
+        })
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--layout', choices=['modern', 'legacy', 'both'], default='modern')
+    parser.add_argument('--firmware', default='7.9', help='version.revision')
+    parser.add_argument('--twin', action='store_true')
+    parser.add_argument('--slaves', type=int, default=0)
+    parser.add_argument('--meters', default='EXTERNAL', help='comma separated, from EXTERNAL, CENTRAL100 and CENTRAL101')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--time-scale', type=float, default=1.0)
+    parser.add_argument('--modern-port', type=int, default=MODERN_PORT)
+    parser.add_argument('--legacy-port', type=int, default=LEGACY_PORT)
+    parser.add_argument('--plug-in', action='store_true', help='start a charging session on every outlet')
+    args = parser.parse_args()
+
+    version, revision = (int(part) for part in args.firmware.split('.'))
+    simulator = ChargerSimulator(
+        host=args.host,
+        firmware=(version, revision),
+        layout=args.layout,
+        twin=args.twin,
+        slaves=args.slaves,
+        meters=tuple(meter for meter in args.meters.split(',') if meter),
+        faults=Faults(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            timeout_rate=args.timeout_rate),
+        time_scale=args.time_scale,
+        modern_port=args.modern_port,
+        legacy_port=args.legacy_port)
+    if args.plug_in:
+        for outlet in simulator.outlets:
+            outlet.plug_in()
+
+    async def run():
+        async with simulator:
+            print(f'Simulating charger {simulator.master.serial_number} on {args.host} ({args.layout} layout), Ctrl+C to stop')
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
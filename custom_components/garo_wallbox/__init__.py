@@ -1,33 +1,44 @@
 """Garo Wallbox integration."""
 
 import asyncio
+import contextlib
 from datetime import timedelta
 import logging
+import os
+import time
 from typing import Any, Dict
 from dataclasses import dataclass
 
 from aiohttp import ClientConnectionError
 from async_timeout import timeout
+import voluptuous as vol
 
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import (
     ATTR_NAME,
     CONF_HOST,
     CONF_NAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .garo import ApiClient, GaroConfig
+from .garo import ApiClient, GaroConfig, EndpointManager, TrafficRecorder, Tracer
 from .coordinator import GaroDeviceCoordinator, GaroMeterCoordinator
 from .const import (
     DOMAIN,
     TIMEOUT,
+    STORAGE_VERSION,
+    SNAPSHOT_SAVE_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    CONF_TRACING,
+    EVENT_SLAVES_CHANGED,
+    SERVICE_DUMP_TRACES,
     COMPONENT_TYPES,
     COORDINATOR
 )
@@ -49,28 +60,53 @@ class GaroRuntimeData:
 async def async_setup(hass: HomeAssistant, config: Dict) -> bool:
     """Set up the Garo Wallbox component."""
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_dump_traces(call: ServiceCall) -> ServiceResponse:
+        chargers = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if entry.state is not ConfigEntryState.LOADED:
+                continue
+            tracer = entry.runtime_data.coordinator.api_client.tracer
+            if not tracer.enabled:
+                continue
+            chargers[entry.title] = tracer.dump()
+            if call.data['clear']:
+                tracer.clear()
+        return {'chargers': chargers}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TRACES,
+        async_dump_traces,
+        schema=vol.Schema({vol.Optional('clear', default=False): cv.boolean}),
+        supports_response=SupportsResponse.ONLY,
+    )
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry):
 
-    session = async_get_clientsession(hass)
     host = entry.data[CONF_HOST]
-    api_client = ApiClient(session, host)
+    endpoint = await async_load_endpoint(hass, entry)
+    recorder = None
+    if entry.options.get(CONF_RECORD_TRAFFIC, False):
+        recorder = TrafficRecorder(traffic_capture_path(hass, entry))
+    # Each charger gets its own keep-alive session with a small connection pool
+    api_client = ApiClient(None, host, endpoint, recorder=recorder, tracer=Tracer(entry.options.get(CONF_TRACING, False)))
+    entry.async_on_unload(api_client.async_close)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    snapshot_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot")
+    # With a snapshot the entities are set up from the last known payloads and reconciled afterwards
+    warm_start = api_client.load_snapshot(await snapshot_store.async_load())
     try:
         with timeout(TIMEOUT):
             configuration = await api_client.async_get_configuration()
         coordinator = GaroDeviceCoordinator(hass, entry, api_client, configuration)
-        await coordinator.async_config_entry_first_refresh()
-        try:
-            with timeout(5):
-                await coordinator.async_fetch_schema()
-        except Exception:
-            _LOGGER.exception("Failed to fetch schema")
-            pass
         meter_coordinator: GaroMeterCoordinator | None = None
+        first_refreshes = [coordinator.async_config_entry_first_refresh(), async_fetch_schema(coordinator)]
         if configuration.has_load_balancer:
             meter_coordinator = GaroMeterCoordinator(hass, entry, api_client, configuration)
-            await meter_coordinator.async_config_entry_first_refresh()
+            first_refreshes.append(meter_coordinator.async_config_entry_first_refresh())
+        await asyncio.gather(*first_refreshes)
         entry.runtime_data = GaroRuntimeData(
             coordinator=coordinator,
             meter_coordinator=meter_coordinator 
@@ -111,6 +147,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry):
                     manufacturer="Garo")
 
         await hass.config_entries.async_forward_entry_setups(entry, COMPONENT_TYPES)
+        async_track_snapshot(entry, snapshot_store, api_client, [coordinator, meter_coordinator])
+        async_follow_topology(hass, entry, coordinator)
+        if warm_start:
+            entry.async_create_background_task(
+                hass,
+                async_reconcile(api_client, coordinator, meter_coordinator),
+                f"{DOMAIN}_reconcile_{entry.entry_id}")
+        api_client.scheduler.start()
         return True
     except asyncio.TimeoutError:
         _LOGGER.debug("Connection to %s timed out", host)
@@ -123,10 +167,110 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry):
         return False
 
 
+async def async_fetch_schema(coordinator: GaroDeviceCoordinator):
+    try:
+        with timeout(5):
+            await coordinator.async_fetch_schema()
+    except Exception:
+        _LOGGER.exception("Failed to fetch schema")
+
+
+async def async_reconcile(
+        api_client: ApiClient,
+        coordinator: GaroDeviceCoordinator,
+        meter_coordinator: GaroMeterCoordinator | None):
+    """Replace the payloads a warm start was set up from with fresh ones from the charger."""
+    api_client.discard_snapshot()
+    refreshes = [coordinator.async_fetch_config(), coordinator.async_refresh(), coordinator.async_fetch_schema()]
+    if meter_coordinator is not None:
+        refreshes.append(meter_coordinator.async_refresh())
+    for result in await asyncio.gather(*refreshes, return_exceptions=True):
+        if isinstance(result, Exception):
+            _LOGGER.warning("Failed to refresh %s after a warm start: %s", coordinator.main_charger_name, result)
+
+
+def async_track_snapshot(
+        entry: ConfigEntry,
+        store: Store,
+        api_client: ApiClient,
+        coordinators: list[DataUpdateCoordinator | None]):
+    """Save the api client's snapshot after updates, at most every SNAPSHOT_SAVE_INTERVAL.
+
+    The snapshot is taken when the save runs, so it holds the updates made while it was
+    pending. The Store writes a pending save when Home Assistant stops.
+    """
+    due: float | None = None
+
+    @callback
+    def save():
+        nonlocal due
+        now = time.monotonic()
+        # Saving again would postpone the pending save, it already covers this update
+        if due is not None and now < due:
+            return
+        due = now + SNAPSHOT_SAVE_INTERVAL
+        store.async_delay_save(api_client.snapshot, SNAPSHOT_SAVE_INTERVAL)
+
+    for coordinator in coordinators:
+        if coordinator is not None:
+            entry.async_on_unload(coordinator.async_add_listener(save))
+
+
+def async_follow_topology(hass: HomeAssistant, entry: ConfigEntry, coordinator: GaroDeviceCoordinator):
+    """Reload the entry when slaves are added or removed, so there are entities for exactly the known slaves.
+
+    The devices of removed slaves are removed with their entities.
+    """
+
+    @callback
+    def topology_changed(event: Event):
+        if event.data["device_id"] != coordinator.device_id:
+            return
+        device_registry = dr.async_get(hass)
+        for serial_number in event.data["removed"]:
+            device = device_registry.async_get_device(identifiers={(DOMAIN, f"garo_charger_{serial_number}")})
+            if device is not None:
+                device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    entry.async_on_unload(hass.bus.async_listen(EVENT_SLAVES_CHANGED, topology_changed))
+
+
+async def async_load_endpoint(hass: HomeAssistant, entry: ConfigEntry) -> EndpointManager:
+    """Restore the detected endpoint family and keep it persisted in the entry's store."""
+    store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.endpoint")
+    endpoint = EndpointManager(entry.data[CONF_HOST], await store.async_load())
+    entry.async_on_unload(endpoint.add_listener(lambda: store.async_delay_save(endpoint.as_dict, 10)))
+    return endpoint
+
+
+def traffic_capture_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    return hass.config.path(f"{DOMAIN}_{entry.entry_id}_traffic.jsonl")
+
+
 async def async_unload_entry(hass: HomeAssistant, entry):
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, COMPONENT_TYPES)
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the stored snapshot and endpoint and the traffic capture of a deleted entry."""
+    for key in ('snapshot', 'endpoint'):
+        await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.{key}").async_remove()
+    path = traffic_capture_path(hass, entry)
+
+    def remove_captures():
+        for capture in (path, f"{path}.1"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(capture)
+
+    await hass.async_add_executor_job(remove_captures)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload a config entry when its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def garo_setup(hass: HomeAssistant, entry: ConfigEntry):
     """Create a Garo instance only once."""
     session = async_get_clientsession(hass)
@@ -1,15 +1,80 @@
 from abc import abstractmethod
+from collections.abc import Iterable
+from typing import Any
 
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
-from .coordinator import GaroDeviceCoordinator, GaroMeterCoordinator
+from .coordinator import GaroCoordinator, GaroDeviceCoordinator, GaroMeterCoordinator, charger_field, meter_field
 from .garo import GaroCharger, GaroMeter
 
-class GaroEntity(CoordinatorEntity[GaroDeviceCoordinator]):
+_UNPUBLISHED = object()
+
+
+class GaroCoordinatorEntity(CoordinatorEntity[GaroCoordinator]):
+    """Writes the state on coordinator updates, unless it would publish the same state as the last write."""
+
     _attr_has_entity_name = True
+    _published_available: bool | None = None
+    _published_state: Any = _UNPUBLISHED
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Home Assistant writes the state right after this, updates publishing the same are skipped
+        self._published_available = self.available
+        self._published_state = self._state_snapshot()
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        tracer = self.coordinator.api_client.tracer
+        with tracer.span('entity', self.entity_id):
+            self._async_update_attrs()
+            platform = self.entity_id.partition('.')[0]
+            available = self.available
+            availability_changed = available != self._published_available
+            state = self._state_snapshot()
+            if not availability_changed and state == self._published_state:
+                # A value held back since is back to the published one, it must not be written again
+                self._cancel_flush()
+                self.coordinator.write_stats.record(platform, 'unchanged')
+                return
+            if not self._should_write(availability_changed):
+                self.coordinator.write_stats.record(platform, 'held')
+                return
+            self._async_publish(available, state)
+
+    def _async_publish(self, available: bool, state: Any) -> None:
+        """Write the state and record it as the published one."""
+        self._published_available = available
+        self._published_state = state
+        self.coordinator.write_stats.record(self.entity_id.partition('.')[0], 'written')
+        with self.coordinator.api_client.tracer.span('write', self.entity_id):
+            self.async_write_ha_state()
+
+    def _state_snapshot(self) -> Any:
+        """The state and attributes a write publishes, compared with the ones of the last write."""
+        return (self.state, self.state_attributes, self.extra_state_attributes)
+
+    def _should_write(self, force: bool) -> bool:
+        """Whether the updated attributes are written, force is set when the availability changed."""
+        return True
+
+    def _cancel_flush(self):
+        """Drop a write held back for later, when the state is back to the published one."""
+
+    @abstractmethod
+    def _async_update_attrs(self) -> None:
+        """Update the attributes of the entity."""
+
+
+class GaroEntity(GaroCoordinatorEntity):
+    coordinator: GaroDeviceCoordinator
 
-    def __init__(self, coordinator: GaroDeviceCoordinator, config_entry, key: str, charger: GaroCharger | None = None) -> None:
-        super().__init__(coordinator)
+    def __init__(self, coordinator: GaroDeviceCoordinator, config_entry, key: str, charger: GaroCharger | None = None, fields: Iterable[str] | None = None) -> None:
+        """Fields are the status fields the entity reads, or the charger fields when a charger is given."""
+        context = None
+        if fields:
+            context = frozenset(charger_field(charger.serial_number, field) for field in fields) if charger is not None else frozenset(fields)
+        super().__init__(coordinator, context)
         self.config_entry = config_entry
         self._attr_translation_key = key
         if charger is not None:
@@ -20,35 +85,17 @@ class GaroEntity(CoordinatorEntity[GaroDeviceCoordinator]):
             self._attr_device_info = self.coordinator.device_info
         self._async_update_attrs()
 
-    
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._async_update_attrs()
-        self.async_write_ha_state()
 
-    @abstractmethod
-    def _async_update_attrs(self) -> None:
-        """Update the attributes of the entity."""
-
-class GaroMeterEntity(CoordinatorEntity[GaroMeterCoordinator]):
-    _attr_has_entity_name = True
+class GaroMeterEntity(GaroCoordinatorEntity):
+    coordinator: GaroMeterCoordinator
 
-    def __init__(self, coordinator: GaroMeterCoordinator, config_entry, key: str, meter: GaroMeter) -> None:
-        super().__init__(coordinator)
+    def __init__(self, coordinator: GaroMeterCoordinator, config_entry, key: str, meter: GaroMeter, fields: Iterable[str] | None = None) -> None:
+        """Fields are the meter fields the entity reads."""
+        context = frozenset(meter_field(meter.serial_number, field) for field in fields) if fields else None
+        super().__init__(coordinator, context)
         self.config_entry = config_entry
         self._attr_translation_key = key
         self._meter = meter
         self._attr_unique_id = f"meter_{meter.serial_number}-{key}"
         self._attr_device_info = coordinator.get_device_info(meter)
         self._async_update_attrs()
-
-    
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._async_update_attrs()
-        self.async_write_ha_state()
-
-    @abstractmethod
-    def _async_update_attrs(self) -> None:
-        """Update the attributes of the entity."""
-
@@ -13,7 +13,20 @@ from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 
-from .const import TIMEOUT, DOMAIN, CONF_DEVICE_FETCH_INTERVAL, CONF_METER_FETCH_INTERVAL, DEFAULT_DEVICE_FETCH_INTERVAL, DEFAULT_METER_FETCH_INTERVAL
+from .const import (
+    TIMEOUT,
+    DOMAIN,
+    CONF_DEVICE_FETCH_INTERVAL,
+    CONF_METER_FETCH_INTERVAL,
+    CONF_MIN_FETCH_INTERVAL,
+    CONF_MAX_FETCH_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    CONF_TRACING,
+    DEFAULT_DEVICE_FETCH_INTERVAL,
+    DEFAULT_METER_FETCH_INTERVAL,
+    DEFAULT_MIN_FETCH_INTERVAL,
+    DEFAULT_MAX_FETCH_INTERVAL,
+)
 from .garo import ApiClient
 from . import GaroConfigEntry
 
@@ -140,6 +153,26 @@ class GaroOptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_METER_FETCH_INTERVAL, DEFAULT_METER_FETCH_INTERVAL
                         ),
                     ): int,
+                    vol.Optional(
+                        CONF_MIN_FETCH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_MIN_FETCH_INTERVAL, DEFAULT_MIN_FETCH_INTERVAL
+                        ),
+                    ): int,
+                    vol.Optional(
+                        CONF_MAX_FETCH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_FETCH_INTERVAL, DEFAULT_MAX_FETCH_INTERVAL
+                        ),
+                    ): int,
+                    vol.Optional(
+                        CONF_RECORD_TRAFFIC,
+                        default=self.config_entry.options.get(CONF_RECORD_TRAFFIC, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TRACING,
+                        default=self.config_entry.options.get(CONF_TRACING, False),
+                    ): bool,
                 }
             ),
         )
\ No newline at end of file
@@ -1,4 +1,6 @@
 
+from .garo.pollpolicy import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL
+
 DOMAIN = "garo_wallbox"
 
 KEY_MAC = "mac"
@@ -6,16 +8,32 @@ KEY_IP = "ip"
 
 TIMEOUT = 60
 
+STORAGE_VERSION = 1
+
 CONF_DEVICE_FETCH_INTERVAL = "device_fetch_interval"
 DEFAULT_DEVICE_FETCH_INTERVAL = 15
 CONF_METER_FETCH_INTERVAL = "meter_fetch_interval"
 DEFAULT_METER_FETCH_INTERVAL = 10
+CONF_MIN_FETCH_INTERVAL = "min_fetch_interval"
+# The adaptive poll policy's own bounds, so the options default to what the policy uses without them
+DEFAULT_MIN_FETCH_INTERVAL = DEFAULT_MIN_INTERVAL
+CONF_MAX_FETCH_INTERVAL = "max_fetch_interval"
+DEFAULT_MAX_FETCH_INTERVAL = DEFAULT_MAX_INTERVAL
+CONF_RECORD_TRAFFIC = "record_traffic"
+CONF_TRACING = "tracing"
+SCHEMA_FETCH_INTERVAL = 60 * 60
+# Seconds between the reads that verify a written value, the charger takes a moment to apply it
+VERIFY_INTERVAL = 2
+SNAPSHOT_SAVE_INTERVAL = 10 * 60
+
+EVENT_SLAVES_CHANGED = f"{DOMAIN}_slaves_changed"
 
 SERVICE_SET_MODE = "set_mode"
 SERVICE_SET_CURRENT_LIMIT = "set_current_limit"
 SERVICE_ADD_SCHEDULE = "add_schedule"
 SERVICE_SET_SCHEDULE = "set_schedule"
 SERVICE_REMOVE_SCHEDULE = "remove_schedule"
+SERVICE_DUMP_TRACES = "dump_traces"
 
 COORDINATOR = "coordinator"
 COMPONENT_TYPES = ["sensor","select","number","switch"]
@@ -1,15 +1,18 @@
+import asyncio
 import logging
 
+from typing import Awaitable, Callable
 from datetime import timedelta, datetime, time
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import CONF_NAME
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.storage import Store
 
-from .garo import ApiClient, GaroConfig, GaroStatus, GaroCharger, GaroMeter, GaroSchema
-from .garo.const import CableLockMode, PRODUCT_MAP, GaroProductInfo, Mode as GaroMode
+from .garo import ApiClient, GaroConfig, GaroStatus, GaroCharger, GaroMeter, GaroMeterSnapshot, GaroSchema, AdaptivePollPolicy, PendingWrites
+from .garo.utils import parse_mode
+from .garo.const import CableLockMode, PRODUCT_MAP, GaroProductInfo, Mode as GaroMode, Connector as GaroConnector
 from . import const
 
 _LOGGER = logging.getLogger(__name__)
@@ -17,13 +20,103 @@ _LOGGER = logging.getLogger(__name__)
 METER_CALCULATE_POWER = 'meter_calculate_power'
 METER_VOLTAGE = 'meter_voltage'
 
-class GaroDeviceCoordinator(DataUpdateCoordinator[int]):
+def charger_field(serial_number: int, field: str) -> str:
+    """Name of a field on a slave charger, as used in the change sets."""
+    return f"charger_{serial_number}.{field}"
+
+def meter_field(serial_number: str, field: str) -> str:
+    """Name of a field on an energy meter, as used in the change sets."""
+    return f"meter_{serial_number}.{field}"
+
+async def async_gather_partial(*aws: Awaitable) -> list:
+    """Run independent requests concurrently and return their results.
+
+    A failed request leaves its exception in place of the result, so the others can
+    still be published. Raises the first error only when every request failed.
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for error in errors:
+        _LOGGER.warning("Request failed, publishing the other results: %s", error)
+    return results
+
+
+class StateWriteStats:
+    """State writes of the entities per platform, with the updates skipped as unchanged or held back."""
+
+    def __init__(self):
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def record(self, platform: str, outcome: str):
+        """Outcome is 'written', 'unchanged' or 'held'."""
+        counts = self._counts.get(platform)
+        if counts is None:
+            counts = self._counts[platform] = {'written': 0, 'unchanged': 0, 'held': 0}
+        counts[outcome] += 1
+
+    def as_dict(self) -> dict[str, dict]:
+        result = {}
+        for platform, counts in sorted(self._counts.items()):
+            updates = sum(counts.values())
+            result[platform] = {
+                **counts,
+                'skip_rate': round((updates - counts['written']) / updates, 3) if updates else 0.0,
+            }
+        return result
+
+
+class GaroCoordinator(DataUpdateCoordinator[int]):
+    """Coordinator that only notifies the listeners whose fields changed in the last fetch.
+
+    Listeners pass the set of fields they read as their context, listeners without
+    a context are notified on every update.
+    """
+
+    _api_client: ApiClient
+    _changed_fields: set[str] | None = None
+    _notified_success = True
+    _write_stats: StateWriteStats | None = None
+
+    @property
+    def api_client(self) -> ApiClient:
+        return self._api_client
+
+    @property
+    def write_stats(self) -> StateWriteStats:
+        """State writes of the entities listening to this coordinator."""
+        if self._write_stats is None:
+            self._write_stats = StateWriteStats()
+        return self._write_stats
+
+    async def async_poll(self) -> None:
+        """Refresh for the scheduler, the requests, loads and entity updates it causes are traced under one span."""
+        with self._api_client.tracer.span('poll', self.name):
+            await self.async_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        with self._api_client.tracer.span('notify', self.name):
+            changed, self._changed_fields = self._changed_fields, None
+            availability_changed = self._notified_success != self.last_update_success
+            self._notified_success = self.last_update_success
+            if changed is None or availability_changed:
+                super().async_update_listeners()
+                return
+            for update_callback, context in list(self._listeners.values()):
+                if context is None or not changed.isdisjoint(context):
+                    update_callback()
+
+
+class GaroDeviceCoordinator(GaroCoordinator):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api_client: ApiClient, config: GaroConfig) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name="Garo Device Coordinator",
-            update_interval=timedelta(seconds=entry.options.get(const.CONF_DEVICE_FETCH_INTERVAL, const.DEFAULT_DEVICE_FETCH_INTERVAL)),
+            # Polled by the api client's scheduler
+            update_interval=None,
             update_method=self._fetch_device_data,
         )
         self._hass = hass
@@ -33,16 +126,24 @@ class GaroDeviceCoordinator(DataUpdateCoordinator[int]):
         self._id = f"garo_{config.serial_number}"
         self._status: GaroStatus | None = None
         self._name = self._config.master_charger.reference or entry.data[CONF_NAME]
-        self._slaves = self._config.slaves
         self._schema: list[GaroSchema] = []
+        self._poll_policy = AdaptivePollPolicy(
+            entry.options.get(const.CONF_DEVICE_FETCH_INTERVAL, const.DEFAULT_DEVICE_FETCH_INTERVAL),
+            entry.options.get(const.CONF_MIN_FETCH_INTERVAL, const.DEFAULT_MIN_FETCH_INTERVAL),
+            entry.options.get(const.CONF_MAX_FETCH_INTERVAL, const.DEFAULT_MAX_FETCH_INTERVAL))
+        # Values written from Home Assistant, shown until the charger confirms them
+        self._pending = PendingWrites()
+        self._verify_tasks: dict[str, asyncio.Task] = {}
+        self._remove_topology_listener = self._config.registry.add_listener(self._on_topology_changed)
+        entry.async_on_unload(self._remove_topology_listener)
+        entry.async_on_unload(api_client.scheduler.add_job(
+            'device', lambda: self._poll_policy.interval, self.async_poll))
+        entry.async_on_unload(api_client.scheduler.add_job(
+            'schema', lambda: const.SCHEMA_FETCH_INTERVAL, self.async_fetch_schema))
 
 
         self._update_id = 0
 
-    @property
-    def api_client(self) -> ApiClient:
-        return self._api_client
-    
     @property
     def device_id(self) -> str:
         return self._id
@@ -63,7 +164,10 @@ class GaroDeviceCoordinator(DataUpdateCoordinator[int]):
 
     @property
     def slaves(self) -> list[GaroCharger]:        
-        return [slave for slave in self._slaves if slave.serial_number != self._config.serial_number and slave.serial_number != self._config.twin_serial]
+        return self._config.slaves
+
+    def get_charger(self, serial_number: int) -> GaroCharger | None:
+        return self._config.registry.get(serial_number)
 
     @property
     def schema(self) -> list[GaroSchema]:
@@ -102,19 +206,119 @@ class GaroDeviceCoordinator(DataUpdateCoordinator[int]):
 
        
     async def async_enable_charge_limit(self, enable: bool):
-        await self._api_client.async_enable_charge_limit(enable)
+        await self._async_write_through(
+            lambda: self._api_client.async_enable_charge_limit(enable),
+            'config.charge_limit_enabled', 'config', lambda: self._config, 'charge_limit_enabled', enable)
+
+    async def async_fetch_config(self):
+        """Fetch the configuration again, the slave registry is carried over."""
         self._config = await self._api_client.async_get_configuration()
+        self._pending.reconcile('config')
+        # The configuration is a new model, every config field may have changed
+        self._changed_fields = None
+        self.async_update_listeners()
+
+    async def _async_write_through(self, write: Callable[[], Awaitable], field: str, source: str, get_target, attr: str, value):
+        """Show a value right away, write it, and read back the endpoint it comes from until it is confirmed.
+
+        The shown value is reverted when the write fails.
+        """
+        if self._pending.apply(field, source, get_target, attr, value):
+            self._notify_changed(field)
+        try:
+            await write()
+        except BaseException:
+            if self._pending.revert(field):
+                self._notify_changed(field)
+            raise
+        if source not in self._verify_tasks:
+            # A read back already running verifies this value as well
+            self._verify_tasks[source] = self._entry.async_create_background_task(
+                self.hass,
+                self._async_verify(source),
+                f"{const.DOMAIN}_verify_{source}_{self._id}")
+
+    def _notify_changed(self, field: str):
+        self._changed_fields = {field}
         self.async_update_listeners()
 
+    async def _async_verify(self, source: str):
+        """Read back source until its pending values are confirmed or rolled back."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._pending.timeout + const.VERIFY_INTERVAL
+        try:
+            while self._pending.waiting(source):
+                await asyncio.sleep(const.VERIFY_INTERVAL)
+                try:
+                    await self._async_read_back(source)
+                except Exception as e:
+                    if loop.time() >= deadline:
+                        # The next poll verifies the pending values instead
+                        _LOGGER.warning("Failed to read back %s after a write: %s", source, e)
+                        return
+        finally:
+            self._verify_tasks.pop(source, None)
+
+    async def _async_read_back(self, source: str):
+        # The same payload as the last read must be loaded again, the pending values were applied over it
+        self._api_client.reload_models()
+        if source == 'config':
+            await self.async_fetch_config()
+            return
+        changed_fields: set[str] = set()
+        if source == 'status':
+            self._status = await self._api_client.async_get_status(self._status)
+            changed_fields.update(self._status.changed_fields)
+        else:
+            slave_changes = await self._api_client.async_get_slaves(self._config.registry)
+            for serial_number, fields in slave_changes.items():
+                changed_fields.update(charger_field(serial_number, field) for field in fields)
+        changed_fields.update(self._pending.reconcile(source))
+        self._changed_fields = changed_fields
+        self.async_update_listeners()
+
+    def _get_connectors(self) -> list[GaroConnector]:
+        connectors = [self.status.connector]
+        if self._config.has_twin:
+            connectors.append(self.status.main_charger.connector)
+            connectors.append(self.status.twin_charger.connector)
+        if self._config.has_slaves:
+            # An offline slave reports the last connector state it had
+            connectors.extend(slave.connector if slave.online else GaroConnector.UNAVAILABLE for slave in self.slaves)
+        return connectors
+
+    @callback
+    def _on_topology_changed(self, added: list[GaroCharger], removed: list[GaroCharger]):
+        self._hass.bus.async_fire(const.EVENT_SLAVES_CHANGED, {
+            "device_id": self._id,
+            "added": [charger.serial_number for charger in added],
+            "removed": [charger.serial_number for charger in removed],
+        })
+
     async def async_set_cable_lock_mode(self, serial_number: int, mode: CableLockMode| str):
         if isinstance(mode, str):
             mode = CableLockMode[mode]
-        await self._api_client.async_set_cable_lock_mode(serial_number, mode)
-        await self.async_request_refresh()
+        write = lambda: self._api_client.async_set_cable_lock_mode(serial_number, mode)
+        # The main and twin outlets are shown from the status, slaves from the slave list
+        if serial_number == self._config.serial_number:
+            await self._async_write_through(
+                write, 'main_charger.cable_lock_mode', 'status', lambda: self.status.main_charger, 'cable_lock_mode', mode)
+        elif self._config.has_twin and serial_number == self._config.twin_serial:
+            await self._async_write_through(
+                write, 'twin_charger.cable_lock_mode', 'status', lambda: self.status.twin_charger, 'cable_lock_mode', mode)
+        else:
+            await self._async_write_through(
+                write,
+                charger_field(serial_number, 'cable_lock_mode'),
+                'slaves',
+                lambda: self._config.registry.get(serial_number),
+                'cable_lock_mode',
+                mode)
 
     async def async_fetch_schema(self):
         try:
             self._schema = await self._api_client.async_get_schema()
+            self._changed_fields = {'schema'}
             self.async_update_listeners()
             _LOGGER.debug("Fetched {} schemas".format(len(self._schema)))
         except Exception as e:
@@ -139,40 +343,63 @@ class GaroDeviceCoordinator(DataUpdateCoordinator[int]):
         await self.async_fetch_schema()
         
     async def async_set_mode(self, mode: GaroMode | str):
-        await self._api_client.async_set_mode(mode)
-        await self.async_request_refresh()
+        mode = parse_mode(mode)
+        await self._async_write_through(
+            lambda: self._api_client.async_set_mode(mode), 'mode', 'status', lambda: self.status, 'mode', mode)
 
     async def async_set_current_limit(self, limit: int):
-        await self._api_client.async_set_current_limit(limit)
-        await self.async_request_refresh()
+        if not self._config.charge_limit_enabled:
+            # The status only follows the written limit while the charge limiter is on
+            await self._api_client.async_set_current_limit(limit)
+            return
+        await self._async_write_through(
+            lambda: self._api_client.async_set_current_limit(limit),
+            'current_limit', 'status', lambda: self.status, 'current_limit', limit)
 
 
     async def _fetch_device_data(self)->int:
         try:
-            self._status = await self._api_client.async_get_status(self._status)
-            has_changed = self._status.has_changed
-            if (self._config.has_slaves):
-                await self._api_client.async_get_slaves(self._slaves)
-                for slave in self._slaves:
-                    if slave.has_changed:
-                        has_changed = True
-                        break
-            if has_changed:
+            if self._pending:
+                # Pending values were applied to the models, they must be checked against every read
+                self._api_client.reload_models()
+            fetches = [self._api_client.async_get_status(self._status)]
+            if self._config.has_slaves:
+                fetches.append(self._api_client.async_get_slaves(self._config.registry))
+            results = await async_gather_partial(*fetches)
+            changed_fields: set[str] = set()
+            status = results[0]
+            if isinstance(status, BaseException):
+                if self._status is None:
+                    raise status
+            else:
+                self._status = status
+                changed_fields.update(status.changed_fields)
+                changed_fields.update(self._pending.reconcile('status'))
+            if len(results) > 1 and not isinstance(results[1], BaseException):
+                for serial_number, fields in results[1].items():
+                    changed_fields.update(charger_field(serial_number, field) for field in fields)
+                changed_fields.update(self._pending.reconcile('slaves'))
+            if changed_fields:
                 self._update_id += 1
+            self._changed_fields = changed_fields
+            self._poll_policy.next_interval(self._get_connectors(), [self._status.charge_status])
         except BaseException as e:
             _LOGGER.error("Error fetching device data from API: %s", e, exc_info=e)
             raise UpdateFailed(f"Invalid response from API: {e}") from e
         return self._update_id
     
-class GaroMeterCoordinator(DataUpdateCoordinator[int]):
+class GaroMeterCoordinator(GaroCoordinator):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api_client: ApiClient, config: GaroConfig) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name="Garo Meter Coordinator",
-            update_interval=timedelta(seconds=entry.options.get(const.CONF_METER_FETCH_INTERVAL, const.DEFAULT_METER_FETCH_INTERVAL)),
+            # Polled by the api client's scheduler
+            update_interval=None,
             update_method=self._fetch_device_data,
         )
+        interval = entry.options.get(const.CONF_METER_FETCH_INTERVAL, const.DEFAULT_METER_FETCH_INTERVAL)
+        entry.async_on_unload(api_client.scheduler.add_job('meter', lambda: interval, self.async_poll))
         self._hass = hass
         self._entry = entry
         self._config = config
@@ -182,6 +409,7 @@ class GaroMeterCoordinator(DataUpdateCoordinator[int]):
         self._central101_meter: GaroMeter | None = None
         self._store = Store(hass, version=1, key="garo_meter")
         self._stored_data: dict|None = None
+        self._snapshots: dict[str, GaroMeterSnapshot] = {}
         
         self._update_id = 0
 
@@ -224,6 +452,18 @@ class GaroMeterCoordinator(DataUpdateCoordinator[int]):
             raise ValueError("Stored data is not initialized")
         return int(self._stored_data[METER_VOLTAGE]) if METER_VOLTAGE in self._stored_data else 230
     
+    def snapshot(self, meter: GaroMeter) -> GaroMeterSnapshot:
+        """The derived values of the meter as of the last poll."""
+        return self._snapshots[meter.serial_number]
+
+    def _update_snapshot(self, meter: GaroMeter):
+        self._snapshots[meter.serial_number] = GaroMeterSnapshot.of(meter, self.calculate_power, self.voltage)
+
+    def _update_snapshots(self):
+        for meter in (self._external_meter, self._central100_meter, self._central101_meter):
+            if meter is not None:
+                self._update_snapshot(meter)
+
     def get_device_info(self, meter: GaroMeter)->DeviceInfo:
         
         return DeviceInfo(            
@@ -241,6 +481,7 @@ class GaroMeterCoordinator(DataUpdateCoordinator[int]):
         _LOGGER.debug(f"Setting calculate power to {calculate_power}")
         self._stored_data[METER_CALCULATE_POWER] = calculate_power
         await self._store.async_save(self._stored_data)
+        self._update_snapshots()
         self.async_update_listeners()
 
     async def async_set_voltage(self, voltage:int):
@@ -250,31 +491,41 @@ class GaroMeterCoordinator(DataUpdateCoordinator[int]):
         _LOGGER.debug(f"Setting voltage to {voltage}")
         self._stored_data[METER_VOLTAGE] = voltage
         await self._store.async_save(self._stored_data)
+        self._update_snapshots()
         self.async_update_listeners()
 
 
     async def _fetch_device_data(self)->int:
         try:
-            has_changed = False
+            changed_fields: set[str] = set()
             if not self._stored_data:
                 self._stored_data = await self._store.async_load() or {}
                 _LOGGER.debug("Loaded stored data: %s", self._stored_data)
+            fetches: dict[str, Awaitable[GaroMeter]] = {}
             if self._config.local_load_balanced:
-                self._external_meter = await self._api_client.async_get_external_meter(self._external_meter)
-                if self._external_meter.has_changed:
-                    has_changed = True
+                fetches['_external_meter'] = self._api_client.async_get_external_meter(self._external_meter)
             if self._config.group_load_balanced:
-                self._central100_meter = await self._api_client.async_get_central100_meter(self._central100_meter)
-                if self._central100_meter.has_changed:
-                    has_changed = True
+                fetches['_central100_meter'] = self._api_client.async_get_central100_meter(self._central100_meter)
             if self._config.group_load_balanced101:
-                self._central101_meter = await self._api_client.async_get_central101_meter(self._central101_meter)
-                if self._central101_meter.has_changed:
-                    has_changed = True
-            
-            if has_changed:
+                fetches['_central101_meter'] = self._api_client.async_get_central101_meter(self._central101_meter)
+            if fetches:
+                results = await async_gather_partial(*fetches.values())
+                for attr, meter in zip(fetches, results):
+                    if isinstance(meter, BaseException):
+                        continue
+                    setattr(self, attr, meter)
+                    if meter.has_changed or meter.serial_number not in self._snapshots:
+                        self._update_snapshot(meter)
+                    changed_fields.update(self._get_changed_fields(meter))
+
+            if changed_fields:
                 self._update_id += 1
+            self._changed_fields = changed_fields
         except BaseException as e:
             _LOGGER.error("Error fetching meter data from API: %s", e, exc_info=e)
             raise UpdateFailed(f"Invalid response from API: {e}") from e
-        return self._update_id
\ No newline at end of file
+        return self._update_id
+
+    @staticmethod
+    def _get_changed_fields(meter: GaroMeter):
+        return (meter_field(meter.serial_number, field) for field in meter.changed_fields)
@@ -0,0 +1,42 @@
+"""Diagnostics support for Garo Wallbox."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from . import GaroConfigEntry
+
+TO_REDACT = {CONF_HOST, 'host'}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: GaroConfigEntry) -> dict[str, Any]:
+    """Return the request metrics and the state of the api client for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    meter_coordinator = entry.runtime_data.meter_coordinator
+    api_client = coordinator.api_client
+    config = coordinator.config
+    return {
+        'entry': {
+            'data': async_redact_data(dict(entry.data), TO_REDACT),
+            'options': dict(entry.options),
+        },
+        'charger': {
+            'product': config.product.name,
+            'firmware': f'{config.firmware_version}.{config.firmware_revision}',
+            'package_version': config.package_version,
+            'has_twin': config.has_twin,
+            'slaves': len(config.slaves),
+            'has_load_balancer': config.has_load_balancer,
+        },
+        'endpoint': async_redact_data(api_client.endpoint.as_dict(), TO_REDACT),
+        'metrics': api_client.metrics.as_dict(),
+        'coalescing': api_client.coalescing_stats,
+        'fingerprints': api_client.fingerprint_stats,
+        'commands': api_client.command_stats,
+        'schedule': api_client.scheduler.timeline,
+        'state_writes': {
+            'device': coordinator.write_stats.as_dict(),
+            'meter': meter_coordinator.write_stats.as_dict() if meter_coordinator else None,
+        },
+    }
@@ -2,5 +2,13 @@ from .garostatus import GaroStatus
 from .garocharger import GaroCharger
 from .apiclient import ApiClient
 from .garoconfig import GaroConfig
-from .garometer import GaroMeter
-from .garoschema import GaroSchema
\ No newline at end of file
+from .garometer import GaroMeter, GaroMeterSnapshot
+from .garoschema import GaroSchema
+from .slaveregistry import SlaveRegistry
+from .pollpolicy import AdaptivePollPolicy
+from .endpointmanager import EndpointManager
+from .pollscheduler import PollScheduler
+from .pendingwrites import PendingWrites
+from .traffic import TrafficRecorder, TrafficReplay
+from .metrics import ApiMetrics
+from .tracing import Tracer
\ No newline at end of file
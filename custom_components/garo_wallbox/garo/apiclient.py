@@ -1,25 +1,107 @@
+import asyncio
 import aiohttp
+import copy
+import hashlib
 import logging
 import time
 import datetime
+from typing import AbstractSet
 
 from .garostatus import GaroStatus
 from .garoconfig import GaroConfig
-from .garocharger import GaroCharger
 from .garometer import GaroMeter
 from .garoschema import GaroSchema
-from . import const
+from .slaveregistry import SlaveRegistry
+from .endpointmanager import EndpointManager
+from .pollscheduler import PollScheduler
+from .commandqueue import CommandQueue, in_command
+from .jsoncodec import JsonLoads, get_decoder
+from .traffic import TrafficRecorder, Transport
+from .metrics import ApiMetrics, endpoint_name
+from .tracing import Tracer
+from . import const, utils
 
 _LOGGER = logging.getLogger(__name__)
 
 current_milli_time = lambda: int(round(time.time() * 1000))
 
+DEFAULT_COALESCE_WINDOW = 1.0
+# Configuration edits made within this many seconds are written together
+DEFAULT_CONFIG_BATCH_WINDOW = 0.3
+
+DEFAULT_REQUEST_TIMEOUT = 10
+REQUEST_TIMEOUTS = {
+    'status': 10,
+    'slaves': 10,
+    'meterinfo': 10,
+    'config': 15,
+    'schema': 15,
+    'currentlimit': 15,
+    'cablelock': 15,
+    'mode': 15,
+}
+# Wait before the one retry of a read that failed, the next retry is the next poll
+RETRY_DELAY = 1.0
+CONNECTION_LIMIT = 2
+KEEPALIVE_TIMEOUT = 30
+# Endpoints whose last payload is kept in the snapshot used for a warm start
+SNAPSHOT_ACTIONS = (
+    'config',
+    'status',
+    'slaves/false',
+    'meterinfo/EXTERNAL',
+    'meterinfo/CENTRAL100',
+    'meterinfo/CENTRAL101',
+    'schema',
+)
+# Requests in flight to one charger at a time, the embedded web server handles few well
+MAX_CONCURRENT_REQUESTS = 2
+
 class ApiClient:
 
-    def __init__(self, client: aiohttp.ClientSession, host: str):
+    def __init__(
+            self,
+            client: aiohttp.ClientSession | None,
+            host: str,
+            endpoint: EndpointManager | None = None,
+            coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+            max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+            config_batch_window: float = DEFAULT_CONFIG_BATCH_WINDOW,
+            json_loads: JsonLoads | None = None,
+            recorder: TrafficRecorder | None = None,
+            transport: Transport | None = None,
+            tracer: Tracer | None = None):
+        """A recorder captures the traffic to a file, a transport (like a TrafficReplay) replaces the http session."""
         self._client = client
+        self._owns_client = client is None
         self._host = host
-        self._pre_v1_3 = False
+        self._endpoint = endpoint or EndpointManager(host)
+        self._coalesce_window = coalesce_window
+        self._json_loads = json_loads or get_decoder()
+        self._recorder = recorder
+        self._transport = transport
+        self._metrics = ApiMetrics()
+        self._tracer = tracer if tracer is not None else Tracer()
+        self._request_slots = asyncio.Semaphore(max_concurrency)
+        self._scheduler = PollScheduler()
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._responses: dict[str, tuple[float, object]] = {}
+        self._payloads: dict[str, object] = {}
+        self._seeded: dict[str, object] = {}
+        self._config_batch_window = config_batch_window
+        self._config_edits: dict[str, dict] = {}
+        self._config_commit: asyncio.Future | None = None
+        self._commands = CommandQueue()
+        self._request_count = 0
+        self._joined_count = 0
+        self._cached_count = 0
+        # Per endpoint, a hash of the last body and the payload parsed from it
+        self._fingerprints: dict[str, tuple[bytes, object]] = {}
+        # Per endpoint, the payload and model it was last loaded into
+        self._loaded: dict[str, tuple[object, object]] = {}
+        self._fingerprint_hits = 0
+        self._fingerprint_misses = 0
+        self._skipped_loads = 0
         self._configuration: GaroConfig | None = None
         self._has_meter_info = False
         self._current_divider = 1
@@ -27,38 +109,101 @@ class ApiClient:
 
 
     async def async_get_status(self, status: GaroStatus | None = None):
-        response = await self._async_get('status')
-        data = await response.json()
+        data = await self._async_get_json('status')
         if not status:
-            status = GaroStatus(data)
-        else:
-            status.load(data)
+            status = GaroStatus()
+        with self._tracer.span('load', 'status'):
+            status.load(None if self._is_loaded('status', data, status) else data)
         return status
     
+    @property
+    def endpoint(self) -> EndpointManager:
+        return self._endpoint
+
+    @property
+    def scheduler(self) -> PollScheduler:
+        """The scheduler running all periodic fetches against this charger."""
+        return self._scheduler
+
+    async def async_close(self):
+        """Stop the scheduler, close the traffic capture and the dedicated session, if the client created one."""
+        await self._scheduler.async_stop()
+        if self._recorder is not None:
+            await self._recorder.async_close()
+        if self._owns_client and self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    @property
+    def coalescing_stats(self) -> dict[str, int]:
+        """Number of GETs sent and how many were saved by sharing a request or a fresh response."""
+        return {
+            'requests': self._request_count,
+            'joined_in_flight': self._joined_count,
+            'served_from_cache': self._cached_count,
+            'saved': self._joined_count + self._cached_count,
+        }
+
+    @property
+    def fingerprint_stats(self) -> dict[str, int | float]:
+        """How many responses were byte-identical to the previous one, skipping parsing and model loads."""
+        total = self._fingerprint_hits + self._fingerprint_misses
+        return {
+            'unchanged': self._fingerprint_hits,
+            'changed': self._fingerprint_misses,
+            'hit_rate': round(self._fingerprint_hits / total, 3) if total else 0.0,
+            'skipped_loads': self._skipped_loads,
+        }
+
+    def snapshot(self) -> dict:
+        """The last payload of every endpoint needed to set up the charger again without fetching."""
+        return {
+            'host': self._host,
+            'payloads': {action: self._payloads[action] for action in SNAPSHOT_ACTIONS if action in self._payloads},
+        }
+
+    def load_snapshot(self, data: dict | None) -> bool:
+        """Serve the next read of each endpoint from a snapshot, returns False if there is nothing to use."""
+        if not data or data.get('host') != self._host:
+            return False
+        self._seeded = dict(data.get('payloads') or {})
+        return bool(self._seeded)
+
+    def discard_snapshot(self):
+        """Send all following reads to the charger, even for endpoints not yet served from the snapshot."""
+        self._seeded.clear()
+
+    @property
+    def tracer(self) -> Tracer:
+        """Spans of requests, decoding and model loads, shared with the coordinators and entities."""
+        return self._tracer
+
+    @property
+    def metrics(self) -> ApiMetrics:
+        """Latency, errors and bytes per endpoint."""
+        return self._metrics
+
+    @property
+    def command_stats(self) -> dict:
+        """Depth of the command queue and how long commands waited for their turn, in seconds."""
+        return self._commands.stats
+
     async def async_get_configuration(self):
-        response = await self._async_get('config')
-        data = await response.json()
-        self._configuration = GaroConfig(data)
+        data = await self._async_get_json('config')
+        with self._tracer.span('load', 'config'):
+            self._configuration = GaroConfig(data, self._configuration.registry if self._configuration else None)
+        # The config's slave list was loaded into the registry, the next slave list must be loaded over it
+        self._loaded.pop('slaves/false', None)
+        self._endpoint.set_firmware(self._configuration.firmware_version, self._configuration.firmware_revision)
         return self._configuration
     
-    async def async_get_slaves(self, slaves: list[GaroCharger] | None = None) -> list[GaroCharger]:
-        response = await self._async_get('slaves/false')
-        data = await response.json()
-        if not slaves:
-            slaves = []
-        for d in data:
-            if 'serialNumber' not in d:
-                continue
-            serial_number = d['serialNumber']
-            has_found = False
-            for s in slaves:
-                if s.serial_number == serial_number:
-                    s.load(d)
-                    has_found = True
-                    break
-            if not has_found:
-                slaves.append(GaroCharger(d))
-        return slaves
+    async def async_get_slaves(self, registry: SlaveRegistry) -> dict[int, AbstractSet[str]]:
+        """Load the slave list into the registry and return the changed fields per serial number."""
+        data = await self._async_get_json('slaves/false')
+        if self._is_loaded('slaves/false', data, registry):
+            return {}
+        with self._tracer.span('load', 'slaves/false'):
+            return registry.load(data)
     
     async def async_get_external_meter(self, meter: GaroMeter | None = None) -> GaroMeter:        
         return await self._async_get_meter('meterinfo/EXTERNAL', meter)
@@ -71,18 +216,19 @@ class ApiClient:
     
     async def _async_get_meter(self, endpoint:str, meter: GaroMeter | None = None) -> GaroMeter:
         await self._async_load_meter_info()
-        response = await self._async_get(endpoint)
-        data = await response.json()
-        if meter is None:
-            meter = GaroMeter(data, self._current_divider, self._power_divider)
-        else:
-            meter.load(data)
+        data = await self._async_get_json(endpoint)
+        with self._tracer.span('load', endpoint):
+            if meter is None:
+                meter = GaroMeter(data, self._current_divider, self._power_divider)
+                self._is_loaded(endpoint, data, meter)
+            else:
+                meter.load(None if self._is_loaded(endpoint, data, meter) else data)
         return meter
 		
     async def async_get_schema(self):
-        response = await self._async_get('schema')
-        data = await response.json()
-        return [GaroSchema(s) for s in data]
+        data = await self._async_get_json('schema')
+        with self._tracer.span('load', 'schema'):
+            return [GaroSchema(s) for s in data]
     
     async def async_set_schema(self, id:int, start:datetime.time, stop:datetime.time, day_of_the_week: int, charge_limit: int):
         payload = {
@@ -92,104 +238,294 @@ class ApiClient:
             "weekday": day_of_the_week,
             "chargeLimit": charge_limit
         }
-        response = await self._async_post(self._get_url('schema'), data=payload)
-        await response.text()
+        await self._commands.async_command(lambda: self._async_post('schema', data=payload), f'schema/{id}')
 
     async def async_remove_schema(self, id:int):
-        response = await self._async_delete(self._get_url(f'schema/{id}'))
-        await response.text()
+        await self._commands.async_command(lambda: self._async_delete(f'schema/{id}'), f'schema/{id}')
         
     
     async def async_set_mode(self, mode: const.Mode | str):
-        if isinstance(mode, str):
-            if mode.upper() == 'ON':
-                mode = const.Mode.ON
-            elif mode.upper() == 'OFF':
-                mode = const.Mode.OFF
-            else:
-                mode = const.Mode(mode)
-        if self._pre_v1_3:
-            response = await self._async_post(self._get_url('mode'), data=mode.value)
+        mode = utils.parse_mode(mode)
+        if self._endpoint.is_legacy:
+            await self._commands.async_command(lambda: self._async_post('mode', data=mode.value), 'mode')
         else:
-            response = await self._async_post(self._get_url(f'mode/{mode.value}'))
-        await response.text()
+            await self._commands.async_command(lambda: self._async_post(f'mode/{mode.value}'), 'mode')
 
     async def async_set_current_limit(self, limit: int):
-        response = await self._async_get('config', True)
-        response_json = await response.json()
-        response_json['reducedCurrentIntervals'] = [{
-            'chargeLimit': str(limit),
-            'schemaId': 1,
-            'start': '00:00:00',
-            'stop':'24:00:00',
-            'weekday': 8
-        }]
-        response = await self._async_post(self._get_url('config'), data=response_json)
-        await response.text()
+        await self._async_edit_config('config', {
+            'reducedCurrentIntervals': [{
+                'chargeLimit': str(limit),
+                'schemaId': 1,
+                'start': '00:00:00',
+                'stop':'24:00:00',
+                'weekday': 8
+            }]
+        })
 
     async def async_enable_charge_limit(self, enable: bool):
-        response = await self._async_get('config', True)
-        response_json = await response.json()
-        response_json['reducedIntervalsEnabled'] = enable
-        response = await self._async_post(self._get_url('currentlimit'), data=response_json)
-        await response.text()
+        await self._async_edit_config('currentlimit', {'reducedIntervalsEnabled': enable})
         
     async def async_set_cable_lock_mode(self, serial_number: int, mode: const.CableLockMode):
-        response = await self._async_get('slaves/false', True)
-        response_json = await response.json()
+        await self._commands.async_command(
+            lambda: self._async_write_cable_lock_mode(serial_number, mode),
+            f'cablelock/{serial_number}')
+
+    async def _async_write_cable_lock_mode(self, serial_number: int, mode: const.CableLockMode):
+        response_json = copy.deepcopy(await self._async_get_json('slaves/false', 0))
         for slave in response_json:
             if slave['serialNumber'] != serial_number:
                 continue
             slave['cableLockMode'] = mode.value
-            response = await self._async_post(self._get_url('cablelock'), data=slave)
-            await response.text()
+            await self._async_post('cablelock', data=slave)
             return
         raise ValueError('Slave with serial number {} not found'.format(serial_number))
         
 
-    async def _async_get(self, action: str, add_tick = False):
-        response = await self._client.request(method='GET', url=self._get_url(action, add_tick))
-        if response.status != 200 and not self._pre_v1_3:
-            self._pre_v1_3 = True
-            _LOGGER.info('Switching to pre v1.3.1 endpoint')
-            response = await self._client.request(method='GET', url=self._get_url(action, add_tick))
-        if response.status != 200 and self._pre_v1_3:
-            _LOGGER.error('Could not connect to chargebox')
-            raise ConnectionError
-        return response
+    async def _async_edit_config(self, action: str, values: dict):
+        """Change configuration values by posting the whole configuration to action.
+
+        Edits made within the batch window are merged and written together after a single
+        fresh read of the configuration. Commits run as commands, one at a time, so
+        concurrent edits cannot overwrite each other. Returns once the edit was written.
+        """
+        self._config_edits.setdefault(action, {}).update(values)
+        if self._config_commit is None:
+            self._config_commit = asyncio.ensure_future(self._async_commit_config())
+            self._config_commit.add_done_callback(lambda t: t.cancelled() or t.exception())
+        await asyncio.shield(self._config_commit)
+
+    async def _async_commit_config(self):
+        try:
+            await asyncio.sleep(self._config_batch_window)
+            await self._commands.async_command(self._async_write_config, 'config')
+        finally:
+            if self._config_commit is asyncio.current_task():
+                # Failed or cancelled before the write took the edits, their callers get the error
+                self._config_commit = None
+                self._config_edits = {}
+
+    async def _async_write_config(self):
+        # Edits made from here on go into the next commit
+        edits, self._config_edits = self._config_edits, {}
+        self._config_commit = None
+        config = await self._async_get_json('config', 0)
+        for action, values in edits.items():
+            if all(config.get(key) == value for key, value in values.items()):
+                _LOGGER.debug('Skipping write to %s, the configuration already matches', action)
+                continue
+            # Later posts carry the values of earlier ones
+            config = {**copy.deepcopy(config), **values}
+            await self._async_post(action, data=config)
+        self._payloads['config'] = config
+
+    async def _async_get_json(self, action: str, max_age: float | None = None):
+        """GET an endpoint and return the parsed body.
+
+        Concurrent callers asking for the same endpoint share one request, and a
+        response younger than max_age (the coalesce window by default) is reused.
+        A max_age of 0 only joins a request already in flight and busts any HTTP cache.
+        After load_snapshot the first read of an endpoint returns its payload from the snapshot.
+        The returned object is shared, callers that modify it must copy it first.
+        """
+        max_age = self._coalesce_window if max_age is None else max_age
+        if self._seeded and max_age > 0 and action in self._seeded:
+            data = self._payloads[action] = self._seeded.pop(action)
+            return data
+        cached = self._responses.get(action)
+        if cached is not None and max_age > 0 and time.monotonic() - cached[0] <= max_age:
+            self._cached_count += 1
+            return cached[1]
+        # A read waiting behind the running command must not be joined by it
+        task = None if in_command() else self._in_flight.get(action)
+        if task is None:
+            task = asyncio.ensure_future(self._async_fetch_json(action, max_age == 0))
+            self._in_flight[action] = task
+            task.add_done_callback(lambda t: self._on_fetch_done(action, t))
+        else:
+            self._joined_count += 1
+        return await asyncio.shield(task)
+
+    async def _async_fetch_json(self, action: str, add_tick: bool):
+        self._request_count += 1
+        # Polls wait behind queued commands, reads made by a command go straight through
+        body = await self._commands.async_read(lambda: self._async_get(action, add_tick))
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        previous = self._fingerprints.get(action)
+        if previous is not None and previous[0] == fingerprint:
+            # Same bytes as last time, the parsed payload is reused as is
+            self._fingerprint_hits += 1
+            data = previous[1]
+        else:
+            self._fingerprint_misses += 1
+            with self._tracer.span('decode', action):
+                data = self._json_loads(body)
+            self._fingerprints[action] = (fingerprint, data)
+        self._responses[action] = (time.monotonic(), data)
+        self._payloads[action] = data
+        return data
+
+    def _on_fetch_done(self, action: str, task: asyncio.Task):
+        if self._in_flight.get(action) is task:
+            del self._in_flight[action]
+        if not task.cancelled():
+            # Mark the exception as retrieved, the callers awaiting the task will see it
+            task.exception()
+
+    def _invalidate_responses(self):
+        """Forget cached responses and stop new callers from joining reads started before a write."""
+        self._responses.clear()
+        self._in_flight.clear()
+        self._loaded.clear()
+
+    def reload_models(self):
+        """Load the next responses into the models even if unchanged, after models were changed by hand."""
+        self._loaded.clear()
+
+    def _is_loaded(self, action: str, data, model) -> bool:
+        """True if model was last loaded from this very payload, so loading it again would change nothing."""
+        loaded = self._loaded.get(action)
+        if loaded is not None and loaded[0] is data and loaded[1] is model:
+            self._skipped_loads += 1
+            return True
+        self._loaded[action] = (data, model)
+        return False
+
+    async def _async_get(self, action: str, add_tick = False) -> bytes:
+        if self._endpoint.needs_probe:
+            return await self._async_probe(action, add_tick)
+        for attempt in range(2):
+            if attempt:
+                _LOGGER.debug('Retrying %s', action)
+                self._metrics.record_retry()
+                await asyncio.sleep(RETRY_DELAY)
+            url = self._get_url(action, add_tick)
+            try:
+                status, body = await self._async_request('GET', action, url)
+            except asyncio.TimeoutError:
+                # A charger that did not answer in time is not waited for again in this poll
+                _LOGGER.debug('Request to %s timed out', url)
+                self._consume_retry()
+                break
+            except aiohttp.ClientError as e:
+                _LOGGER.debug('Request to %s failed: %s', url, e)
+            else:
+                if status == 200:
+                    return body
+                _LOGGER.debug('Request to %s answered %s', url, status)
+            if not self._consume_retry():
+                break
+        _LOGGER.error('Could not connect to chargebox')
+        raise ConnectionError
+
+    def _consume_retry(self) -> bool:
+        """Count a failed read against the budget shared by the polls, a spent budget forces a new probe."""
+        if self._endpoint.try_consume_retry():
+            return True
+        self._endpoint.invalidate()
+        return False
+
+    async def _async_probe(self, action: str, add_tick = False) -> bytes:
+        for family in self._endpoint.probe_order:
+            result = await self._async_try_get(action, self._get_url(action, add_tick, family))
+            if result is not None and result[0] == 200:
+                if family != self._endpoint.probe_order[0]:
+                    self._metrics.record_fallback()
+                self._endpoint.set_family(family)
+                return result[1]
+        _LOGGER.error('Could not connect to chargebox')
+        raise ConnectionError
+
+    async def _async_try_get(self, action: str, url: str) -> tuple[int, bytes] | None:
+        try:
+            return await self._async_request('GET', action, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug('Request to %s failed: %s', url, e)
+            return None
     
-    async def _async_post(self, url: str, data=None):
-        response = await self._client.request(
-            method='POST', 
-            url=url, 
+    async def _async_post(self, action: str, data=None) -> bytes:
+        self._invalidate_responses()
+        _, body = await self._async_request(
+            'POST',
+            action,
+            self._get_url(action),
             json=data,
             headers={'content-type': 'application/json; charset=utf-8'})
-        return response
+        return body
     
-    async def _async_delete(self, url: str):
-        response = await self._client.request(
-            method='DELETE', 
-            url=url, 
+    async def _async_delete(self, action: str) -> bytes:
+        self._invalidate_responses()
+        _, body = await self._async_request(
+            'DELETE',
+            action,
+            self._get_url(action),
             headers={'content-type': 'application/json; charset=utf-8'})
-        return response
+        return body
+
+    async def _async_request(self, method: str, action: str, url: str, **kwargs) -> tuple[int, bytes]:
+        """Send a request and read the whole body, so the connection always goes back to the pool.
+
+        At most max_concurrency requests are sent to the charger at once, the rest wait for a slot.
+        """
+        endpoint = endpoint_name(method, action)
+        async with self._request_slots:
+            with self._tracer.span('http', endpoint):
+                start = time.monotonic()
+                try:
+                    if self._recorder is None:
+                        status, body = await self._async_send(method, action, url, **kwargs)
+                    else:
+                        status, body = await self._recorder.async_record(
+                            self._host,
+                            method,
+                            action,
+                            kwargs.get('json'),
+                            lambda: self._async_send(method, action, url, **kwargs))
+                except asyncio.TimeoutError:
+                    self._metrics.record(endpoint, time.monotonic() - start, error='timeout')
+                    raise
+                except aiohttp.ClientError:
+                    self._metrics.record(endpoint, time.monotonic() - start, error='error')
+                    raise
+                self._metrics.record(endpoint, time.monotonic() - start, status, len(body))
+                return status, body
+
+    async def _async_send(self, method: str, action: str, url: str, **kwargs) -> tuple[int, bytes]:
+        if self._transport is not None:
+            return await self._transport(method, action, url, **kwargs)
+        timeout = aiohttp.ClientTimeout(total=self._get_timeout(action))
+        async with self._get_client().request(method=method, url=url, timeout=timeout, **kwargs) as response:
+            return response.status, await response.read()
+
+    def _get_client(self) -> aiohttp.ClientSession:
+        if self._client is None:
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=CONNECTION_LIMIT,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT))
+        return self._client
+
+    @staticmethod
+    def _get_timeout(action: str) -> float:
+        return REQUEST_TIMEOUTS.get(action.split('/', 1)[0], DEFAULT_REQUEST_TIMEOUT)
 
-    def _get_url(self, action, add_tick = False):
+    def _get_url(self, action, add_tick = False, family: const.ApiFamily | None = None):
         tick = '' if add_tick == False else '?_={}'.format(current_milli_time())
-        if self._pre_v1_3:
-            return f'http://{self._host}:2222/rest/chargebox/{action}{tick}'
-        return f'http://{self._host}:8080/servlet/rest/chargebox/{action}{tick}'
+        return self._endpoint.get_url(action, family) + tick
     
     async def _async_load_meter_info(self):
         if self._has_meter_info:
             return
-        config = self._configuration or await self.async_get_configuration()
+        if not self._endpoint.has_firmware:
+            await self.async_get_configuration()
+        firmware_version = self._endpoint.firmware_version
+        firmware_revision = self._endpoint.firmware_revision
         self._current_divider = 1
         self._power_divider = 1
 		
-        if config.firmware_version == 2 and config.firmware_revision <= 12:
+        if firmware_version == 2 and firmware_revision <= 12:
             self._current_divider = 1000
             self._power_divider = 1000
-        elif (config.firmware_version == 2 and config.firmware_revision >= 13) or config.firmware_version > 7 or (config.firmware_version == 7 and config.firmware_revision >= 7):
+        elif (firmware_version == 2 and firmware_revision >= 13) or firmware_version > 7 or (firmware_version == 7 and firmware_revision >= 7):
             self._current_divider = 10
         self._has_meter_info = True
         
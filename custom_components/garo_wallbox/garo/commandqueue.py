@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Set while a command runs, reads made by the command itself must not wait for it
+_in_command: contextvars.ContextVar[bool] = contextvars.ContextVar('garo_in_command', default=False)
+
+def in_command() -> bool:
+    """True when called from a running command."""
+    return _in_command.get()
+
+@dataclass(kw_only=True)
+class QueuedCommand:
+    key: str | None
+    func: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    queued_at: float
+
+
+class CommandQueue:
+    """Orders the requests sent to one charger.
+
+    Commands (writes and their read-modify-write sequences) run one at a time, in the
+    order they were queued. Reads run concurrently with each other, but a queued command
+    holds back reads that have not started yet, so user actions go ahead of background
+    polls. A queued command is superseded by a newer one with the same key, whose
+    result is then returned to the callers of both.
+    """
+
+    def __init__(self):
+        self._queue: deque[QueuedCommand] = deque()
+        self._command: QueuedCommand | None = None
+        self._reads = 0
+        self._read_waiters: deque[asyncio.Future] = deque()
+        self._command_count = 0
+        self._superseded_count = 0
+        self._max_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Number of commands waiting to run."""
+        return len(self._queue)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        started = self._command_count - self._superseded_count - len(self._queue)
+        return {
+            'queue_depth': len(self._queue),
+            'max_queue_depth': self._max_depth,
+            'commands': self._command_count,
+            'superseded': self._superseded_count,
+            'last_wait': round(self._last_wait, 3),
+            'max_wait': round(self._max_wait, 3),
+            'average_wait': round(self._total_wait / started, 3) if started > 0 else 0.0,
+        }
+
+    async def async_command(self, func: Callable[[], Awaitable[Any]], key: str | None = None) -> Any:
+        """Queue a command and return its result, or the result of the command that superseded it."""
+        self._command_count += 1
+        if key is not None:
+            for queued in self._queue:
+                if queued.key == key:
+                    _LOGGER.debug("Command '%s' superseded by a newer one", key)
+                    self._superseded_count += 1
+                    queued.func = func
+                    return await asyncio.shield(queued.future)
+        command = QueuedCommand(
+            key=key,
+            func=func,
+            future=asyncio.get_running_loop().create_future(),
+            queued_at=time.monotonic())
+        self._queue.append(command)
+        self._max_depth = max(self._max_depth, len(self._queue))
+        self._dispatch()
+        return await asyncio.shield(command.future)
+
+    async def async_read(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a read once no command is running or queued."""
+        if _in_command.get():
+            return await func()
+        if self._queue or self._command is not None:
+            waiter = asyncio.get_running_loop().create_future()
+            self._read_waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Released, but cancelled before the read started
+                    self._reads -= 1
+                    self._dispatch()
+                elif waiter in self._read_waiters:
+                    self._read_waiters.remove(waiter)
+                raise
+        else:
+            self._reads += 1
+        try:
+            return await func()
+        finally:
+            self._reads -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        if self._command is not None:
+            return
+        if self._queue:
+            # Let reads already in flight finish, new ones wait behind the command
+            if self._reads == 0:
+                self._command = self._queue.popleft()
+                asyncio.ensure_future(self._async_run_command(self._command))
+            return
+        while self._read_waiters:
+            waiter = self._read_waiters.popleft()
+            if not waiter.done():
+                self._reads += 1
+                waiter.set_result(None)
+
+    async def _async_run_command(self, command: QueuedCommand):
+        _in_command.set(True)
+        wait = time.monotonic() - command.queued_at
+        self._last_wait = wait
+        self._max_wait = max(self._max_wait, wait)
+        self._total_wait += wait
+        try:
+            command.future.set_result(await command.func())
+        except Exception as e:
+            command.future.set_exception(e)
+            # Mark the exception as retrieved, callers that went away do not need it
+            command.future.exception()
+        finally:
+            if not command.future.done():
+                command.future.cancel()
+            self._command = None
+            self._dispatch()
@@ -27,6 +27,10 @@ class Connector(Enum):
     UNKNOWN = 'UNKNOWN'
     UNAVAILABLE = 'UNAVAILABLE'
 
+class ApiFamily(Enum):
+    MODERN = 'MODERN'
+    LEGACY = 'LEGACY'
+
 class Mode(Enum):
     ON = 'ALWAYS_ON'
     OFF = 'ALWAYS_OFF'
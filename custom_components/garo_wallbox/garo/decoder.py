@@ -0,0 +1,104 @@
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from operator import attrgetter
+from typing import AbstractSet, Any, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Returned by the decoders when nothing changed, so idle models do not hold on to empty sets
+NO_CHANGES: frozenset[str] = frozenset()
+
+@dataclass(frozen=True)
+class Field:
+    """One json value of a model.
+
+    The value is stored on the model as '_<attr>' and exposed as a read-only property.
+    While decoding, the raw value is parsed as 'enum' or passed through 'convert',
+    then divided by 'divider' (a number, or the name of a model attribute holding one).
+    'accept' can reject a new value given the old one.
+    """
+    key: str
+    attr: str
+    default: Any
+    convert: Callable[[Any], Any] | None = None
+    enum: type[Enum] | None = None
+    accept: Callable[[Any, Any], bool] | None = None
+    divider: float | str | None = None
+
+
+def slots(fields: tuple[Field, ...]) -> tuple[str, ...]:
+    """The __slots__ needed to store a field table."""
+    return tuple(f'_{field.attr}' for field in fields)
+
+
+def model(fields: tuple[Field, ...]):
+    """Class decorator adding the properties, 'apply', '_init_fields' and '_decode' for a field table."""
+    def wrap(cls):
+        for field in fields:
+            if field.attr not in cls.__dict__:
+                setattr(cls, field.attr, property(attrgetter(f'_{field.attr}')))
+        if 'apply' not in cls.__dict__:
+            cls.apply = apply
+        cls._fields = fields
+        cls._init_fields = build_initializer(cls.__name__, fields)
+        cls._decode = build_decoder(cls.__name__, fields)
+        return cls
+    return wrap
+
+
+def apply(self, attr: str, value: Any) -> bool:
+    """Set a field to a value that was not read from the charger, returns True if it changed."""
+    if getattr(self, f'_{attr}') == value:
+        return False
+    setattr(self, f'_{attr}', value)
+    return True
+
+
+def build_initializer(name: str, fields: tuple[Field, ...]) -> Callable[[Any], None]:
+    namespace: dict[str, Any] = {}
+    lines = ["def _init_fields(self):"]
+    for i, field in enumerate(fields):
+        namespace[f'default_{i}'] = field.default
+        lines.append(f"    self._{field.attr} = default_{i}")
+    if not fields:
+        lines.append("    pass")
+    return _compile(name, '_init_fields', lines, namespace)
+
+
+def build_decoder(name: str, fields: tuple[Field, ...]) -> Callable[[Any, dict], AbstractSet[str]]:
+    """Generate a function that loads json into a model and returns the names of the changed fields."""
+    namespace: dict[str, Any] = {'_LOGGER': _LOGGER, 'NO_CHANGES': NO_CHANGES}
+    lines = ["def _decode(self, json):", "    changed = set()"]
+    for i, field in enumerate(fields):
+        lines.append(f"    if {field.key!r} in json:")
+        lines.append(f"        value = json[{field.key!r}]")
+        if field.enum is not None:
+            namespace[f'enum_{i}'] = field.enum
+            lines.append("        try:")
+            lines.append(f"            value = enum_{i}(value)")
+            lines.append("        except ValueError:")
+            lines.append(f"            _LOGGER.warning(\"Error reading property '%s' with value '%s'\", {field.key!r}, value)")
+            lines.append(f"            value = self._{field.attr}")
+        if field.convert is not None:
+            namespace[f'convert_{i}'] = field.convert
+            lines.append(f"        value = convert_{i}(value)")
+        if isinstance(field.divider, str):
+            lines.append(f"        value = value / self.{field.divider}")
+        elif field.divider is not None:
+            lines.append(f"        value = value / {field.divider!r}")
+        if field.accept is not None:
+            namespace[f'accept_{i}'] = field.accept
+            lines.append(f"        if value != self._{field.attr} and accept_{i}(self._{field.attr}, value):")
+        else:
+            lines.append(f"        if value != self._{field.attr}:")
+        lines.append(f"            self._{field.attr} = value")
+        lines.append(f"            changed.add({field.attr!r})")
+    lines.append("    return changed if changed else NO_CHANGES")
+    return _compile(name, '_decode', lines, namespace)
+
+
+def _compile(name: str, function: str, lines: list[str], namespace: dict[str, Any]):
+    code = compile('\n'.join(lines), f'<garo decoder {name}.{function}>', 'exec')
+    exec(code, namespace)
+    return namespace[function]
@@ -0,0 +1,133 @@
+import logging
+import time
+from collections import deque
+from typing import Callable
+
+from . import const
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REPROBE_INTERVAL = 24 * 60 * 60
+DEFAULT_RETRY_BUDGET = 5
+DEFAULT_RETRY_WINDOW = 5 * 60
+
+class EndpointManager:
+    """Keeps track of which REST endpoint family a charger answers on."""
+
+    def __init__(
+            self,
+            host: str,
+            data: dict | None = None,
+            reprobe_interval: float = DEFAULT_REPROBE_INTERVAL,
+            retry_budget: int = DEFAULT_RETRY_BUDGET,
+            retry_window: float = DEFAULT_RETRY_WINDOW):
+        self._host = host
+        self._reprobe_interval = reprobe_interval
+        self._retry_budget = retry_budget
+        self._retry_window = retry_window
+        self._family: const.ApiFamily | None = None
+        self._firmware_version: int | None = None
+        self._firmware_revision: int | None = None
+        self._probed_at = 0.0
+        self._retries: deque[float] = deque()
+        self._listeners: list[Callable[[], None]] = []
+        self.load(data)
+
+    def load(self, data: dict | None):
+        if not data or data.get('host') != self._host:
+            return
+        try:
+            self._family = const.ApiFamily(data['family']) if data.get('family') else None
+        except ValueError:
+            _LOGGER.warning("Ignoring unknown stored API family '%s'", data.get('family'))
+            self._family = None
+        self._firmware_version = data.get('firmware_version')
+        self._firmware_revision = data.get('firmware_revision')
+        self._probed_at = float(data.get('probed_at', 0))
+
+    def as_dict(self) -> dict:
+        return {
+            'host': self._host,
+            'family': self._family.value if self._family else None,
+            'firmware_version': self._firmware_version,
+            'firmware_revision': self._firmware_revision,
+            'probed_at': self._probed_at,
+        }
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback invoked whenever the persisted state changes."""
+        self._listeners.append(listener)
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        return remove
+
+    @property
+    def family(self) -> const.ApiFamily | None:
+        return self._family
+
+    @property
+    def is_legacy(self) -> bool:
+        return self._family == const.ApiFamily.LEGACY
+
+    @property
+    def needs_probe(self) -> bool:
+        return self._family is None or time.time() - self._probed_at > self._reprobe_interval
+
+    @property
+    def has_firmware(self) -> bool:
+        return self._firmware_version is not None and self._firmware_revision is not None
+
+    @property
+    def firmware_version(self) -> int:
+        return self._firmware_version or 0
+
+    @property
+    def firmware_revision(self) -> int:
+        return self._firmware_revision or 0
+
+    @property
+    def probe_order(self) -> list[const.ApiFamily]:
+        """Families to try when probing, the last known one first."""
+        if self._family == const.ApiFamily.LEGACY:
+            return [const.ApiFamily.LEGACY, const.ApiFamily.MODERN]
+        return [const.ApiFamily.MODERN, const.ApiFamily.LEGACY]
+
+    def get_url(self, action: str, family: const.ApiFamily | None = None) -> str:
+        family = family or self._family or const.ApiFamily.MODERN
+        if family == const.ApiFamily.LEGACY:
+            return f'http://{self._host}:2222/rest/chargebox/{action}'
+        return f'http://{self._host}:8080/servlet/rest/chargebox/{action}'
+
+    def set_family(self, family: const.ApiFamily):
+        if family != self._family:
+            _LOGGER.info("Charger %s uses the %s endpoint family", self._host, family.value)
+        self._family = family
+        self._probed_at = time.time()
+        self._retries.clear()
+        self._notify()
+
+    def set_firmware(self, version: int, revision: int):
+        if version == self._firmware_version and revision == self._firmware_revision:
+            return
+        self._firmware_version = version
+        self._firmware_revision = revision
+        self._notify()
+
+    def try_consume_retry(self) -> bool:
+        """Take one retry from the budget, returns False once it is spent."""
+        now = time.monotonic()
+        while self._retries and now - self._retries[0] > self._retry_window:
+            self._retries.popleft()
+        if len(self._retries) >= self._retry_budget:
+            return False
+        self._retries.append(now)
+        return True
+
+    def invalidate(self):
+        """Force a new probe on the next request, keeping the last known family as first guess."""
+        self._probed_at = 0.0
+
+    def _notify(self):
+        for listener in list(self._listeners):
+            listener()
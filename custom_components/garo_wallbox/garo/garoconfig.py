@@ -1,8 +1,10 @@
 from . import const, utils, GaroCharger
+from .slaveregistry import SlaveRegistry
 
 class GaroConfig:
 
-    def __init__(self, json):
+    def __init__(self, json, registry: SlaveRegistry | None = None):
+        """Passing the registry of an earlier config keeps its chargers and reconciles them with the slave list."""
         self.max_charge_current = utils.read_value(json,'maxChargeCurrent', 0)
         self.product_id = int(utils.read_value(json, 'productId', '0'))
         self.product = const.PRODUCT_MAP[self.product_id] if self.product_id in const.PRODUCT_MAP else const.GaroProductInfo('Unknown')
@@ -22,29 +24,37 @@ class GaroConfig:
 
 
         slaves = utils.read_value(json, 'slaveList', [])
-        self._master_charger: GaroCharger
-        self._twin_charger: GaroCharger | None = None
-        self._slaves: list[GaroCharger] = []
-        for charger in [GaroCharger(slave) for slave in slaves]:
-            if charger.serial_number == self.serial_number:
-                self._master_charger = charger
-                continue
-            if charger.serial_number == self.twin_serial:
-                self._twin_charger = charger
-                continue
-            self._slaves.append(charger)
+        if registry is None:
+            registry = SlaveRegistry(self.serial_number, self.twin_serial, slaves)
+        else:
+            registry.load(slaves)
+        self._registry = registry
         
+    def apply(self, attr: str, value) -> bool:
+        """Set a setting to a value that was not read from the charger, returns True if it changed."""
+        if getattr(self, attr) == value:
+            return False
+        setattr(self, attr, value)
+        return True
+
+    @property
+    def registry(self) -> SlaveRegistry:
+        return self._registry
+
     @property
     def master_charger(self) -> GaroCharger:
-        return self._master_charger
+        master = self._registry.master
+        if master is None:
+            raise ValueError("Master charger missing from the slave list")
+        return master
     
     @property
     def twin_charger(self) -> GaroCharger | None:
-        return self._twin_charger
+        return self._registry.twin
     
     @property
     def slaves(self) -> list[GaroCharger]:
-        return self._slaves
+        return self._registry.slaves
 
     @property
     def has_twin(self):
@@ -52,7 +62,7 @@ class GaroConfig:
     
     @property
     def has_slaves(self):
-        return len(self._slaves) > 0
+        return len(self._registry.slaves) > 0
     
     @property
     def has_outlet(self):
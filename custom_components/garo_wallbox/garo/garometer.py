@@ -1,6 +1,25 @@
-from . import utils
+from typing import AbstractSet, NamedTuple
 
+from .decoder import NO_CHANGES, Field, model, slots
+
+FIELDS = (
+    Field('meterSerial', 'serial_number', ""),
+    Field('type', 'type', 0),
+    Field('phase1Current', 'l1_current', 0.0, divider='_current_divider'),
+    Field('phase2Current', 'l2_current', 0.0, divider='_current_divider'),
+    Field('phase3Current', 'l3_current', 0.0, divider='_current_divider'),
+    Field('phase1InstPower', 'l1_power', 0.0, divider='_power_divider'),
+    Field('phase2InstPower', 'l2_power', 0.0, divider='_power_divider'),
+    Field('phase3InstPower', 'l3_power', 0.0, divider='_power_divider'),
+    Field('apparentPower', 'apparent_power', 0.0, divider='_power_divider'),
+    Field('accEnergy', 'accumulated_energy', 0.0, divider=1000),
+)
+
+@model(FIELDS)
 class GaroMeter:
+
+    __slots__ = slots(FIELDS) + ('_current_divider', '_power_divider', '_changed_fields')
+
     def __init__(
             self, 
             json = None,
@@ -9,139 +28,61 @@ class GaroMeter:
 
         self._current_divider = current_divider
         self._power_divider = power_divider
-        self._serial_number = ""
-        self._type = 0
-        self._l1_current = 0.0
-        self._l2_current = 0.0
-        self._l3_current = 0.0
-        self._l1_power = 0.0
-        self._l2_power = 0.0
-        self._l3_power = 0.0
-        self._apparent_power = 0.0
-        self._accumulated_energy = 0.0
+        self._init_fields()
 
-        self._has_changed = False
+        self._changed_fields: AbstractSet[str] = NO_CHANGES
         self.load(json)
 
-    def load(self, json = None) -> bool:
-        self._has_changed = False
+    def load(self, json = None) -> AbstractSet[str]:
+        """Load the meter from json and return the names of the fields that changed."""
+        self._changed_fields = NO_CHANGES
         if not json:
-            return False
-        self._has_changed = False
-
-        self.serial_number = utils.read_value(json, 'meterSerial', self._serial_number)
-        self.type = utils.read_value(json, 'type', self._type)
-        self.l1_current = utils.read_value(json, 'phase1Current', self._l1_current)
-        self.l2_current = utils.read_value(json, 'phase2Current', self._l2_current)
-        self.l3_current = utils.read_value(json, 'phase3Current', self._l3_current)
-        self.l1_power = utils.read_value(json, 'phase1InstPower', self._l1_power)
-        self.l2_power = utils.read_value(json, 'phase2InstPower', self._l2_power)
-        self.l3_power = utils.read_value(json, 'phase3InstPower', self._l3_power)
-        self.apparent_power = utils.read_value(json, 'apparentPower', self._apparent_power)
-        self.accumulated_energy = utils.read_value(json, 'accEnergy', self._accumulated_energy)
-        
-        return self._has_changed
+            return self._changed_fields
+        self._changed_fields = self._decode(json)
+        return self._changed_fields
     
     @property
     def has_changed(self):
-        return self._has_changed
-    
-    @property
-    def serial_number(self):
-        return self._serial_number
-    @serial_number.setter
-    def serial_number(self, value):
-        if self._serial_number == value:
-            return
-        self._serial_number = value
-        self._has_changed = True
+        return bool(self._changed_fields)
 
     @property
-    def type(self):
-        return self._type
-    @type.setter
-    def type(self, value):
-        if self._type == value:
-            return
-        self._type = value
-        self._has_changed = True
+    def changed_fields(self) -> AbstractSet[str]:
+        """Fields that changed in the last load."""
+        return self._changed_fields
 
-    @property
-    def l1_current(self):
-        return self._l1_current / self._current_divider
-    @l1_current.setter
-    def l1_current(self, value):
-        if self._l1_current == value:
-            return
-        self._l1_current = value
-        self._has_changed = True
 
-    @property
-    def l2_current(self):
-        return self._l2_current / self._current_divider
-    @l2_current.setter
-    def l2_current(self, value):
-        if self._l2_current == value:
-            return
-        self._l2_current = value
-        self._has_changed = True
+class GaroMeterSnapshot(NamedTuple):
+    """The values the meter sensors show, derived from one load of a meter.
 
-    @property
-    def l3_current(self):
-        return self._l3_current / self._current_divider
-    @l3_current.setter
-    def l3_current(self, value):
-        if self._l3_current == value:
-            return
-        self._l3_current = value
-        self._has_changed = True
+    Powers are in kW. With calculate_power they are the phase currents times the
+    mains voltage, rounded to 10 W, otherwise the powers the meter reports.
+    """
+    l1_current: float
+    l2_current: float
+    l3_current: float
+    total_current: float
+    current_imbalance: float
+    l1_power: float
+    l2_power: float
+    l3_power: float
+    power: float
+    accumulated_energy: float
 
-    @property
-    def l1_power(self):
-        return self._l1_power / self._power_divider
-    @l1_power.setter
-    def l1_power(self, value):
-        if self._l1_power == value:
-            return
-        self._l1_power = value
-        self._has_changed = True
-
-    @property
-    def l2_power(self):
-        return self._l2_power / self._power_divider
-    @l2_power.setter
-    def l2_power(self, value):
-        if self._l2_power == value:
-            return
-        self._l2_power = value
-        self._has_changed = True
-
-    @property
-    def l3_power(self):
-        return self._l3_power / self._power_divider
-    @l3_power.setter
-    def l3_power(self, value):
-        if self._l3_power == value:
-            return
-        self._l3_power = value
-        self._has_changed = True
-
-    @property
-    def apparent_power(self):
-        return self._apparent_power / self._power_divider
-    @apparent_power.setter
-    def apparent_power(self, value):
-        if self._apparent_power == value:
-            return
-        self._apparent_power = value
-        self._has_changed = True
-
-    @property
-    def accumulated_energy(self):
-        return self._accumulated_energy / 1000
-    @accumulated_energy.setter
-    def accumulated_energy(self, value):
-        if self._accumulated_energy == value:
-            return
-        self._accumulated_energy = value
-        self._has_changed = True
\ No newline at end of file
+    @classmethod
+    def of(cls, meter: GaroMeter, calculate_power: bool, voltage: int) -> 'GaroMeterSnapshot':
+        l1, l2, l3 = meter.l1_current, meter.l2_current, meter.l3_current
+        total_current = l1 + l2 + l3
+        if calculate_power:
+            l1_power = round(l1 * voltage, -1) / 1000
+            l2_power = round(l2 * voltage, -1) / 1000
+            l3_power = round(l3 * voltage, -1) / 1000
+            power = round(total_current * voltage, -1) / 1000
+        else:
+            l1_power, l2_power, l3_power, power = meter.l1_power, meter.l2_power, meter.l3_power, meter.apparent_power
+        return cls(
+            l1, l2, l3,
+            total_current,
+            max(l1, l2, l3) - min(l1, l2, l3),
+            l1_power, l2_power, l3_power,
+            power,
+            meter.accumulated_energy)
@@ -1,33 +1,38 @@
 from datetime import time, datetime
-import json
+from typing import AbstractSet
 
-from . import const, utils
+from . import const
+from .decoder import NO_CHANGES, Field, model, slots
 
+def _parse_time(value: str) -> time:
+    return datetime.strptime(value, "%H:%M:%S").time()
+
+FIELDS = (
+    # The id is only taken from the first payload
+    Field('schemaId', 'id', -1, accept=lambda old, new: old < 1),
+    Field('start', 'start', time(0,0), convert=_parse_time),
+    Field('stop', 'stop', time(0,0), convert=_parse_time),
+    Field('weekday', 'day_of_the_week', const.SchemaDayOfWeek.MONDAY, enum=const.SchemaDayOfWeek),
+    Field('chargeLimit', 'charge_limit', 0),
+)
+
+@model(FIELDS)
 class GaroSchema:
 
+    __slots__ = slots(FIELDS) + ('_changed_fields',)
+
     def __init__(self, json = None):
 
-        self._id = -1
-        self._start = time(0,0)
-        self._stop = time(0,0)
-        self._day_of_the_week = const.SchemaDayOfWeek.MONDAY
-        self._charge_limit = 0
+        self._init_fields()
 
-        self._has_changed = False
+        self._changed_fields: AbstractSet[str] = NO_CHANGES
         self.load(json)
 
-    def load(self, json):
+    def load(self, json) -> AbstractSet[str]:
         if not json:
-            return False
-        self._has_changed = False
-        if self._id < 1:
-            self._id = utils.read_value(json, 'schemaId', -1)
-            self._has_changed = True
-        self.start = datetime.strptime(utils.read_value(json, 'start', self._start.strftime("%H:%M:%S")), "%H:%M:%S").time()
-        self.stop = datetime.strptime(utils.read_value(json, 'stop', self._stop.strftime("%H:%M:%S")), "%H:%M:%S").time()
-        self.day_of_the_week = utils.read_enum(json, 'weekday', const.SchemaDayOfWeek, self._day_of_the_week)
-        self.charge_limit = utils.read_value(json, 'chargeLimit', self._charge_limit)
-        return self._has_changed
+            return NO_CHANGES
+        self._changed_fields = self._decode(json)
+        return self._changed_fields
         
 
     @property
@@ -35,50 +40,11 @@ class GaroSchema:
         if self._id < 1:
             raise ValueError("Invalid ID")
         return self._id
-    
-    @property
-    def start(self):
-        return self._start
-    @start.setter
-    def start(self, value):
-        if self._start == value:
-            return
-        self._start = value
-        self._has_changed = True
-
-    @property
-    def stop(self):
-        return self._stop
-    @stop.setter
-    def stop(self, value):
-        if self._stop == value:
-            return
-        self._stop = value
-        self._has_changed = True
-
-    @property
-    def day_of_the_week(self):
-        return self._day_of_the_week
-    @day_of_the_week.setter
-    def day_of_the_week(self, value):
-        if self._day_of_the_week == value:
-            return
-        self._day_of_the_week = value
-        self._has_changed = True
-
-    @property
-    def charge_limit(self):
-        return self._charge_limit
-    @charge_limit.setter
-    def charge_limit(self, value):
-        if self.charge_limit == value:
-            return
-        self._charge_limit = value
-        self._has_changed = True
 
     @property
     def has_changed(self):
-        return self._has_changed
-    
+        return bool(self._changed_fields)
 
-    
\ No newline at end of file
+    @property
+    def changed_fields(self) -> AbstractSet[str]:
+        return self._changed_fields
@@ -1,232 +1,82 @@
+from typing import AbstractSet
+
 from . import const, utils
+from .decoder import NO_CHANGES, Field, model, slots
 from .garocharger import GaroCharger
 
+def _accept_reading(old, new):
+    """Ignore readings that jump more than 500 kWh at once."""
+    return not (old > 0 and new - old > 500000)
+
+FIELDS = (
+    Field('serialNumber', 'serial_number', 0),
+    Field('connector', 'connector', const.Connector.UNKNOWN, enum=const.Connector),
+    Field('mode', 'mode', const.Mode.OFF, enum=const.Mode),
+    Field('currentLimit', 'current_limit', 0),
+    Field('factoryCurrentLimit', 'factory_current_limit', 0),
+    Field('switchCurrentLimit', 'switch_current_limit', 0),
+    Field('powerMode', 'power_mode', const.PowerMode.OFF, enum=const.PowerMode),
+    Field('currentChargingCurrent', 'current_charging_current', 0.0, convert=utils.charging_current),
+    Field('currentChargingPower', 'current_charging_power', 0, convert=utils.charging_power),
+    Field('accSessionEnergy', 'accumulated_session_energy', 0),
+    Field('accSessionMillis', 'accumulated_session_millis', 0),
+    Field('latestReading', 'latest_reading', 0, accept=_accept_reading),
+    Field('chargeStatus', 'charge_status', 0),
+    Field('currentTemperature', 'current_temperature', 0),
+    Field('nrOfPhases', 'number_of_phases', 1),
+    Field('pilotLevel', 'pilot_level', 0),
+)
+
+# Prefixed names of the charger fields, shared by all status objects
+MAIN_CHARGER_FIELDS = {field.attr: f'main_charger.{field.attr}' for field in GaroCharger._fields}
+TWIN_CHARGER_FIELDS = {field.attr: f'twin_charger.{field.attr}' for field in GaroCharger._fields}
+
+@model(FIELDS)
 class GaroStatus:
 
-    def __init__(self, json = None):
-        self._serial_number = 0
-        self._connector = const.Connector.UNKNOWN
-        self._mode = const.Mode.OFF
-        self._current_limit = 0
-        self._factory_current_limit = 0
-        self._switch_current_limit = 0
-        self._power_mode = const.PowerMode.OFF
-        self._current_charging_current = 0.0
-        self._current_charging_power = 0
-        self._accumulated_session_energy = 0
-        self._accumulated_session_millis = 0
-        self._latest_reading = 0
-        self._charge_status = 0
-        self._current_temperature = 0
-        self._number_of_phases = 1
-        self._pilot_level = 0
+    __slots__ = slots(FIELDS) + ('_main_charger', '_twin_charger', '_changed_fields')
 
+    def __init__(self, json = None):
+        self._init_fields()
         self._main_charger = GaroCharger()
-        self._twin_charger = GaroCharger()
+        # Only twin boxes report a twin charger, it is created on first use
+        self._twin_charger: GaroCharger | None = None
         self.load(json)
 
-    def load(self, json = None) -> bool:
-        self._has_changed = False
+    def load(self, json = None) -> AbstractSet[str]:
+        """Load the status from json and return the names of the fields that changed.
+
+        Changes on the main and twin charger are prefixed with 'main_charger.' and 'twin_charger.'.
+        """
+        self._changed_fields = NO_CHANGES
         if not json:
-            return False
+            return self._changed_fields
         
-        self._serial_number = json['serialNumber']
-        self.connector = utils.read_enum(json,'connector', const.Connector, self._connector)
-        self.mode = utils.read_enum(json,'mode', const.Mode, self._mode)
-        self.current_limit = utils.read_value(json,'currentLimit', self._current_limit)
-        self.factory_current_limit = utils.read_value(json,'factoryCurrentLimit', self._factory_current_limit)
-        self.switch_current_limit = utils.read_value(json,'switchCurrentLimit', self._switch_current_limit)
-        self.power_mode = utils.read_enum(json,'powerMode', const.PowerMode, self._power_mode)
-        self.current_charging_current = utils.read_value(json,'currentChargingCurrent', self._current_charging_current)
-        self.current_charging_power = utils.read_value(json,'currentChargingPower', self._current_charging_power)
-        self.accumulated_session_energy = utils.read_value(json,'accSessionEnergy', self._accumulated_session_energy)
-        self.accumulated_session_millis = utils.read_value(json,'accSessionMillis', self._accumulated_session_millis)
-        self.latest_reading = utils.read_value(json,'latestReading', self._latest_reading)
-        self.charge_status = utils.read_value(json,'chargeStatus', self._charge_status)
-        self.current_temperature = utils.read_value(json,'currentTemperature', self._current_temperature)
-        self.number_of_phases = utils.read_value(json,'nrOfPhases', self._number_of_phases)
-        self.pilot_level = utils.read_value(json,'pilotLevel', self._pilot_level)
-
-        if 'mainCharger' in json and self._main_charger.load(json['mainCharger']):
-            self._has_changed = True
-        if 'twinCharger' in json and self._twin_charger.load(json['twinCharger']):
-            self._has_changed = True
-
-        return self._has_changed
+        changed = self._decode(json)
+        main_changed = self._main_charger.load(json['mainCharger']) if 'mainCharger' in json else NO_CHANGES
+        twin_changed = self.twin_charger.load(json['twinCharger']) if json.get('twinCharger') is not None else NO_CHANGES
+        if main_changed or twin_changed:
+            changed = set(changed)
+            changed.update(MAIN_CHARGER_FIELDS[field] for field in main_changed)
+            changed.update(TWIN_CHARGER_FIELDS[field] for field in twin_changed)
+        self._changed_fields = changed
+        return self._changed_fields
     
     @property
     def has_changed(self):
-        return self._has_changed
+        return bool(self._changed_fields)
+
+    @property
+    def changed_fields(self) -> AbstractSet[str]:
+        """Fields that changed in the last load."""
+        return self._changed_fields
     
     @property
     def main_charger(self):
         return self._main_charger
     
     @property
-    def twin_charger(self):
+    def twin_charger(self) -> GaroCharger:
+        if self._twin_charger is None:
+            self._twin_charger = GaroCharger()
         return self._twin_charger
-    
-    @property
-    def serial_number(self):
-        return self._serial_number
-    @serial_number.setter
-    def serial_number(self, value):
-        if self._serial_number == value:
-            return
-        self._serial_number = value
-        self._has_changed = True
-
-    @property
-    def connector(self):        
-        return self._connector
-    @connector.setter
-    def connector(self, value):
-        if self._connector == value:
-            return
-        self._connector = value
-        self._has_changed = True
-
-    @property
-    def mode(self):
-        return self._mode
-    @mode.setter
-    def mode(self, value):
-        if self._mode == value:
-            return
-        self._mode = value
-        self._has_changed = True
-
-    @property
-    def current_limit(self):
-        return self._current_limit
-    @current_limit.setter
-    def current_limit(self, value):
-        if self._current_limit == value:
-            return
-        self._current_limit = value
-        self._has_changed = True
-
-    @property
-    def factory_current_limit(self):
-        return self._factory_current_limit
-    @factory_current_limit.setter
-    def factory_current_limit(self, value):
-        if self._factory_current_limit == value:
-            return
-        self._factory_current_limit = value
-        self._has_changed = True
-
-    @property
-    def switch_current_limit(self):
-        return self._switch_current_limit
-    @switch_current_limit.setter
-    def switch_current_limit(self, value):
-        if self._switch_current_limit == value:
-            return
-        self._switch_current_limit = value
-        self._has_changed = True
-
-    @property
-    def power_mode(self):
-        return self._power_mode
-    @power_mode.setter
-    def power_mode(self, value):
-        if self._power_mode == value:
-            return
-        self._power_mode = value
-        self._has_changed = True
-
-    @property
-    def current_charging_current(self):
-        return self._current_charging_current
-    @current_charging_current.setter
-    def current_charging_current(self, value):
-        value = max(0, value / 1000)
-        if self._current_charging_current == value:
-            return
-        self._current_charging_current = value
-        self._has_changed = True
-
-    @property
-    def current_charging_power(self):
-        return self._current_charging_power
-    @current_charging_power.setter
-    def current_charging_power(self, value):
-        if value > 32000:
-            value = 0
-        if self._current_charging_power == value:
-            return
-        self._current_charging_power = value
-        self._has_changed = True
-
-    @property
-    def accumulated_session_energy(self):
-        return self._accumulated_session_energy
-    @accumulated_session_energy.setter
-    def accumulated_session_energy(self, value):
-        if self._accumulated_session_energy == value:
-            return
-        self._accumulated_session_energy = value
-        self._has_changed = True
-
-    @property
-    def accumulated_session_millis(self):
-        return self._accumulated_session_millis
-    @accumulated_session_millis.setter
-    def accumulated_session_millis(self, value):
-        if self._accumulated_session_millis == value:
-            return
-        self._accumulated_session_millis = value
-        self._has_changed = True
-
-    @property
-    def latest_reading(self):
-        return self._latest_reading
-    @latest_reading.setter
-    def latest_reading(self, value):
-        if self._latest_reading == value:
-            return
-        if self._latest_reading > 0 and value - self._latest_reading > 500000:
-            return
-        self._latest_reading = value
-        self._has_changed = True
-
-    @property
-    def charge_status(self):
-        return self._charge_status
-    @charge_status.setter
-    def charge_status(self, value):
-        if self._charge_status == value:
-            return
-        self._charge_status = value
-        self._has_changed = True
-
-    @property
-    def current_temperature(self):
-        return self._current_temperature
-    @current_temperature.setter
-    def current_temperature(self, value):
-        if self._current_temperature == value:
-            return
-        self._current_temperature = value
-        self._has_changed = True
-
-    @property
-    def number_of_phases(self):
-        return self._number_of_phases
-    @number_of_phases.setter
-    def number_of_phases(self, value):
-        if self._number_of_phases == value:
-            return
-        self._number_of_phases = value
-        self._has_changed = True
-
-    @property
-    def pilot_level(self):
-        return self._pilot_level
-    @pilot_level.setter
-    def pilot_level(self, value):
-        if self._pilot_level == value:
-            return
-        self._pilot_level = value
-        self._has_changed = True
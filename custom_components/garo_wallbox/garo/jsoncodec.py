@@ -0,0 +1,21 @@
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JsonLoads = Callable[[bytes], Any]
+
+# Decoders taking the raw response body, orjson is part of Home Assistant's own dependencies
+DECODERS: dict[str, JsonLoads] = {'json': json.loads}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+
+def get_decoder(name: str | None = None) -> JsonLoads:
+    """The named decoder, or the fastest one installed."""
+    if name is None:
+        return DECODERS.get('orjson', json.loads)
+    return DECODERS[name]
@@ -0,0 +1,194 @@
+import time
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets in seconds, slower requests land in a last open bucket
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_WINDOW = 15 * 60
+# Rates are not extrapolated from less than this many seconds
+MIN_RATE_SPAN = 60
+
+def endpoint_name(method: str, action: str) -> str:
+    """The name requests are counted under, ids and values in the action are dropped."""
+    base = action.split('/', 1)[0]
+    if method == 'GET':
+        # One entry per meter and slaves variant, the other actions have no variants worth telling apart
+        return action if base in ('meterinfo', 'slaves') else base
+    return f'{method} {base}'
+
+
+class RollingHistogram:
+    """Latency counts per bucket over the last one to two windows.
+
+    Counts go into the current window, which becomes the previous one after 'window'
+    seconds, so recording costs a bisect and two additions.
+    """
+
+    __slots__ = ('_window', '_start', '_current', '_previous', '_current_sum', '_previous_sum')
+
+    def __init__(self, window: float = DEFAULT_WINDOW):
+        self._window = window
+        self._start = time.monotonic()
+        self._current = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._previous = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._current_sum = 0.0
+        self._previous_sum = 0.0
+
+    def record(self, value: float, now: float):
+        self._rotate(now)
+        self._current[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self._current_sum += value
+
+    def counts(self, now: float) -> list[int]:
+        self._rotate(now)
+        return [current + previous for current, previous in zip(self._current, self._previous)]
+
+    def per_minute(self, now: float) -> float:
+        """Records per minute over the time the counts cover."""
+        counts = self.counts(now)
+        span = now - self._start + (self._window if any(self._previous) else 0)
+        return sum(counts) / max(span, MIN_RATE_SPAN) * 60
+
+    def mean(self, now: float) -> float | None:
+        count = sum(self.counts(now))
+        return (self._current_sum + self._previous_sum) / count if count else None
+
+    def percentile(self, q: float, now: float) -> float | None:
+        """Upper bound of the bucket holding the q-th percentile, None past the last bound."""
+        counts = self.counts(now)
+        total = sum(counts)
+        if not total:
+            return None
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= q * total:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else None
+        return None
+
+    def _rotate(self, now: float):
+        elapsed = now - self._start
+        if elapsed < self._window:
+            return
+        if elapsed < 2 * self._window:
+            self._previous, self._previous_sum = self._current, self._current_sum
+        else:
+            self._previous, self._previous_sum = [0] * len(self._current), 0.0
+        self._current, self._current_sum = [0] * len(self._previous), 0.0
+        self._start = now - elapsed % self._window
+
+
+class EndpointMetrics:
+    """Totals since start up and a rolling latency histogram of one endpoint."""
+
+    __slots__ = ('requests', 'errors', 'timeouts', 'http_errors', 'bytes_received', 'max_latency', 'last_latency', 'histogram')
+
+    def __init__(self, window: float):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.http_errors = 0
+        self.bytes_received = 0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+        self.histogram = RollingHistogram(window)
+
+    def as_dict(self, now: float) -> dict:
+        counts = self.histogram.counts(now)
+        mean = self.histogram.mean(now)
+        p95 = self.histogram.percentile(0.95, now)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'http_errors': self.http_errors,
+            'bytes_received': self.bytes_received,
+            'requests_per_minute': round(self.histogram.per_minute(now), 2),
+            'mean_latency_ms': None if mean is None else round(mean * 1000, 1),
+            'p95_latency_ms': None if p95 is None else p95 * 1000,
+            'max_latency_ms': round(self.max_latency * 1000, 1),
+            'last_latency_ms': round(self.last_latency * 1000, 1),
+            'histogram': {
+                **{f'<={int(bound * 1000)}ms': count for bound, count in zip(LATENCY_BUCKETS, counts)},
+                f'>{int(LATENCY_BUCKETS[-1] * 1000)}ms': counts[-1],
+            },
+        }
+
+
+class ApiMetrics:
+    """Request counts, errors, bytes and latency per endpoint of one charger.
+
+    Totals count since start up. Latencies and rates cover the requests answered in the
+    last one to two 'window's.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW):
+        self._window = window
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self._fallbacks = 0
+        self._retries = 0
+
+    def record(self, endpoint: str, duration: float, status: int | None = None, size: int = 0, error: str | None = None):
+        """Record one request, 'error' is 'timeout' or 'error' when it raised instead of answering."""
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics(self._window)
+        metrics.requests += 1
+        if error is not None:
+            metrics.errors += 1
+            if error == 'timeout':
+                metrics.timeouts += 1
+            return
+        if status is not None and status >= 400:
+            metrics.errors += 1
+            metrics.http_errors += 1
+        metrics.bytes_received += size
+        metrics.last_latency = duration
+        if duration > metrics.max_latency:
+            metrics.max_latency = duration
+        metrics.histogram.record(duration, time.monotonic())
+
+    def record_fallback(self):
+        """A probe found the charger on another endpoint family than the one tried first."""
+        self._fallbacks += 1
+
+    def record_retry(self):
+        self._retries += 1
+
+    @property
+    def fallbacks(self) -> int:
+        return self._fallbacks
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    @property
+    def errors(self) -> int:
+        return sum(metrics.errors for metrics in self._endpoints.values())
+
+    def requests_per_minute(self) -> float:
+        now = time.monotonic()
+        return round(sum(metrics.histogram.per_minute(now) for metrics in self._endpoints.values()), 2)
+
+    def mean_latency(self, prefix: str) -> float | None:
+        """Mean latency in milliseconds of the endpoints starting with prefix, over the window."""
+        now = time.monotonic()
+        count = 0
+        total = 0.0
+        for name, metrics in self._endpoints.items():
+            if name.startswith(prefix):
+                n = sum(metrics.histogram.counts(now))
+                mean = metrics.histogram.mean(now)
+                if mean is not None:
+                    count += n
+                    total += mean * n
+        return round(total / count * 1000, 1) if count else None
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            'window_seconds': self._window,
+            'fallbacks': self._fallbacks,
+            'retries': self._retries,
+            'endpoints': {name: metrics.as_dict(now) for name, metrics in sorted(self._endpoints.items())},
+        }
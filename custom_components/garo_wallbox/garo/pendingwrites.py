@@ -0,0 +1,105 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PENDING_TIMEOUT = 30
+
+@dataclass(kw_only=True)
+class PendingWrite:
+    """A value written to the charger and shown before a read confirmed it."""
+    source: str
+    get_target: Callable[[], Any]
+    attr: str
+    value: Any
+    original: Any
+    expires: float
+
+
+class PendingWrites:
+    """Write-through state for values set on the charger.
+
+    The written value is applied to the model right away. Each read of the endpoint
+    the value comes from ('source') either confirms it, or applies it again while the
+    charger catches up. Values still not confirmed after 'timeout' seconds are
+    rolled back to what the charger reports.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_PENDING_TIMEOUT):
+        self._timeout = timeout
+        self._pending: dict[str, PendingWrite] = {}
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    def waiting(self, source: str) -> bool:
+        """Whether a value read from source is still waiting to be confirmed."""
+        return any(write.source == source for write in self._pending.values())
+
+    def apply(self, field: str, source: str, get_target: Callable[[], Any], attr: str, value: Any) -> bool:
+        """Show value on the model returned by get_target until a read of source confirms it.
+
+        Returns True if the shown value changed.
+        """
+        target = get_target()
+        previous = self._pending.get(field)
+        self._pending[field] = PendingWrite(
+            source=source,
+            get_target=get_target,
+            attr=attr,
+            value=value,
+            # A value written again over a pending one reverts to what the charger reported
+            original=previous.original if previous is not None else getattr(target, attr),
+            expires=time.monotonic() + self._timeout)
+        return target.apply(attr, value)
+
+    def discard(self, field: str):
+        """Forget a pending value. The model keeps what it shows."""
+        self._pending.pop(field, None)
+
+    def revert(self, field: str) -> bool:
+        """Forget a pending value and show the value from before it was applied, for a write that failed.
+
+        Returns True if the shown value changed.
+        """
+        write = self._pending.pop(field, None)
+        if write is None:
+            return False
+        target = write.get_target()
+        return target is not None and target.apply(write.attr, write.original)
+
+    def reconcile(self, source: str) -> set[str]:
+        """Check the pending values against a fresh read of source.
+
+        Must run right after the read was loaded into the models.
+        Returns the fields that were rolled back to the value read.
+        """
+        changed: set[str] = set()
+        now = time.monotonic()
+        for field, write in list(self._pending.items()):
+            if write.source != source:
+                continue
+            target = write.get_target()
+            if target is None:
+                del self._pending[field]
+                continue
+            if getattr(target, write.attr) == write.value:
+                del self._pending[field]
+            elif now < write.expires:
+                target.apply(write.attr, write.value)
+            else:
+                del self._pending[field]
+                changed.add(field)
+                _LOGGER.warning(
+                    "The charger did not confirm %s = %s, showing the reported %s",
+                    field, write.value, getattr(target, write.attr))
+        return changed
@@ -0,0 +1,76 @@
+import time
+from typing import Iterable
+
+from .const import Connector
+
+DEFAULT_MIN_INTERVAL = 5
+DEFAULT_MAX_INTERVAL = 120
+DEFAULT_BURST_DURATION = 120
+DEFAULT_BACKOFF_FACTOR = 1.5
+
+ACTIVE_CONNECTORS = frozenset([
+    Connector.CHANGING,
+    Connector.CONNECTED,
+    Connector.SEARCH_COMM,
+    Connector.CHARGING,
+    Connector.CHARGING_PAUSED,
+    Connector.INITIALIZATION,
+])
+IDLE_CONNECTORS = frozenset([
+    Connector.NOT_CONNECTED,
+    Connector.CHARGING_FINISHED,
+    Connector.CHARGING_CANCELLED,
+    Connector.UNKNOWN,
+    # Offline slaves, they must not keep the outlets next to them from backing off gradually
+    Connector.UNAVAILABLE,
+])
+
+class AdaptivePollPolicy:
+    """Picks the next poll interval from the connector states of a charger.
+
+    Any change of connector or charge status starts a burst of polls at the minimum
+    interval, so plug-in, session start and session end are followed closely.
+    While a car is connected the base interval is used. Idle chargers back off
+    towards the maximum interval, disabled and faulted chargers go straight to it.
+    Unavailable connectors count as idle.
+    """
+
+    def __init__(
+            self,
+            base_interval: float,
+            min_interval: float = DEFAULT_MIN_INTERVAL,
+            max_interval: float = DEFAULT_MAX_INTERVAL,
+            burst_duration: float = DEFAULT_BURST_DURATION,
+            backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+        self._min_interval = min_interval
+        self._max_interval = max(max_interval, min_interval)
+        self._base_interval = min(max(base_interval, self._min_interval), self._max_interval)
+        self._burst_duration = burst_duration
+        self._backoff_factor = backoff_factor
+        self._state: tuple | None = None
+        self._burst_until = 0.0
+        self._interval = self._base_interval
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def next_interval(self, connectors: Iterable[Connector], charge_statuses: Iterable[int] = ()) -> float:
+        """Interval until the next poll, given the connectors and charge statuses seen in this one."""
+        connectors = tuple(connectors)
+        state = (connectors, tuple(charge_statuses))
+        now = time.monotonic()
+        if self._state is not None and state != self._state:
+            self._burst_until = now + self._burst_duration
+        self._state = state
+
+        if now < self._burst_until:
+            self._interval = self._min_interval
+        elif any(connector in ACTIVE_CONNECTORS for connector in connectors):
+            self._interval = self._base_interval
+        elif connectors and all(connector in IDLE_CONNECTORS for connector in connectors):
+            self._interval = min(max(self._interval, self._base_interval) * self._backoff_factor, self._max_interval)
+        else:
+            # Disabled and fault states
+            self._interval = self._max_interval
+        return self._interval
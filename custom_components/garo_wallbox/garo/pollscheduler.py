@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SPACING = 1.0
+DEFAULT_JITTER = 5.0
+
+@dataclass(kw_only=True)
+class PollJob:
+    """A periodic fetch, 'interval' is asked again after every run."""
+    name: str
+    interval: Callable[[], float]
+    callback: Callable[[], Awaitable]
+    next_run: float = 0.0
+    last_run: float | None = None
+    last_duration: float | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class PollScheduler:
+    """Runs all periodic fetches of one charger from a single timer.
+
+    Jobs run one at a time and never start closer than 'spacing' seconds to each other,
+    so the charger sees a steady trickle of requests instead of bursts from
+    independent timers. A job still running after its interval is left to finish in
+    the background while the other jobs go on, it is not started again until then. The first runs are delayed by a random offset of up to
+    'jitter' seconds so many chargers set up together do not poll in lockstep.
+    """
+
+    def __init__(self, spacing: float = DEFAULT_SPACING, jitter: float = DEFAULT_JITTER):
+        self._spacing = spacing
+        self._offset = random.uniform(0, jitter)
+        self._jobs: dict[str, PollJob] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self._last_start = 0.0
+
+    def add_job(self, name: str, interval: Callable[[], float], callback: Callable[[], Awaitable]) -> Callable[[], None]:
+        """Register a job, it first runs one interval (plus the start offset) from now. Returns a remover."""
+        job = PollJob(name=name, interval=interval, callback=callback)
+        job.next_run = time.monotonic() + self._offset + interval()
+        self._jobs[name] = job
+        self._wakeup.set()
+        def remove():
+            if self._jobs.get(name) is job:
+                del self._jobs[name]
+                self._wakeup.set()
+        return remove
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def timeline(self) -> list[dict]:
+        """The jobs in the order they will run, with times in seconds relative to now."""
+        now = time.monotonic()
+        return [
+            {
+                'name': job.name,
+                'next_run_in': round(job.next_run - now, 3),
+                'interval': job.interval(),
+                'last_run_ago': None if job.last_run is None else round(now - job.last_run, 3),
+                'last_duration': None if job.last_duration is None else round(job.last_duration, 3),
+                'running': job.task is not None,
+            }
+            for job in sorted(self._jobs.values(), key=lambda job: job.next_run)
+        ]
+
+    def start(self):
+        if not self.is_running:
+            self._task = asyncio.ensure_future(self._async_run())
+
+    async def async_stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        tasks = [self._task, *(job.task for job in self._jobs.values() if job.task is not None)]
+        for task in tasks[1:]:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _async_run(self):
+        while True:
+            self._wakeup.clear()
+            job = self._next_job()
+            if job is None:
+                await self._async_wait(None)
+                continue
+            start = max(job.next_run, self._last_start + self._spacing)
+            delay = start - time.monotonic()
+            if delay > 0:
+                # A job added or removed meanwhile may change what runs next
+                if await self._async_wait(delay):
+                    continue
+            if self._jobs.get(job.name) is not job:
+                continue
+            await self._async_run_job(job)
+
+    async def _async_run_job(self, job: PollJob):
+        self._last_start = job.last_run = time.monotonic()
+        job.task = asyncio.ensure_future(self._async_call(job))
+        # The other jobs wait for this one for at most its interval, a hung charger must not hold them up
+        deadline = max(job.interval(), self._spacing)
+        done, _ = await asyncio.wait({job.task}, timeout=deadline)
+        if not done:
+            _LOGGER.warning("Poll job '%s' still running after %.0f seconds, running the other jobs meanwhile", job.name, deadline)
+
+    async def _async_call(self, job: PollJob):
+        try:
+            await job.callback()
+        except Exception as e:
+            _LOGGER.error("Poll job '%s' failed: %s", job.name, e)
+        finally:
+            now = time.monotonic()
+            job.last_duration = now - job.last_run
+            # Keep the cadence, but never queue up runs that were missed while this one was slow
+            job.next_run = max(job.last_run + job.interval(), now)
+            job.task = None
+            self._wakeup.set()
+
+    async def _async_wait(self, delay: float | None) -> bool:
+        """Sleep for delay seconds, returns True when woken up early by a job change or a job finishing."""
+        # Unlike wait_for, timeout does not drop a cancel that arrives as the wakeup is set, like on unload
+        try:
+            async with asyncio.timeout(delay):
+                await self._wakeup.wait()
+        except TimeoutError:
+            return False
+        return True
+
+    def _next_job(self) -> PollJob | None:
+        if not self._jobs:
+            return None
+        return min((job for job in self._jobs.values() if job.task is None), key=lambda job: job.next_run, default=None)
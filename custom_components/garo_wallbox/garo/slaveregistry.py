@@ -0,0 +1,114 @@
+import logging
+from typing import AbstractSet, Callable
+
+from .garocharger import GaroCharger
+
+_LOGGER = logging.getLogger(__name__)
+
+TopologyListener = Callable[[list[GaroCharger], list[GaroCharger]], None]
+
+DEFAULT_REMOVAL_LOADS = 3
+
+class SlaveRegistry:
+    """The chargers known to a master, indexed by serial number.
+
+    Holds the master and twin as well, 'slaves' excludes them. A slave is removed once
+    it was missing from 'removal_loads' slave lists in a row, a slave that misses one
+    answer keeps its entities.
+    """
+
+    def __init__(self, master_serial: int, twin_serial: int, json: list[dict] | None = None, removal_loads: int = DEFAULT_REMOVAL_LOADS):
+        self._master_serial = master_serial
+        self._twin_serial = twin_serial
+        self._removal_loads = removal_loads
+        self._chargers: dict[int, GaroCharger] = {}
+        self._missing: dict[int, int] = {}
+        self._slaves: list[GaroCharger] | None = None
+        self._listeners: list[TopologyListener] = []
+        if json:
+            for d in json:
+                if 'serialNumber' in d:
+                    self._chargers[d['serialNumber']] = GaroCharger(d)
+
+    def add_listener(self, listener: TopologyListener) -> Callable[[], None]:
+        """Register a callback invoked with the added and removed slaves when the topology changes."""
+        self._listeners.append(listener)
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        return remove
+
+    def get(self, serial_number: int) -> GaroCharger | None:
+        return self._chargers.get(serial_number)
+
+    def __contains__(self, serial_number: int) -> bool:
+        return serial_number in self._chargers
+
+    def __len__(self) -> int:
+        return len(self._chargers)
+
+    @property
+    def master(self) -> GaroCharger | None:
+        return self._chargers.get(self._master_serial)
+
+    @property
+    def twin(self) -> GaroCharger | None:
+        return self._chargers.get(self._twin_serial)
+
+    @property
+    def chargers(self) -> list[GaroCharger]:
+        return list(self._chargers.values())
+
+    @property
+    def slaves(self) -> list[GaroCharger]:
+        """The slave chargers, without the master and its twin."""
+        if self._slaves is None:
+            self._slaves = [
+                charger for serial, charger in self._chargers.items()
+                if serial != self._master_serial and serial != self._twin_serial]
+        return self._slaves
+
+    def load(self, json: list[dict]) -> dict[int, AbstractSet[str]]:
+        """Load a slave list and return the changed fields per serial number.
+
+        Slaves missing from the list are removed once they were missing from
+        'removal_loads' lists in a row, the master and twin are kept.
+        """
+        changed: dict[int, AbstractSet[str]] = {}
+        seen: set[int] = set()
+        added: list[GaroCharger] = []
+        for d in json:
+            serial_number = d.get('serialNumber')
+            if serial_number is None:
+                continue
+            seen.add(serial_number)
+            self._missing.pop(serial_number, None)
+            charger = self._chargers.get(serial_number)
+            if charger is None:
+                charger = GaroCharger(d)
+                self._chargers[serial_number] = charger
+                if serial_number != self._master_serial and serial_number != self._twin_serial:
+                    added.append(charger)
+                continue
+            fields = charger.load(d)
+            if fields:
+                changed[serial_number] = fields
+        removed: list[GaroCharger] = []
+        for serial, charger in self._chargers.items():
+            if serial in seen or serial == self._master_serial or serial == self._twin_serial:
+                continue
+            missing = self._missing[serial] = self._missing.get(serial, 0) + 1
+            if missing >= self._removal_loads:
+                removed.append(charger)
+        for charger in removed:
+            del self._chargers[charger.serial_number]
+            del self._missing[charger.serial_number]
+        if added or removed:
+            self._slaves = None
+            _LOGGER.info(
+                "Slave topology changed, added: %s, removed: %s",
+                [c.serial_number for c in added],
+                [c.serial_number for c in removed])
+            for listener in list(self._listeners):
+                listener(added, removed)
+        return changed
@@ -0,0 +1,112 @@
+import contextvars
+import itertools
+import time
+from collections import deque
+
+DEFAULT_CAPACITY = 2000
+
+# The innermost open span of the running task, tasks started inside a span inherit it as parent
+_current_span: contextvars.ContextVar['Span | None'] = contextvars.ContextVar('garo_current_span', default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """A timed section, opened with 'with tracer.span(...)'. Nested spans record it as parent."""
+
+    __slots__ = ('_tracer', '_token', 'id', 'parent_id', 'name', 'detail', 'start', 'duration', 'error')
+
+    def __init__(self, tracer: 'Tracer', name: str, detail: str | None):
+        self._tracer = tracer
+        self._token = None
+        self.name = name
+        self.detail = detail
+        self.error: str | None = None
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        self.id = next(_ids)
+        self.parent_id = parent.id if parent is not None else None
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Closed from another context than it was opened in
+            _current_span.set(None)
+        self._tracer._finish(self)
+
+
+class _NullSpan:
+    """Returned while tracing is off, entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Records nested spans into a ring buffer holding the last 'capacity' spans.
+
+    While disabled span() returns a shared no-op context manager, so instrumented code
+    only pays for the call.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = DEFAULT_CAPACITY):
+        self.enabled = enabled
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        # Spans are timed with perf_counter, this maps them to wall clock time
+        self._epoch = time.time() - time.perf_counter()
+
+    def span(self, name: str, detail: str | None = None) -> Span | _NullSpan:
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, detail)
+
+    def clear(self):
+        self._spans.clear()
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def _finish(self, span: Span):
+        self._spans.append(span)
+
+    def dump(self) -> list[dict]:
+        """The buffered spans as trees, one per trace, oldest first.
+
+        Spans whose parent already left the buffer are shown as roots of their own.
+        """
+        nodes: dict[int, dict] = {}
+        for span in sorted(self._spans, key=lambda span: span.start):
+            node = {
+                'name': span.name,
+                'start': round(self._epoch + span.start, 6),
+                'duration_ms': round(span.duration * 1000, 3),
+            }
+            if span.detail is not None:
+                node['detail'] = span.detail
+            if span.error is not None:
+                node['error'] = span.error
+            node['_parent'] = span.parent_id
+            nodes[span.id] = node
+        roots = []
+        for node in nodes.values():
+            parent = nodes.get(node.pop('_parent'))
+            if parent is None:
+                roots.append(node)
+            else:
+                parent.setdefault('children', []).append(node)
+        return roots
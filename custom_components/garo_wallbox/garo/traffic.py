@@ -0,0 +1,257 @@
+import asyncio
+import aiohttp
+import base64
+import datetime
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+DEFAULT_FLUSH_DELAY = 5.0
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+
+# Sends one request, called as transport(method, action, url, **kwargs) -> (status, body)
+Transport = Callable[..., Awaitable[tuple[int, bytes]]]
+
+
+class ReplayExhausted(Exception):
+    """The capture has no recorded exchange left for a request."""
+
+
+class TrafficRecorder:
+    """Appends every request sent to a charger, with its response and timing, to a capture file.
+
+    The file holds one JSON object per line. Each recording starts with a header line
+    holding the host and the wall clock time it started, every exchange after it holds
+    its offset from that start in seconds ('t'), the method and action, the JSON sent
+    ('data'), the status and body received or the error raised, and how long the
+    request took ('duration'). Lines are buffered and appended from an executor.
+
+    Once the file reaches 'max_size' bytes it is renamed to '<path>.1', replacing the
+    previous one, and a new file is started with a copy of the header.
+    """
+
+    def __init__(self, path: str, flush_delay: float = DEFAULT_FLUSH_DELAY, max_size: int = DEFAULT_MAX_SIZE):
+        self._path = path
+        self._flush_delay = flush_delay
+        self._max_size = max_size
+        self._header: str | None = None
+        self._lines: list[str] = []
+        self._file = None
+        self._flush_task: asyncio.Task | None = None
+        self._write_future: asyncio.Future | None = None
+        self._started: float | None = None
+        self._count = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        """Number of exchanges recorded."""
+        return self._count
+
+    async def async_record(self, host: str, method: str, action: str, data: Any, send: Transport) -> tuple[int, bytes]:
+        """Run send and record the exchange, errors are recorded and raised again."""
+        start = time.monotonic()
+        try:
+            status, body = await send()
+        except Exception as e:
+            self._append(host, start, {'method': method, 'action': action, 'data': data, 'error': type(e).__name__})
+            raise
+        exchange = {'method': method, 'action': action, 'data': data, 'status': status}
+        try:
+            exchange['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            exchange['body64'] = base64.b64encode(body).decode('ascii')
+        self._append(host, start, exchange)
+        return status, body
+
+    async def async_close(self):
+        """Write what is buffered and close the file."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        lines, self._lines = self._lines, []
+        await self._async_write(self._write_and_close, lines)
+
+    def _append(self, host: str, start: float, exchange: dict):
+        if self._started is None:
+            self._started = start
+            self._header = _dump({
+                'capture': CAPTURE_VERSION,
+                'host': host,
+                'started': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            })
+            self._lines.append(self._header)
+        exchange['t'] = round(start - self._started, 3)
+        exchange['duration'] = round(time.monotonic() - start, 4)
+        if exchange['data'] is None:
+            del exchange['data']
+        self._lines.append(_dump(exchange))
+        self._count += 1
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._async_flush_later())
+
+    async def _async_flush_later(self):
+        await asyncio.sleep(self._flush_delay)
+        lines, self._lines = self._lines, []
+        try:
+            await self._async_write(self._write, lines)
+        finally:
+            self._flush_task = None
+        if self._lines:
+            self._flush_task = asyncio.ensure_future(self._async_flush_later())
+
+    async def _async_write(self, write: Callable[[list[str]], None], lines: list[str]):
+        """Run write in the executor once the previous write finished, so the file is used by one thread at a time."""
+        previous = self._write_future
+        if previous is not None and not previous.done():
+            await asyncio.wait({previous})
+        self._write_future = asyncio.get_running_loop().run_in_executor(None, write, lines)
+        try:
+            # Cancelling the flush must not abandon a write that is already running
+            await asyncio.shield(self._write_future)
+        except OSError as e:
+            _LOGGER.error("Could not write the traffic capture %s: %s", self._path, e)
+
+    def _write(self, lines: list[str]):
+        if self._file is None:
+            self._file = open(self._path, 'a', encoding='utf-8')
+            if self._file.tell() == 0 and lines[:1] != [self._header]:
+                # A file started after a rotation, the exchanges keep their offsets from the first header
+                self._file.write(self._header)
+        self._file.write(''.join(lines))
+        self._file.flush()
+        if self._file.tell() >= self._max_size:
+            self._file.close()
+            self._file = None
+            os.replace(self._path, self._path + '.1')
+
+    def _write_and_close(self, lines: list[str]):
+        if lines:
+            self._write(lines)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _dump(obj: dict) -> str:
+    return json.dumps(obj, separators=(',', ':')) + '\n'
+
+
+def read_capture(path: str) -> tuple[dict, list[dict]]:
+    """Read a capture file, returns its first header and every exchange in it.
+
+    Later recordings appended to the same file continue the time line of the earlier ones.
+    """
+    header: dict = {}
+    exchanges: list[dict] = []
+    offset = 0.0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if 'capture' in entry:
+                header = header or entry
+                if exchanges:
+                    offset = exchanges[-1]['t'] + exchanges[-1].get('duration', 0)
+                continue
+            entry['t'] += offset
+            exchanges.append(entry)
+    return header, exchanges
+
+
+class TrafficReplay:
+    """Answers the api client's requests from a capture, to be passed as its transport.
+
+    Requests are matched on method and action and answered with the exchanges recorded
+    for them in the order they were recorded, so a replay hands the models the same
+    sequence of payloads however fast it is polled. With 'pacing' every answer takes as
+    long as the recorded request did, divided by 'speed'. A request with no exchange left
+    raises ReplayExhausted.
+    """
+
+    def __init__(self, exchanges: list[dict], host: str | None = None, pacing: bool = False, speed: float = 1.0):
+        self._exchanges = exchanges
+        self._host = host
+        self._pacing = pacing
+        self._speed = speed
+        self._pending: dict[tuple[str, str], deque[int]] = defaultdict(deque)
+        for i, exchange in enumerate(exchanges):
+            self._pending[(exchange['method'], exchange['action'])].append(i)
+        self._served: set[int] = set()
+        self._next = 0
+        self._started: float | None = None
+
+    @classmethod
+    def load(cls, path: str, pacing: bool = False, speed: float = 1.0) -> 'TrafficReplay':
+        header, exchanges = read_capture(path)
+        return cls(exchanges, header.get('host'), pacing, speed)
+
+    @property
+    def host(self) -> str | None:
+        return self._host
+
+    @property
+    def served(self) -> int:
+        return len(self._served)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.next_exchange is None
+
+    @property
+    def next_exchange(self) -> dict | None:
+        """The earliest recorded exchange not served yet."""
+        while self._next < len(self._exchanges) and self._next in self._served:
+            self._next += 1
+        return self._exchanges[self._next] if self._next < len(self._exchanges) else None
+
+    def skip(self):
+        """Drop the next exchange, for traffic the replay does not trigger (like writes)."""
+        exchange = self.next_exchange
+        if exchange is not None:
+            self._pending[(exchange['method'], exchange['action'])].remove(self._next)
+            self._served.add(self._next)
+
+    async def async_wait_for_next(self):
+        """Sleep until the next exchange is due, at the recorded pacing."""
+        exchange = self.next_exchange
+        if exchange is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._started is None:
+            self._started = loop.time() - exchange['t'] / self._speed
+        delay = self._started + exchange['t'] / self._speed - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __call__(self, method: str, action: str, url: str, **kwargs) -> tuple[int, bytes]:
+        pending = self._pending.get((method, action))
+        if not pending:
+            raise ReplayExhausted(f"No recorded {method} {action} left")
+        index = pending.popleft()
+        self._served.add(index)
+        exchange = self._exchanges[index]
+        if self._pacing:
+            await asyncio.sleep(exchange.get('duration', 0) / self._speed)
+        if 'error' in exchange:
+            raise _replayed_error(exchange['error'])
+        if 'body64' in exchange:
+            return exchange['status'], base64.b64decode(exchange['body64'])
+        return exchange['status'], exchange.get('body', '').encode('utf-8')
+
+
+def _replayed_error(name: str) -> Exception:
+    # Timeouts are handled apart from other failures, the rest surface as connection errors
+    if name in ('TimeoutError', 'ServerTimeoutError'):
+        return asyncio.TimeoutError()
+    return aiohttp.ClientConnectionError(f"Replayed {name}")
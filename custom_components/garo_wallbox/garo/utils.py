@@ -1,5 +1,7 @@
 import logging
 
+from . import const
+
 _LOGGER = logging.getLogger(__name__)
 
 def read_enum(json, key, type, default_value):
@@ -12,4 +14,22 @@ def read_enum(json, key, type, default_value):
     return default_value
 
 def read_value(json, key, default_value):    
-    return json[key] if key in json else default_value
\ No newline at end of file
+    return json[key] if key in json else default_value
+
+def charging_current(value):
+    """Convert a charging current reported in mA to A."""
+    return max(0, value / 1000)
+
+def charging_power(value):
+    """Filter out the bogus power values some firmwares report when idle."""
+    return 0 if value > 32000 else value
+
+def parse_mode(mode):
+    """Read a mode given as a Mode, its value, or 'on'/'off'."""
+    if not isinstance(mode, str):
+        return mode
+    if mode.upper() == 'ON':
+        return const.Mode.ON
+    if mode.upper() == 'OFF':
+        return const.Mode.OFF
+    return const.Mode(mode)
@@ -24,6 +24,7 @@ class GaroNumberEntityDescription(NumberEntityDescription):
     get_value: Callable[[GaroStatus], int]
     set_value: Callable[[int], Awaitable]
     is_available: Callable[[], bool] | None = None
+    fields: tuple[str, ...] = ()
 
 @dataclass(frozen=True, kw_only=True)
 class GaroMeterNumberEntityDescription(NumberEntityDescription):
@@ -31,6 +32,7 @@ class GaroMeterNumberEntityDescription(NumberEntityDescription):
     get_value: Callable[[GaroMeter], int]
     set_value: Callable[[int], Awaitable]
     is_available: Callable[[], bool] | None = None
+    fields: tuple[str, ...] = ()
 
 async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_add_entities):
     """Set up using config_entry."""
@@ -50,6 +52,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 get_value=lambda status: status.current_limit,
                 set_value=lambda value: coordinator.async_set_current_limit(value),
                 is_available=lambda: coordinator.config.charge_limit_enabled,
+                fields=("current_limit", "config.charge_limit_enabled"),
             ),
         ]]
     if entry.runtime_data.meter_coordinator:
@@ -70,6 +73,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     get_value=lambda status: meter_coordinator.voltage,
                     set_value=lambda value: meter_coordinator.async_set_voltage(value),
                     is_available=lambda: True,
+                    fields=("voltage",),
                     )])
         if meter_coordinator.has_external_meter:
             add_meter_entities(meter_coordinator.external_meter)
@@ -86,7 +90,7 @@ class GaroNumberEntity(GaroEntity, NumberEntity):
 
     def __init__(self, coordinator: GaroDeviceCoordinator, entry, description: GaroNumberEntityDescription):
         self.entity_description = description
-        super().__init__(coordinator, entry, description.key)
+        super().__init__(coordinator, entry, description.key, fields=description.fields)
     
     @property
     def available(self) -> bool:
@@ -109,7 +113,7 @@ class GaroMeterNumberEntity(GaroMeterEntity, NumberEntity):
 
     def __init__(self, coordinator: GaroMeterCoordinator, entry, description: GaroMeterNumberEntityDescription, meter: GaroMeter):
         self.entity_description = description
-        super().__init__(coordinator, entry, description.key, meter)
+        super().__init__(coordinator, entry, description.key, meter, description.fields)
     
     @property
     def available(self) -> bool:
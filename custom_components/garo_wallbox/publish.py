@@ -0,0 +1,150 @@
+"""Deadband and rate limits for the state writes of the measurement sensors."""
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntityDescription
+from homeassistant.components.sensor.const import UNIT_CONVERTERS
+from homeassistant.const import UnitOfElectricCurrent, UnitOfEnergy, UnitOfPower, UnitOfTemperature, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+
+@dataclass(frozen=True)
+class PublishPolicy:
+    """How much a value has to move, in 'unit', before it is written again.
+
+    A value is written at most every 'min_interval' seconds. One held back by the
+    deadband is still written 'max_silence' seconds after the last write.
+    """
+    deadband: float = 0
+    min_interval: float = 0
+    max_silence: float = 0
+    unit: str | None = None
+
+
+# Tuned to the jitter of the charger and meter readings polled every few seconds
+DEFAULT_PUBLISH_POLICIES: dict[SensorDeviceClass, PublishPolicy] = {
+    SensorDeviceClass.CURRENT: PublishPolicy(0.2, 10, 300, UnitOfElectricCurrent.AMPERE),
+    SensorDeviceClass.POWER: PublishPolicy(50, 10, 300, UnitOfPower.WATT),
+    SensorDeviceClass.ENERGY: PublishPolicy(0, 60, 0, UnitOfEnergy.WATT_HOUR),
+    SensorDeviceClass.DURATION: PublishPolicy(60, 0, 600, UnitOfTime.SECONDS),
+    SensorDeviceClass.TEMPERATURE: PublishPolicy(0.5, 60, 900, UnitOfTemperature.CELSIUS),
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class PublishEntityDescriptionMixin:
+    """Overrides of the device class' publish policy, in the native unit of the sensor. 0 turns a limit off."""
+    deadband: float | None = None
+    min_interval: float | None = None
+    max_silence: float | None = None
+
+
+def publish_policy(description: SensorEntityDescription) -> PublishPolicy | None:
+    """The policy of a sensor, None when every write goes through."""
+    default = DEFAULT_PUBLISH_POLICIES.get(description.device_class, PublishPolicy())
+    deadband = getattr(description, 'deadband', None)
+    if deadband is None:
+        deadband = default.deadband
+        unit = description.native_unit_of_measurement
+        if deadband and default.unit != unit:
+            deadband = UNIT_CONVERTERS[description.device_class].convert(deadband, default.unit, unit)
+    min_interval = getattr(description, 'min_interval', None)
+    max_silence = getattr(description, 'max_silence', None)
+    policy = PublishPolicy(
+        deadband,
+        default.min_interval if min_interval is None else min_interval,
+        default.max_silence if max_silence is None else max_silence,
+        description.native_unit_of_measurement)
+    if not (policy.deadband or policy.min_interval):
+        return None
+    return policy
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class PublishFilter:
+    """Decides which values of a sensor are written, by its policy and the last written value.
+
+    Values that are not numbers, and changes from or to zero (a session starting or
+    ending), are always written.
+    """
+
+    __slots__ = ('_policy', '_value', '_written')
+
+    def __init__(self, policy: PublishPolicy):
+        self._policy = policy
+        self._value: Any = None
+        self._written: float | None = None
+
+    def accept(self, value: Any, now: float) -> bool:
+        last = self._value
+        if self._written is None or not _is_number(value) or not _is_number(last) or (value == 0) != (last == 0):
+            return True
+        elapsed = now - self._written
+        if self._policy.max_silence and elapsed >= self._policy.max_silence and value != last:
+            return True
+        return elapsed >= self._policy.min_interval and abs(value - last) >= self._policy.deadband
+
+    def flush_delay(self, value: Any, now: float) -> float | None:
+        """Seconds until a value accept() held back is due, None when it only gets written on a bigger change."""
+        if value == self._value:
+            return None
+        elapsed = now - self._written
+        if abs(value - self._value) >= self._policy.deadband:
+            return max(self._policy.min_interval - elapsed, 0)
+        if self._policy.max_silence:
+            return max(self._policy.max_silence - elapsed, 0)
+        return None
+
+    def published(self, value: Any, now: float):
+        self._value = value
+        self._written = now
+
+
+class PublishFilterMixin:
+    """Holds back the writes of a sensor entity its PublishFilter rejects.
+
+    A held back value is written by a timer once it is due, so the last value of a
+    sensor is published even when no further update follows.
+    """
+
+    _publish_filter: PublishFilter | None = None
+    _flush_unsub: CALLBACK_TYPE | None = None
+
+    def _should_write(self, force: bool) -> bool:
+        if self._publish_filter is None:
+            return True
+        self._cancel_flush()
+        value = self.native_value
+        now = time.monotonic()
+        if not force and not self._publish_filter.accept(value, now):
+            delay = self._publish_filter.flush_delay(value, now)
+            if delay is not None:
+                self._flush_unsub = async_call_later(self.hass, delay, self._async_flush)
+            return False
+        self._publish_filter.published(value, now)
+        return True
+
+    @callback
+    def _async_flush(self, _now) -> None:
+        self._flush_unsub = None
+        self._publish_filter.published(self.native_value, time.monotonic())
+        self._async_publish(self.available, self._state_snapshot())
+
+    def _cancel_flush(self):
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._publish_filter is not None:
+            self._publish_filter.published(self.native_value, time.monotonic())
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._cancel_flush()
+        await super().async_will_remove_from_hass()
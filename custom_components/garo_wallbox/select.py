@@ -17,6 +17,7 @@ class GaroSelectEntityDescription(SelectEntityDescription):
     set_option: Callable[[str], Awaitable]
     get_current_option: Callable[[GaroStatus], str]
     is_available: Callable[[], bool] | None = None
+    fields: tuple[str, ...] = ()
 
 @dataclass(frozen=True, kw_only=True)
 class GaroChargerSelectEntityDescription(SelectEntityDescription):
@@ -24,6 +25,7 @@ class GaroChargerSelectEntityDescription(SelectEntityDescription):
     set_option: Callable[[str], Awaitable]
     get_current_option: Callable[[GaroCharger], str]
     is_available: Callable[[], bool] | None = None
+    fields: tuple[str, ...] = ()
 
 async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_add_entities):
     """Set up using config_entry."""
@@ -38,7 +40,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
             icon="mdi:ev-station",
             options=[opt.value for opt in const.Mode],
             set_option=lambda option: coordinator.async_set_mode(option),
-            get_current_option=lambda status: status.mode.value
+            get_current_option=lambda status: status.mode.value,
+            fields=("mode",),
         ),
     ]
     if config.has_outlet:
@@ -50,7 +53,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 icon="mdi:ev-plug-type2",
                 options=[opt.name for opt in const.CableLockMode],
                 set_option=lambda option: coordinator.async_set_cable_lock_mode(config.serial_number, option),
-                get_current_option=lambda status: status.main_charger.cable_lock_mode.name))
+                get_current_option=lambda status: status.main_charger.cable_lock_mode.name,
+                fields=("main_charger.cable_lock_mode",)))
         if config.has_twin:
             descriptions.append(
                 GaroSelectEntityDescription(
@@ -60,7 +64,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     icon="mdi:ev-plug-type2",
                     options=[opt.name for opt in const.CableLockMode],
                     set_option=lambda option: coordinator.async_set_cable_lock_mode(config.twin_serial, option),
-                    get_current_option=lambda status: status.twin_charger.cable_lock_mode.name))
+                    get_current_option=lambda status: status.twin_charger.cable_lock_mode.name,
+                    fields=("twin_charger.cable_lock_mode",)))
     entries:list[SelectEntity] = [GaroSelectEntity(coordinator, entry, description) for description in descriptions]
     if config.has_slaves:
         for slave in config.slaves:
@@ -76,8 +81,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     name= "Outlet",
                     icon="mdi:ev-plug-type2",
                     options=[opt.name for opt in const.CableLockMode],
-                    set_option=lambda option: coordinator.async_set_cable_lock_mode(slave.serial_number, option),
-                    get_current_option=lambda charger: charger.cable_lock_mode.name),
+                    set_option=lambda option, serial_number=slave.serial_number: coordinator.async_set_cable_lock_mode(serial_number, option),
+                    get_current_option=lambda charger: charger.cable_lock_mode.name,
+                    fields=("cable_lock_mode",)),
                     slave))
     async_add_entities(entries)
        
@@ -88,7 +94,7 @@ class GaroSelectEntity(GaroEntity, SelectEntity):
 
     def __init__(self, coordinator: GaroDeviceCoordinator, entry, description: GaroSelectEntityDescription):
         self.entity_description = description
-        super().__init__(coordinator, entry, description.key)
+        super().__init__(coordinator, entry, description.key, fields=description.fields)
 
     @property
     def available(self) -> bool:
@@ -110,7 +116,7 @@ class GaroChargerSelectEntity(GaroEntity, SelectEntity):
     def __init__(self, coordinator: GaroDeviceCoordinator, entry, description: GaroChargerSelectEntityDescription, charger: GaroCharger):
         self.entity_description = description
         self._charger = charger
-        super().__init__(coordinator, entry, description.key, charger)
+        super().__init__(coordinator, entry, description.key, charger, description.fields)
 
     @property
     def available(self) -> bool:
@@ -8,7 +8,7 @@ import voluptuous as vol
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, UnitOfElectricCurrent, UnitOfEnergy, UnitOfPower, UnitOfTime
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfElectricCurrent, UnitOfEnergy, UnitOfPower, UnitOfTime
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
@@ -18,10 +18,11 @@ from homeassistant.components.sensor import (
 from homeassistant.helpers import config_validation as cv, entity_platform
 
 
-from .garo import GaroStatus, const, GaroCharger, GaroMeter
+from .garo import GaroStatus, const, GaroCharger, GaroMeter, GaroMeterSnapshot, ApiMetrics
 from .const import (SERVICE_SET_MODE, SERVICE_SET_CURRENT_LIMIT, SERVICE_SET_SCHEDULE, SERVICE_REMOVE_SCHEDULE, SERVICE_ADD_SCHEDULE)
 from .coordinator import GaroDeviceCoordinator, GaroMeterCoordinator
 from .base import GaroEntity, GaroMeterEntity
+from .publish import PublishEntityDescriptionMixin, PublishFilter, PublishFilterMixin, publish_policy
 from . import GaroConfigEntry
 
 AVAILABLE_PHASE_COUNTS = ["1","2","3"]
@@ -29,19 +30,29 @@ AVAILABLE_PHASE_COUNTS = ["1","2","3"]
 _LOGGER = logging.getLogger(__name__)
 
 @dataclass(frozen=True, kw_only=True)
-class GaroSensorEntityDescription(SensorEntityDescription):
+class GaroSensorEntityDescription(PublishEntityDescriptionMixin, SensorEntityDescription):
     """Describes Garo sensor entity."""
     get_state: Callable[[GaroStatus], Any]
+    fields: tuple[str, ...] = ()
 
 @dataclass(frozen=True, kw_only=True)
-class GaroChargerSensorEntityDescription(SensorEntityDescription):
+class GaroChargerSensorEntityDescription(PublishEntityDescriptionMixin, SensorEntityDescription):
     """Describes Garo sensor entity."""
     get_state: Callable[[GaroCharger], Any]
+    fields: tuple[str, ...] = ()
 
 @dataclass(frozen=True, kw_only=True)
-class GaroMeterSensorEntityDescription(SensorEntityDescription):
+class GaroMeterSensorEntityDescription(PublishEntityDescriptionMixin, SensorEntityDescription):
     """Describes Garo sensor entity."""
-    get_state: Callable[[GaroMeter], Any]
+    get_state: Callable[[GaroMeterSnapshot], Any]
+    fields: tuple[str, ...] = ()
+
+@dataclass(frozen=True, kw_only=True)
+class GaroDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes Garo request metrics sensor entity."""
+    get_state: Callable[[ApiMetrics], Any]
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_add_entities):
@@ -57,6 +68,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: status.connector.value,
+                fields=('connector',),
             ),
             GaroSensorEntityDescription(
                 key="current_charging_current",
@@ -67,6 +79,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.current_charging_current,
+                fields=('current_charging_current',),
             ),
             GaroSensorEntityDescription(
                 key="current_charging_power",
@@ -77,6 +90,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfPower.WATT,
                 get_state=lambda status: max(status.current_charging_power, 0),
+                fields=('current_charging_power',),
             ),
             GaroSensorEntityDescription(
                 key="nr_of_phases",
@@ -86,6 +100,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: str(status.number_of_phases),
+                fields=('number_of_phases',),
             ),
             GaroSensorEntityDescription(
                 key="current_limit",
@@ -96,6 +111,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.current_limit,
+                fields=('current_limit',),
+                # Limits set on or by the charger, every change is shown right away
+                deadband=0,
+                min_interval=0,
             ),
             GaroSensorEntityDescription(
                 key="pilot_level",
@@ -106,6 +125,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.pilot_level,
+                fields=('pilot_level',),
+                # Limits set on or by the charger, every change is shown right away
+                deadband=0,
+                min_interval=0,
             ),
             GaroSensorEntityDescription(
                 key="acc_session_energy",
@@ -116,6 +139,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
                 get_state=lambda status: status.accumulated_session_energy,
+                fields=('accumulated_session_energy',),
             ),
             GaroSensorEntityDescription(
                 key="session_time",
@@ -126,6 +150,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfTime.MILLISECONDS,
                 get_state=lambda status: status.accumulated_session_millis,
+                fields=('accumulated_session_millis',),
             ),
             GaroSensorEntityDescription(
                 key="latest_reading",
@@ -136,6 +161,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
                 get_state=lambda status: status.latest_reading,
+                fields=('latest_reading',),
             ),
             GaroSensorEntityDescription(
                 key="latest_reading_k",
@@ -146,6 +172,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
                 get_state=lambda status: status.latest_reading / 1000 if status.latest_reading else None,
+                fields=('latest_reading',),
             ),
             GaroSensorEntityDescription(
                 key="current_temperature",
@@ -156,6 +183,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfTemperature.CELSIUS,
                 get_state=lambda status: status.current_temperature,
+                fields=('current_temperature',),
             )
         ]]
     if (coordinator.config.has_twin):
@@ -168,6 +196,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: status.main_charger.connector.value,
+                fields=('main_charger.connector',),
             ),
             GaroSensorEntityDescription(
                 key="left_current_charging_current",
@@ -178,6 +207,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.main_charger.current_charging_current,
+                fields=('main_charger.current_charging_current',),
             ),
             GaroSensorEntityDescription(
                 key="left_current_charging_power",
@@ -188,6 +218,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfPower.WATT,
                 get_state=lambda status: status.main_charger.current_charging_power,
+                fields=('main_charger.current_charging_power',),
             ),
             GaroSensorEntityDescription(
                 key="left_nr_of_phases",
@@ -197,6 +228,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: str(status.main_charger.number_of_phases),
+                fields=('main_charger.number_of_phases',),
             ),
             GaroSensorEntityDescription(
                 key="left_pilot_level",
@@ -207,6 +239,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.main_charger.pilot_level,
+                fields=('main_charger.pilot_level',),
+                # Limits set on or by the charger, every change is shown right away
+                deadband=0,
+                min_interval=0,
             ),
             GaroSensorEntityDescription(
                 key="left_acc_session_energy",
@@ -217,6 +253,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
                 get_state=lambda status: status.main_charger.accumulated_session_energy,
+                fields=('main_charger.accumulated_session_energy',),
             ),
             GaroSensorEntityDescription(
                 key="left_session_time",
@@ -227,6 +264,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfTime.MILLISECONDS,
                 get_state=lambda status: status.main_charger.accumulated_session_millis,
+                fields=('main_charger.accumulated_session_millis',),
             ),
             GaroSensorEntityDescription(
                 key="left_acc_energy",
@@ -237,6 +275,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
                 get_state=lambda status: status.main_charger.accumulated_energy / 1000 if status.main_charger.accumulated_energy else None,
+                fields=('main_charger.accumulated_energy',),
             ),
             GaroSensorEntityDescription(
                 key="right_status",
@@ -246,6 +285,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: status.twin_charger.connector.value,
+                fields=('twin_charger.connector',),
             ),
             GaroSensorEntityDescription(
                 key="right_current_charging_current",
@@ -256,6 +296,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.twin_charger.current_charging_current,
+                fields=('twin_charger.current_charging_current',),
             ),
             GaroSensorEntityDescription(
                 key="right_current_charging_power",
@@ -266,6 +307,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfPower.WATT,
                 get_state=lambda status: status.twin_charger.current_charging_power,
+                fields=('twin_charger.current_charging_power',),
             ),
             GaroSensorEntityDescription(
                 key="right_nr_of_phases",
@@ -275,6 +317,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: str(status.twin_charger.number_of_phases),
+                fields=('twin_charger.number_of_phases',),
             ),
             GaroSensorEntityDescription(
                 key="right_pilot_level",
@@ -285,6 +328,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda status: status.twin_charger.pilot_level,
+                fields=('twin_charger.pilot_level',),
+                # Limits set on or by the charger, every change is shown right away
+                deadband=0,
+                min_interval=0,
             ),
             GaroSensorEntityDescription(
                 key="right_acc_session_energy",
@@ -295,6 +342,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
                 get_state=lambda status: status.twin_charger.accumulated_session_energy,
+                fields=('twin_charger.accumulated_session_energy',),
             ),
             GaroSensorEntityDescription(
                 key="right_session_time",
@@ -305,6 +353,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfTime.MILLISECONDS,
                 get_state=lambda status: status.twin_charger.accumulated_session_millis,
+                fields=('twin_charger.accumulated_session_millis',),
             ),
             GaroSensorEntityDescription(
                 key="right_acc_energy",
@@ -315,6 +364,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
                 get_state=lambda status: status.twin_charger.accumulated_energy / 1000 if status.twin_charger.accumulated_energy else None,
+                fields=('twin_charger.accumulated_energy',),
             ),
         ])
     entities.append(
@@ -330,6 +380,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda status: status.mode.value,
+                fields=('mode',),
             )
         ))
 
@@ -343,6 +394,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda charger: charger.connector.value,
+                fields=('connector',),
             ),
             GaroChargerSensorEntityDescription(
                 key="current_charging_current",
@@ -353,6 +405,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda charger: charger.current_charging_current,
+                fields=('current_charging_current',),
             ),
             GaroChargerSensorEntityDescription(
                 key="current_charging_power",
@@ -363,6 +416,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfPower.WATT,
                 get_state=lambda charger: charger.current_charging_power,
+                fields=('current_charging_power',),
             ),
             GaroChargerSensorEntityDescription(
                 key="nr_of_phases",
@@ -372,6 +426,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 device_class=SensorDeviceClass.ENUM,
                 state_class=None,
                 get_state=lambda charger: str(charger.number_of_phases),
+                fields=('number_of_phases',),
             ),
             GaroChargerSensorEntityDescription(
                 key="pilot_level",
@@ -382,6 +437,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
                 get_state=lambda charger: charger.pilot_level,
+                fields=('pilot_level',),
+                # Limits set on or by the charger, every change is shown right away
+                deadband=0,
+                min_interval=0,
             ),
             GaroChargerSensorEntityDescription(
                 key="acc_session_energy",
@@ -392,6 +451,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
                 get_state=lambda charger: charger.accumulated_session_energy,
+                fields=('accumulated_session_energy',),
             ),
             GaroChargerSensorEntityDescription(
                 key="session_time",
@@ -402,6 +462,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.MEASUREMENT,
                 native_unit_of_measurement=UnitOfTime.MILLISECONDS,
                 get_state=lambda charger: charger.accumulated_session_millis,
+                fields=('accumulated_session_millis',),
             ),
             GaroChargerSensorEntityDescription(
                 key="acc_energy",
@@ -412,10 +473,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 state_class=SensorStateClass.TOTAL_INCREASING,
                 native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
                 get_state=lambda charger: charger.accumulated_energy / 1000 if charger.accumulated_energy else None,
+                fields=('accumulated_energy',),
             )
         ])
     entities.append(GaroScheduleSensorEntity(coordinator, entry))
 
+    diagnostic_descriptions = [
+        GaroDiagnosticSensorEntityDescription(
+            key="status_latency",
+            translation_key="status_latency",
+            name="Status request time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            get_state=lambda metrics: metrics.mean_latency('status'),
+        ),
+        GaroDiagnosticSensorEntityDescription(
+            key="slaves_latency",
+            translation_key="slaves_latency",
+            name="Slaves request time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            get_state=lambda metrics: metrics.mean_latency('slaves'),
+        ),
+        GaroDiagnosticSensorEntityDescription(
+            key="schema_latency",
+            translation_key="schema_latency",
+            name="Schedule request time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            get_state=lambda metrics: metrics.mean_latency('schema'),
+        ),
+        GaroDiagnosticSensorEntityDescription(
+            key="request_rate",
+            translation_key="request_rate",
+            name="Request rate",
+            icon="mdi:swap-vertical",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="requests/min",
+            get_state=lambda metrics: metrics.requests_per_minute(),
+        ),
+        GaroDiagnosticSensorEntityDescription(
+            key="request_errors",
+            translation_key="request_errors",
+            name="Request errors",
+            icon="mdi:alert-circle-outline",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            get_state=lambda metrics: metrics.errors,
+        ),
+        GaroDiagnosticSensorEntityDescription(
+            key="endpoint_fallbacks",
+            translation_key="endpoint_fallbacks",
+            name="Endpoint fallbacks",
+            icon="mdi:swap-horizontal",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            get_state=lambda metrics: metrics.fallbacks,
+        ),
+    ]
+    if entry.runtime_data.meter_coordinator:
+        diagnostic_descriptions.append(GaroDiagnosticSensorEntityDescription(
+            key="meter_latency",
+            translation_key="meter_latency",
+            name="Meter request time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            get_state=lambda metrics: metrics.mean_latency('meterinfo'),
+        ))
+    entities.extend(GaroDiagnosticSensorEntity(coordinator, entry, description) for description in diagnostic_descriptions)
+
     if coordinator.config.has_slaves:
         for slave in coordinator.slaves:
             add_charger_entities(slave)
@@ -431,7 +563,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.CURRENT,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
-                    get_state=lambda meter: meter.l1_current,
+                    get_state=lambda snapshot: snapshot.l1_current,
+                    fields=('l1_current',),
                 ),
                 GaroMeterSensorEntityDescription(
                     key="meter_l2_current",
@@ -440,7 +573,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.CURRENT,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
-                    get_state=lambda meter: meter.l2_current,
+                    get_state=lambda snapshot: snapshot.l2_current,
+                    fields=('l2_current',),
                     entity_registry_enabled_default=is_3_phase
                 ),
                 GaroMeterSensorEntityDescription(
@@ -450,7 +584,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.CURRENT,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
-                    get_state=lambda meter: meter.l3_current,
+                    get_state=lambda snapshot: snapshot.l3_current,
+                    fields=('l3_current',),
                     entity_registry_enabled_default=is_3_phase,
                 ),
                 GaroMeterSensorEntityDescription(
@@ -460,7 +595,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.POWER,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfPower.KILO_WATT,
-                    get_state=lambda meter: round(meter.l1_current*meter_coordinator.voltage, -1)/1000 if meter_coordinator.calculate_power else meter.l1_power,
+                    get_state=lambda snapshot: snapshot.l1_power,
+                    fields=('l1_current', 'l1_power'),
                 ),
                 GaroMeterSensorEntityDescription(
                     key="meter_l2_power",
@@ -469,7 +605,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.POWER,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfPower.KILO_WATT,
-                    get_state=lambda meter: round(meter.l2_current*meter_coordinator.voltage, -1)/1000 if meter_coordinator.calculate_power else meter.l2_power,
+                    get_state=lambda snapshot: snapshot.l2_power,
+                    fields=('l2_current', 'l2_power'),
                     entity_registry_enabled_default=is_3_phase,
                 ),
                 GaroMeterSensorEntityDescription(
@@ -479,7 +616,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.POWER,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfPower.KILO_WATT,
-                    get_state=lambda meter: round(meter.l3_current*meter_coordinator.voltage, -1)/1000 if meter_coordinator.calculate_power else meter.l3_power,
+                    get_state=lambda snapshot: snapshot.l3_power,
+                    fields=('l3_current', 'l3_power'),
                     entity_registry_enabled_default=is_3_phase,
                 ),
                 GaroMeterSensorEntityDescription(
@@ -489,7 +627,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.POWER,
                     state_class=SensorStateClass.MEASUREMENT,
                     native_unit_of_measurement=UnitOfPower.KILO_WATT,
-                    get_state=lambda meter: round((meter.l1_current+meter.l2_current+meter.l3_current)*meter_coordinator.voltage, -1)/1000 if meter_coordinator.calculate_power else meter.apparent_power,
+                    get_state=lambda snapshot: snapshot.power,
+                    fields=('l1_current', 'l2_current', 'l3_current', 'apparent_power'),
                 ),
                 GaroMeterSensorEntityDescription(
                     key="meter_accumulated_energy",
@@ -498,7 +637,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     device_class=SensorDeviceClass.ENERGY,
                     state_class=SensorStateClass.TOTAL_INCREASING,
                     native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-                    get_state=lambda meter: meter.accumulated_energy,
+                    get_state=lambda snapshot: snapshot.accumulated_energy,
+                    fields=('accumulated_energy',),
                 )])
 
         if meter_coordinator.has_external_meter:
@@ -558,46 +698,67 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
 
 
 
-class GaroSensorEntity(GaroEntity, SensorEntity):
+class GaroSensorEntity(PublishFilterMixin, GaroEntity, SensorEntity):
 
     entity_description: GaroSensorEntityDescription
 
     def __init__(self, coordinator: GaroDeviceCoordinator, entry, description: GaroSensorEntityDescription):
         self.entity_description = description
-        super().__init__(coordinator, entry, description.key)
+        if policy := publish_policy(description):
+            self._publish_filter = PublishFilter(policy)
+        super().__init__(coordinator, entry, description.key, fields=description.fields)
 
 
     def _async_update_attrs(self) -> None:
         """Update the attributes of the sensor."""
         self._attr_native_value = self.entity_description.get_state(self.coordinator.status)
 
-class GaroChargerSensorEntity(GaroEntity, SensorEntity):
+class GaroChargerSensorEntity(PublishFilterMixin, GaroEntity, SensorEntity):
 
     entity_description: GaroChargerSensorEntityDescription
 
     def __init__(self, coordinator: GaroDeviceCoordinator, entry, description: GaroChargerSensorEntityDescription, charger: GaroCharger):
         self.entity_description = description
+        if policy := publish_policy(description):
+            self._publish_filter = PublishFilter(policy)
         self._charger = charger
-        super().__init__(coordinator, entry, description.key, charger)
+        super().__init__(coordinator, entry, description.key, charger, description.fields)
 
 
     def _async_update_attrs(self) -> None:
         """Update the attributes of the sensor."""
         self._attr_native_value = self.entity_description.get_state(self._charger)
 
-class GaroMeterSensorEntity(GaroMeterEntity, SensorEntity):
+class GaroMeterSensorEntity(PublishFilterMixin, GaroMeterEntity, SensorEntity):
 
     entity_description: GaroMeterSensorEntityDescription
 
     def __init__(self, coordinator: GaroMeterCoordinator, entry, description: GaroMeterSensorEntityDescription, meter: GaroMeter):
         self.entity_description = description
+        if policy := publish_policy(description):
+            self._publish_filter = PublishFilter(policy)
         self._meter = meter
-        super().__init__(coordinator, entry, description.key, meter)
+        super().__init__(coordinator, entry, description.key, meter, description.fields)
+
+
+    def _async_update_attrs(self) -> None:
+        """Update the attributes of the sensor."""
+        self._attr_native_value = self.entity_description.get_state(self.coordinator.snapshot(self._meter))
+
+
+class GaroDiagnosticSensorEntity(GaroEntity, SensorEntity):
+    """Request metrics of the charger, refreshed with every device poll."""
+
+    entity_description: GaroDiagnosticSensorEntityDescription
+
+    def __init__(self, coordinator: GaroDeviceCoordinator, entry, description: GaroDiagnosticSensorEntityDescription):
+        self.entity_description = description
+        super().__init__(coordinator, entry, description.key)
 
 
     def _async_update_attrs(self) -> None:
         """Update the attributes of the sensor."""
-        self._attr_native_value = self.entity_description.get_state(self._meter)
+        self._attr_native_value = self.entity_description.get_state(self.coordinator.api_client.metrics)
 
 
 class GaroLegacySensorEntity(GaroSensorEntity):
@@ -619,7 +780,7 @@ class GaroScheduleSensorEntity(GaroEntity, SensorEntity):
             name="Schedule",
             state_class=None
         )
-        super().__init__(coordinator, entry, self.entity_description.key)
+        super().__init__(coordinator, entry, self.entity_description.key, fields=("schema",))
 
     def _async_update_attrs(self) -> None:
         """Update the attributes of the sensor."""
@@ -19,6 +19,7 @@ class GaroSwitchEntityDescription(SwitchEntityDescription):
     on_func: Callable[[], Awaitable]
     off_func: Callable[[], Awaitable]
     get_state: Callable[[], bool]
+    fields: tuple[str, ...] = ()
 
 async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_add_entities):
     """Set up using config_entry."""
@@ -33,6 +34,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                 on_func=lambda: coordinator.async_enable_charge_limit(True),
                 off_func=lambda: coordinator.async_enable_charge_limit(False),
                 get_state=lambda: coordinator.config.charge_limit_enabled,
+                fields=("config.charge_limit_enabled",),
             ),
         ]]
     if entry.runtime_data.meter_coordinator:
@@ -48,6 +50,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: GaroConfigEntry, async_a
                     on_func=lambda: meter_coordinator.async_set_calculate_power(True),
                     off_func=lambda: meter_coordinator.async_set_calculate_power(False),
                     get_state=lambda: meter_coordinator.calculate_power,
+                    fields=("calculate_power",),
                     )])
         if meter_coordinator.has_external_meter:
             add_meter_entities(meter_coordinator.external_meter)
@@ -67,7 +70,7 @@ class GaroSwitchEntity(GaroEntity, SwitchEntity):
         """Initialize the Switch."""
         self.entity_description = description
         self._always_available = always_available
-        super().__init__(coordinator, entry, description.key)
+        super().__init__(coordinator, entry, description.key, fields=description.fields)
 
 
     def _async_update_attrs(self) -> None:
@@ -94,7 +97,7 @@ class GaroMeterSwitchEntity(GaroMeterEntity, SwitchEntity):
     def __init__(self, coordinator: GaroMeterCoordinator, entry, description: GaroSwitchEntityDescription, meter: GaroMeter):
         """Initialize the Switch."""
         self.entity_description = description
-        super().__init__(coordinator, entry, description.key, meter)
+        super().__init__(coordinator, entry, description.key, meter, description.fields)
 
 
     def _async_update_attrs(self) -> None:
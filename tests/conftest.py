@@ -0,0 +1,10 @@
+"""Imports the 'garo' package on its own, like the benchmarks, so the tests run without Home Assistant.
+
+The integration modules that need Home Assistant are imported through the benchmark stand-ins.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import _support  # noqa: E402,F401
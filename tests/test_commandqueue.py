@@ -0,0 +1,122 @@
+import asyncio
+
+from garo.commandqueue import CommandQueue, in_command
+
+
+def test_commands_run_in_order():
+    async def run():
+        queue = CommandQueue()
+        order = []
+        async def command(name):
+            order.append(f'{name} start')
+            await asyncio.sleep(0.01)
+            order.append(f'{name} end')
+            return name
+        results = await asyncio.gather(
+            queue.async_command(lambda: command('a')),
+            queue.async_command(lambda: command('b')))
+        assert results == ['a', 'b']
+        assert order == ['a start', 'a end', 'b start', 'b end']
+    asyncio.run(run())
+
+
+def test_queued_command_is_superseded():
+    async def run():
+        queue = CommandQueue()
+        calls = []
+        async def command(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+        # 'a' runs right away, the two 'b' commands queue behind it and the second replaces the first
+        results = await asyncio.gather(
+            queue.async_command(lambda: command('a'), key='a'),
+            queue.async_command(lambda: command(1), key='b'),
+            queue.async_command(lambda: command(2), key='b'))
+        assert results == ['a', 2, 2]
+        assert calls == ['a', 2]
+        assert queue.stats['commands'] == 3
+        assert queue.stats['superseded'] == 1
+    asyncio.run(run())
+
+
+def test_read_waits_behind_queued_command():
+    async def run():
+        queue = CommandQueue()
+        order = []
+        async def command():
+            order.append('command')
+            await asyncio.sleep(0.01)
+        async def read():
+            order.append('read')
+        command_task = asyncio.ensure_future(queue.async_command(command))
+        await asyncio.sleep(0)
+        await queue.async_read(read)
+        await command_task
+        assert order == ['command', 'read']
+    asyncio.run(run())
+
+
+def test_command_waits_for_running_reads():
+    async def run():
+        queue = CommandQueue()
+        order = []
+        async def read():
+            order.append('read start')
+            await asyncio.sleep(0.01)
+            order.append('read end')
+        async def command():
+            order.append('command')
+        read_task = asyncio.ensure_future(queue.async_read(read))
+        await asyncio.sleep(0)
+        await queue.async_command(command)
+        await read_task
+        assert order == ['read start', 'read end', 'command']
+    asyncio.run(run())
+
+
+def test_read_inside_command_does_not_wait():
+    async def run():
+        queue = CommandQueue()
+        async def read():
+            return in_command()
+        async def command():
+            return await queue.async_read(read)
+        assert await asyncio.wait_for(queue.async_command(command), 1)
+    asyncio.run(run())
+
+
+def test_cancelled_read_waiter_releases_the_queue():
+    async def run():
+        queue = CommandQueue()
+        release = asyncio.Event()
+        async def command():
+            await release.wait()
+        async def read():
+            return 'read'
+        command_task = asyncio.ensure_future(queue.async_command(command))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(queue.async_read(read))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await command_task
+        assert await asyncio.wait_for(queue.async_read(read), 1) == 'read'
+        assert await asyncio.wait_for(queue.async_command(command), 1) is None
+    asyncio.run(run())
+
+
+def test_failing_command_raises_and_queue_goes_on():
+    async def run():
+        queue = CommandQueue()
+        async def fail():
+            raise ValueError('write failed')
+        async def succeed():
+            return 'ok'
+        results = await asyncio.gather(
+            queue.async_command(fail),
+            queue.async_command(succeed),
+            return_exceptions=True)
+        assert isinstance(results[0], ValueError)
+        assert results[1] == 'ok'
+    asyncio.run(run())
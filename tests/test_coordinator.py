@@ -0,0 +1,77 @@
+"""The write-through of the device coordinator against a simulated charger, on the Home Assistant stand-ins."""
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp.web')
+
+import loadtest  # noqa: E402
+from simulator import ChargerSimulator  # noqa: E402
+
+
+def run_with_charger(test):
+    """Run test(coordinator) against one simulated charger."""
+    async def run():
+        integration = loadtest.import_integration()
+        from homeassistant.core import HomeAssistant
+        sim = ChargerSimulator(loadtest.charger_host(0), slaves=0, time_scale=60)
+        await sim.async_start()
+        hass = HomeAssistant('/tmp')
+        entry = None
+        try:
+            entry, _ = await loadtest.async_setup_charger(hass, 0, {}, loadtest.Metrics(), start_scheduler=False)
+            await test(integration, entry.runtime_data.coordinator)
+        finally:
+            if entry is not None:
+                await entry.async_unload()
+            await hass.async_stop(force=True)
+            await sim.async_stop()
+    asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def fast_verify(monkeypatch):
+    monkeypatch.setattr(loadtest.import_integration().const, 'VERIFY_INTERVAL', 0.05)
+
+
+def test_value_is_shown_before_the_write_returns():
+    async def test(integration, coordinator):
+        mode = integration.garo.const.Mode
+        assert coordinator.status.mode != mode.OFF
+        shown = []
+        coordinator.async_add_listener(lambda: shown.append(coordinator.status.mode))
+        write = asyncio.ensure_future(coordinator.async_set_mode('OFF'))
+        await asyncio.sleep(0)
+        assert shown == [mode.OFF]
+        await write
+        for _ in range(40):
+            if not coordinator._verify_tasks:
+                break
+            await asyncio.sleep(0.05)
+        assert coordinator.status.mode == mode.OFF
+        assert len(coordinator._pending) == 0
+        assert not coordinator._verify_tasks
+    run_with_charger(test)
+
+
+def test_failed_write_is_reverted():
+    async def test(integration, coordinator):
+        before = coordinator.status.mode
+        async def fail(mode):
+            raise ConnectionError('charger gone')
+        coordinator._api_client.async_set_mode = fail
+        with pytest.raises(ConnectionError):
+            await coordinator.async_set_mode('ON' if before.value != 'ALWAYS_ON' else 'OFF')
+        assert coordinator.status.mode == before
+        assert len(coordinator._pending) == 0
+        assert not coordinator._verify_tasks
+    run_with_charger(test)
+
+
+def test_current_limit_is_not_shown_with_the_limiter_off():
+    async def test(integration, coordinator):
+        assert not coordinator.config.charge_limit_enabled
+        limit = coordinator.status.current_limit
+        await coordinator.async_set_current_limit(limit - 1)
+        assert 'current_limit' not in coordinator._pending
+    run_with_charger(test)
@@ -0,0 +1,96 @@
+import logging
+from enum import Enum
+
+from garo.decoder import NO_CHANGES, Field, model, slots
+from garo.garometer import GaroMeter
+from garo.garostatus import GaroStatus
+
+
+class Color(Enum):
+    RED = 'RED'
+    BLUE = 'BLUE'
+
+
+FIELDS = (
+    Field('name', 'name', ''),
+    Field('color', 'color', Color.RED, enum=Color),
+    Field('count', 'count', 0, convert=int),
+    Field('energy', 'energy', 0.0, divider=1000),
+    Field('current', 'current', 0.0, divider='_divider'),
+    Field('reading', 'reading', 0, accept=lambda old, new: new > old),
+)
+
+
+@model(FIELDS)
+class Model:
+    __slots__ = slots(FIELDS) + ('_divider',)
+
+    def __init__(self, divider: float = 10):
+        self._divider = divider
+        self._init_fields()
+
+
+def test_defaults_and_properties():
+    m = Model()
+    assert (m.name, m.color, m.count, m.energy, m.current, m.reading) == ('', Color.RED, 0, 0.0, 0.0, 0)
+
+
+def test_decode_returns_the_changed_fields():
+    m = Model()
+    changed = m._decode({'name': 'garo', 'color': 'BLUE', 'count': '3', 'energy': 2500, 'current': 160, 'reading': 7})
+    assert changed == {'name', 'color', 'count', 'energy', 'current', 'reading'}
+    assert (m.name, m.color, m.count, m.energy, m.current, m.reading) == ('garo', Color.BLUE, 3, 2.5, 16.0, 7)
+
+
+def test_unchanged_json_returns_no_changes():
+    m = Model()
+    json = {'name': 'garo', 'count': 3}
+    m._decode(json)
+    assert m._decode(json) is NO_CHANGES
+    assert m._decode({}) is NO_CHANGES
+
+
+def test_missing_keys_keep_their_value():
+    m = Model()
+    m._decode({'name': 'garo', 'count': 3})
+    assert m._decode({'count': 4}) == {'count'}
+    assert m.name == 'garo'
+
+
+def test_unknown_enum_value_keeps_the_old_one(caplog):
+    m = Model()
+    m._decode({'color': 'BLUE'})
+    with caplog.at_level(logging.WARNING):
+        assert m._decode({'color': 'GREEN'}) is NO_CHANGES
+    assert m.color == Color.BLUE
+    assert "'color'" in caplog.text
+
+
+def test_rejected_value_is_not_a_change():
+    m = Model()
+    m._decode({'reading': 7})
+    assert m._decode({'reading': 5}) is NO_CHANGES
+    assert m.reading == 7
+
+
+def test_apply_reports_a_change():
+    m = Model()
+    assert m.apply('count', 2)
+    assert not m.apply('count', 2)
+    assert m.count == 2
+
+
+def test_status_load_reports_changed_fields():
+    status = GaroStatus({'currentLimit': 10, 'mode': 'ALWAYS_ON'})
+    assert status.load({'currentLimit': 16, 'mode': 'ALWAYS_ON'}) == {'current_limit'}
+    assert status.changed_fields == {'current_limit'}
+    assert status.has_changed
+    assert status.load({'currentLimit': 16, 'mode': 'ALWAYS_ON'}) is NO_CHANGES
+    assert not status.has_changed
+
+
+def test_meter_load_divides_by_its_dividers():
+    meter = GaroMeter({'phase1Current': 1600, 'accEnergy': 12000}, current_divider=100)
+    assert meter.l1_current == 16.0
+    assert meter.accumulated_energy == 12.0
+    assert meter.load({'phase1Current': 1700, 'accEnergy': 12000}) == {'l1_current'}
@@ -0,0 +1,114 @@
+import types
+
+import pytest
+
+from garo import endpointmanager
+from garo.const import ApiFamily
+from garo.endpointmanager import EndpointManager
+
+HOST = '192.168.1.10'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(endpointmanager, 'time', types.SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+def test_unknown_family_needs_probe():
+    manager = EndpointManager(HOST)
+    assert manager.needs_probe
+    assert manager.probe_order == [ApiFamily.MODERN, ApiFamily.LEGACY]
+    assert manager.get_url('status') == f'http://{HOST}:8080/servlet/rest/chargebox/status'
+
+
+def test_known_family_is_probed_first():
+    manager = EndpointManager(HOST)
+    manager.set_family(ApiFamily.LEGACY)
+    assert not manager.needs_probe
+    assert manager.is_legacy
+    assert manager.probe_order == [ApiFamily.LEGACY, ApiFamily.MODERN]
+    assert manager.get_url('status') == f'http://{HOST}:2222/rest/chargebox/status'
+
+
+def test_retry_budget_is_spent_within_the_window(clock):
+    manager = EndpointManager(HOST, retry_budget=2, retry_window=60)
+    assert manager.try_consume_retry()
+    clock.now += 30
+    assert manager.try_consume_retry()
+    assert not manager.try_consume_retry()
+    # The first retry left the window
+    clock.now += 31
+    assert manager.try_consume_retry()
+    assert not manager.try_consume_retry()
+
+
+def test_probe_refills_the_retry_budget():
+    manager = EndpointManager(HOST, retry_budget=1)
+    assert manager.try_consume_retry()
+    assert not manager.try_consume_retry()
+    manager.set_family(ApiFamily.MODERN)
+    assert manager.try_consume_retry()
+
+
+def test_invalidate_forces_a_probe_with_the_same_first_guess():
+    manager = EndpointManager(HOST)
+    manager.set_family(ApiFamily.LEGACY)
+    manager.invalidate()
+    assert manager.needs_probe
+    assert manager.family == ApiFamily.LEGACY
+    assert manager.probe_order[0] == ApiFamily.LEGACY
+
+
+def test_family_is_probed_again_after_the_reprobe_interval(clock):
+    manager = EndpointManager(HOST, reprobe_interval=100)
+    manager.set_family(ApiFamily.MODERN)
+    clock.now += 100
+    assert not manager.needs_probe
+    clock.now += 1
+    assert manager.needs_probe
+
+
+def test_stored_state_round_trips(clock):
+    manager = EndpointManager(HOST)
+    manager.set_family(ApiFamily.LEGACY)
+    manager.set_firmware(2, 5)
+    restored = EndpointManager(HOST, manager.as_dict())
+    assert restored.as_dict() == manager.as_dict()
+    assert not restored.needs_probe
+    assert restored.has_firmware
+
+
+def test_stored_state_of_another_host_is_ignored():
+    manager = EndpointManager(HOST)
+    manager.set_family(ApiFamily.LEGACY)
+    other = EndpointManager('192.168.1.11', manager.as_dict())
+    assert other.family is None
+    assert not other.has_firmware
+
+
+def test_unknown_stored_family_is_ignored():
+    manager = EndpointManager(HOST, {'host': HOST, 'family': 'SOAP', 'probed_at': 1})
+    assert manager.family is None
+    assert manager.needs_probe
+
+
+def test_listeners_are_notified_of_changes():
+    manager = EndpointManager(HOST)
+    calls = []
+    remove = manager.add_listener(lambda: calls.append(manager.as_dict()))
+    manager.set_firmware(2, 5)
+    manager.set_firmware(2, 5)
+    assert len(calls) == 1
+    remove()
+    manager.set_family(ApiFamily.MODERN)
+    assert len(calls) == 1
@@ -0,0 +1,83 @@
+from garo.garostatus import GaroStatus
+from garo.pendingwrites import PendingWrites
+
+
+def _write(pending: PendingWrites, status: GaroStatus, value) -> bool:
+    return pending.apply('current_limit', 'status', lambda: status, 'current_limit', value)
+
+
+def test_applied_value_is_shown_until_confirmed():
+    status = GaroStatus({'currentLimit': 10})
+    pending = PendingWrites()
+    assert _write(pending, status, 16)
+    assert status.current_limit == 16
+    assert pending.waiting('status')
+    assert not pending.waiting('config')
+
+    # The charger has not caught up yet, the written value is applied again
+    status.load({'currentLimit': 10})
+    assert pending.reconcile('status') == set()
+    assert status.current_limit == 16
+    assert 'current_limit' in pending
+
+    status.load({'currentLimit': 16})
+    assert pending.reconcile('status') == set()
+    assert status.current_limit == 16
+    assert len(pending) == 0
+
+
+def test_unconfirmed_value_is_rolled_back():
+    status = GaroStatus({'currentLimit': 10})
+    pending = PendingWrites(timeout=0)
+    _write(pending, status, 16)
+    status.load({'currentLimit': 10})
+    assert pending.reconcile('status') == {'current_limit'}
+    assert status.current_limit == 10
+    assert not pending.waiting('status')
+
+
+def test_reconcile_only_checks_its_source():
+    status = GaroStatus({'currentLimit': 10})
+    pending = PendingWrites(timeout=0)
+    _write(pending, status, 16)
+    assert pending.reconcile('config') == set()
+    assert 'current_limit' in pending
+
+
+def test_revert_restores_the_reported_value():
+    status = GaroStatus({'currentLimit': 10})
+    pending = PendingWrites()
+    _write(pending, status, 16)
+    assert pending.revert('current_limit')
+    assert status.current_limit == 10
+    assert len(pending) == 0
+    assert not pending.revert('current_limit')
+
+
+def test_rewrite_keeps_the_first_original():
+    status = GaroStatus({'currentLimit': 10})
+    pending = PendingWrites()
+    _write(pending, status, 16)
+    _write(pending, status, 20)
+    assert status.current_limit == 20
+    assert pending.revert('current_limit')
+    assert status.current_limit == 10
+
+
+def test_write_to_a_missing_model_is_dropped():
+    status = GaroStatus({'currentLimit': 10})
+    target = [status]
+    pending = PendingWrites()
+    pending.apply('current_limit', 'status', lambda: target[0], 'current_limit', 16)
+    target[0] = None
+    assert pending.reconcile('status') == set()
+    assert len(pending) == 0
+
+
+def test_discard_keeps_the_shown_value():
+    status = GaroStatus({'currentLimit': 10})
+    pending = PendingWrites()
+    _write(pending, status, 16)
+    pending.discard('current_limit')
+    assert status.current_limit == 16
+    assert len(pending) == 0
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from garo.pollscheduler import PollScheduler
+
+
+def test_jobs_run_spaced_apart():
+    async def run():
+        scheduler = PollScheduler(spacing=0.05, jitter=0)
+        starts = []
+        async def job():
+            starts.append(time.monotonic())
+        scheduler.add_job('a', lambda: 0.01, job)
+        scheduler.add_job('b', lambda: 0.01, job)
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        await scheduler.async_stop()
+        assert len(starts) >= 3
+        assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))
+    asyncio.run(run())
+
+
+def test_removed_job_stops_running():
+    async def run():
+        scheduler = PollScheduler(spacing=0.01, jitter=0)
+        runs = []
+        async def job():
+            runs.append(1)
+        remove = scheduler.add_job('a', lambda: 0.02, job)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        remove()
+        count = len(runs)
+        await asyncio.sleep(0.1)
+        await scheduler.async_stop()
+        assert count > 0
+        assert len(runs) == count
+        assert scheduler.timeline == []
+    asyncio.run(run())
+
+
+def test_stop_right_after_removing_a_job():
+    async def run():
+        scheduler = PollScheduler(jitter=0)
+        async def job():
+            pass
+        remove = scheduler.add_job('a', lambda: 10, job)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        # The wakeup set by the remover must not swallow the cancel of the stop
+        remove()
+        await asyncio.wait_for(scheduler.async_stop(), 1)
+        assert not scheduler.is_running
+    asyncio.run(run())
+
+
+def test_slow_job_does_not_hold_up_the_others():
+    async def run():
+        scheduler = PollScheduler(spacing=0.01, jitter=0)
+        release = asyncio.Event()
+        fast = []
+        async def slow():
+            await release.wait()
+        async def quick():
+            fast.append(1)
+        scheduler.add_job('slow', lambda: 0.02, slow)
+        scheduler.add_job('fast', lambda: 0.02, quick)
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        running = {job['name']: job['running'] for job in scheduler.timeline}
+        await scheduler.async_stop()
+        assert running['slow']
+        assert len(fast) >= 3
+    asyncio.run(run())
+
+
+def test_failing_job_keeps_its_schedule():
+    async def run():
+        scheduler = PollScheduler(spacing=0.01, jitter=0)
+        runs = []
+        async def job():
+            runs.append(1)
+            raise ValueError('read failed')
+        scheduler.add_job('a', lambda: 0.02, job)
+        scheduler.start()
+        await asyncio.sleep(0.15)
+        await scheduler.async_stop()
+        assert len(runs) >= 2
+    asyncio.run(run())
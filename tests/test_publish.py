@@ -0,0 +1,138 @@
+"""The deadband and rate limits of the sensor writes, on the Home Assistant stand-ins."""
+import asyncio
+
+import pytest
+
+import loadtest
+
+publish = loadtest.import_integration().publish
+PublishFilter = publish.PublishFilter
+PublishPolicy = publish.PublishPolicy
+
+
+@pytest.fixture
+def published():
+    publish_filter = PublishFilter(PublishPolicy(deadband=1, min_interval=10, max_silence=300))
+    publish_filter.published(5.0, 0)
+    return publish_filter
+
+
+def test_first_value_is_accepted():
+    assert PublishFilter(PublishPolicy(deadband=1, min_interval=10)).accept(5.0, 0)
+
+
+def test_change_within_deadband_waits_for_max_silence(published):
+    assert not published.accept(5.5, 100)
+    assert published.flush_delay(5.5, 100) == 200
+    assert published.accept(5.5, 300)
+
+
+def test_unchanged_value_is_not_flushed(published):
+    assert not published.accept(5.0, 400)
+    assert published.flush_delay(5.0, 400) is None
+
+
+def test_change_before_min_interval_waits_for_it(published):
+    assert not published.accept(8.0, 4)
+    assert published.flush_delay(8.0, 4) == 6
+    assert published.accept(8.0, 10)
+
+
+def test_deadband_without_max_silence_holds_back():
+    publish_filter = PublishFilter(PublishPolicy(deadband=1, min_interval=10))
+    publish_filter.published(5.0, 0)
+    assert not publish_filter.accept(5.5, 1000)
+    assert publish_filter.flush_delay(5.5, 1000) is None
+
+
+def test_changes_from_and_to_zero_are_accepted(published):
+    assert published.accept(0, 1)
+    published.published(0, 1)
+    assert published.accept(0.1, 2)
+
+
+def test_values_that_are_not_numbers_are_accepted(published):
+    assert published.accept(None, 1)
+    assert published.accept('charging', 1)
+    assert published.accept(True, 1)
+
+
+def test_policy_deadband_in_native_unit():
+    description = publish.SensorEntityDescription(
+        key='power',
+        device_class=publish.SensorDeviceClass.POWER,
+        native_unit_of_measurement=publish.UnitOfPower.KILO_WATT)
+    policy = publish.publish_policy(description)
+    assert policy.deadband == pytest.approx(0.05)
+    assert policy.min_interval == 10
+    assert policy.max_silence == 300
+
+
+def test_policy_without_limits_is_none():
+    description = publish.SensorEntityDescription(key='status')
+    assert publish.publish_policy(description) is None
+
+
+class Entity:
+    async def async_will_remove_from_hass(self):
+        pass
+
+
+class Sensor(publish.PublishFilterMixin, Entity):
+    """The parts of a sensor entity the mixin uses."""
+    hass = None
+    available = True
+
+    def __init__(self, policy: PublishPolicy):
+        self._publish_filter = PublishFilter(policy)
+        self.native_value = None
+        self.writes = []
+
+    def _state_snapshot(self):
+        return self.native_value
+
+    def _async_publish(self, available, state):
+        self.writes.append(state)
+
+    def update(self, value) -> bool:
+        self.native_value = value
+        if self._should_write(False):
+            self.writes.append(value)
+            return True
+        return False
+
+
+def test_held_back_value_is_flushed():
+    async def run():
+        sensor = Sensor(PublishPolicy(deadband=1, min_interval=0, max_silence=0.05))
+        assert sensor.update(5.0)
+        assert not sensor.update(5.5)
+        await asyncio.sleep(0.1)
+        assert sensor.writes == [5.0, 5.5]
+        # The flushed value is the last written one
+        assert not sensor.update(5.5)
+        await asyncio.sleep(0.1)
+        assert sensor.writes == [5.0, 5.5]
+    asyncio.run(run())
+
+
+def test_accepted_value_cancels_the_flush():
+    async def run():
+        sensor = Sensor(PublishPolicy(deadband=1, min_interval=0, max_silence=0.05))
+        sensor.update(5.0)
+        sensor.update(5.5)
+        assert sensor.update(7.0)
+        await asyncio.sleep(0.1)
+        assert sensor.writes == [5.0, 7.0]
+    asyncio.run(run())
+
+
+def test_removed_sensor_is_not_flushed():
+    async def run():
+        sensor = Sensor(PublishPolicy(deadband=1, min_interval=0, max_silence=0.05))
+        sensor.update(5.0)
+        sensor.update(5.5)
+        await sensor.async_will_remove_from_hass()
+        await asyncio.sleep(0.1)
+        assert sensor.writes == [5.0]
+    asyncio.run(run())
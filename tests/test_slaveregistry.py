@@ -0,0 +1,75 @@
+from garo.slaveregistry import SlaveRegistry
+
+MASTER = 1000
+TWIN = 1001
+
+
+def charger(serial_number: int, **values) -> dict:
+    return {'serialNumber': serial_number, 'reference': f'charger {serial_number}', **values}
+
+
+def registry_with_events(json: list[dict], removal_loads: int = 3):
+    registry = SlaveRegistry(MASTER, TWIN, json, removal_loads=removal_loads)
+    events = []
+    registry.add_listener(lambda added, removed: events.append(
+        ([c.serial_number for c in added], [c.serial_number for c in removed])))
+    return registry, events
+
+
+def test_slaves_exclude_master_and_twin():
+    registry, _ = registry_with_events([charger(MASTER), charger(TWIN), charger(1)])
+    assert registry.master.serial_number == MASTER
+    assert registry.twin.serial_number == TWIN
+    assert [c.serial_number for c in registry.slaves] == [1]
+    assert len(registry) == 3
+
+
+def test_added_slave_is_reported():
+    registry, events = registry_with_events([charger(MASTER), charger(1)])
+    assert registry.load([charger(MASTER), charger(1), charger(2)]) == {}
+    assert events == [([2], [])]
+    assert [c.serial_number for c in registry.slaves] == [1, 2]
+
+
+def test_changed_fields_per_charger():
+    registry, events = registry_with_events([charger(MASTER), charger(1, chargeStatus=0)])
+    changed = registry.load([charger(MASTER), charger(1, chargeStatus=2)])
+    assert changed == {1: {'charge_status'}}
+    assert events == []
+
+
+def test_slave_is_removed_after_consecutive_misses():
+    registry, events = registry_with_events([charger(MASTER), charger(1), charger(2)])
+    registry.load([charger(MASTER), charger(1)])
+    registry.load([charger(MASTER), charger(1)])
+    assert 2 in registry
+    assert events == []
+    registry.load([charger(MASTER), charger(1)])
+    assert 2 not in registry
+    assert events == [([], [2])]
+    assert [c.serial_number for c in registry.slaves] == [1]
+
+
+def test_answering_slave_resets_its_misses():
+    registry, events = registry_with_events([charger(MASTER), charger(1)], removal_loads=2)
+    registry.load([charger(MASTER)])
+    registry.load([charger(MASTER), charger(1)])
+    registry.load([charger(MASTER)])
+    assert 1 in registry
+    assert events == []
+
+
+def test_master_and_twin_are_kept():
+    registry, events = registry_with_events([charger(MASTER), charger(TWIN)], removal_loads=1)
+    registry.load([])
+    assert MASTER in registry and TWIN in registry
+    assert events == []
+
+
+def test_removed_listener_is_not_called():
+    registry = SlaveRegistry(MASTER, TWIN, [charger(MASTER)])
+    events = []
+    remove = registry.add_listener(lambda added, removed: events.append(added))
+    remove()
+    registry.load([charger(MASTER), charger(1)])
+    assert events == []